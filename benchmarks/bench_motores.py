@@ -0,0 +1,372 @@
+"""Mesmos cenários nos dois motores, em várias escalas de contas.
+
+Uso:
+    python -m benchmarks.bench_motores --tamanhos 1000 100000 \\
+        --saida resultados.json --comparar base.json
+
+Cada motor e tamanho roda num processo próprio, para que a memória residente
+(RSS) medida logo após a carga da população seja só dela. Cada cenário é
+repetido ``--repeticoes`` vezes, cada uma com até ``--operacoes`` operações
+ou ``--tempo`` segundos, o que vier antes; o resultado guarda a mediana e as
+amostras de cada rodada. A latência é medida sem tracemalloc; o pico de
+memória vem de uma passada final, mais curta, com tracemalloc ligado.
+
+Com ``--comparar``, o processo sai com código 1 se houver regressão. Uma
+diferença só conta se passar da ``--tolerancia`` e também do ruído das
+amostras: ``--fator-ruido`` vezes o desvio absoluto mediano relativo.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from statistics import median
+
+from src.carga_sintetica import AlvoOrientado, AlvoProcedural, GeradorCarga
+from src.instrumentacao import Histograma
+from src.saida import SaidaNula, usar_saida
+
+TAMANHOS = (1_000, 100_000, 1_000_000)
+MOTORES = {"orientado": AlvoOrientado, "procedural": AlvoProcedural}
+# Todos, exceto o cadastro, são tipos de operação do GeradorCarga.
+CENARIOS = ("consulta", "deposito", "saque", "extrato", "listagem", "cadastro")
+PERCENTIS = (50, 90, 99, 99.9)
+OPERACOES_MEMORIA = 500
+REPETICOES = 5
+FATOR_RUIDO = 3.0
+# Saques ilimitados, para o cenário de saque medir o caminho de sucesso.
+LIMITE_SAQUES = 10**9
+
+
+def _chave(resultado):
+    return (resultado["motor"], resultado["contas"], resultado["cenario"])
+
+
+def _fluxo(semente, tamanho, cenario):
+    """Operações do cenário, ou novos clientes no cenário de cadastro."""
+    if cenario == "cadastro":
+        gerador = GeradorCarga(semente=semente, clientes=tamanho)
+        return gerador.novos_cadastros(sys.maxsize)
+    gerador = GeradorCarga(
+        semente=semente, clientes=tamanho, mix={cenario: 1}, falhas={}
+    )
+    return gerador.operacoes()
+
+
+def _aplicar(alvo, cenario):
+    if cenario != "cadastro":
+        return alvo.aplicar
+
+    def cadastrar(cadastro):
+        alvo.cadastrar_cliente(cadastro)
+        alvo.abrir_conta(cadastro.cpf)
+
+    return cadastrar
+
+
+def memoria_residente():
+    """Bytes residentes (RSS) do processo agora, ou None fora do Linux."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as arquivo:
+            paginas = int(arquivo.read().split()[1])
+    except OSError:
+        return None
+    return paginas * os.sysconf("SC_PAGE_SIZE")
+
+
+def _medir_rodada(fluxo, aplicar, operacoes, tempo_maximo):
+    histograma = Histograma()
+    limite = time.perf_counter_ns() + int(tempo_maximo * 1e9)
+    for item in islice(fluxo, operacoes):
+        antes = time.perf_counter_ns()
+        aplicar(item)
+        depois = time.perf_counter_ns()
+        histograma.registrar(depois - antes)
+        if depois >= limite:
+            break
+    return histograma
+
+
+def medir_cenario(fluxo, aplicar, operacoes, tempo_maximo, repeticoes=REPETICOES):
+    rodadas = [
+        _medir_rodada(fluxo, aplicar, operacoes, tempo_maximo)
+        for _ in range(repeticoes)
+    ]
+    # Só o tempo dentro do motor; a geração das operações fica de fora.
+    vazoes = [rodada.contagem / (rodada.total / 1e9) for rodada in rodadas]
+    latencias = [
+        {
+            **{f"p{p:g}": rodada.percentil(p) / 1000 for p in PERCENTIS},
+            "media": rodada.media() / 1000,
+            "max": rodada.maximo / 1000,
+        }
+        for rodada in rodadas
+    ]
+
+    quantidade = min(min(rodada.contagem for rodada in rodadas), OPERACOES_MEMORIA)
+    tracemalloc.start()
+    for item in islice(fluxo, quantidade):
+        aplicar(item)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "operacoes": sum(rodada.contagem for rodada in rodadas),
+        "vazao": median(vazoes),
+        "latencia_us": {
+            chave: median(latencia[chave] for latencia in latencias)
+            for chave in latencias[0]
+        },
+        "memoria_pico": pico,
+        "amostras": {
+            "vazao": vazoes,
+            "p99": [latencia["p99"] for latencia in latencias],
+        },
+    }
+
+
+def medir_populacao(
+    tamanho, motor, cenarios, operacoes, tempo_maximo, semente, repeticoes=REPETICOES
+):
+    """Carga de uma população num motor e os cenários sobre ela."""
+    populacao = GeradorCarga(
+        semente=semente, clientes=tamanho, limite_saques=LIMITE_SAQUES
+    )
+    alvo = MOTORES[motor]()
+    residente_antes = memoria_residente()
+    inicio = time.perf_counter()
+    alvo.carregar(populacao)
+    carga = {
+        "motor": motor,
+        "contas": tamanho,
+        "segundos": time.perf_counter() - inicio,
+        "memoria_residente": memoria_residente(),
+        "memoria_residente_antes": residente_antes,
+    }
+    print(formatar_carga(carga))
+
+    resultados = []
+    for cenario in cenarios:
+        with usar_saida(SaidaNula()):
+            medicao = medir_cenario(
+                _fluxo(semente, tamanho, cenario),
+                _aplicar(alvo, cenario),
+                operacoes,
+                tempo_maximo,
+                repeticoes,
+            )
+        resultado = {"motor": motor, "contas": tamanho, "cenario": cenario}
+        resultado.update(medicao)
+        resultados.append(resultado)
+        print(formatar_linha(resultado))
+    return carga, resultados
+
+
+def executar(
+    tamanhos, motores, cenarios, operacoes, tempo_maximo, semente, repeticoes=REPETICOES
+):
+    """Cada população num processo novo; devolve as cargas e os resultados."""
+    cargas, resultados = [], []
+    for tamanho in tamanhos:
+        for motor in motores:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                carga, medicoes = executor.submit(
+                    medir_populacao,
+                    tamanho,
+                    motor,
+                    cenarios,
+                    operacoes,
+                    tempo_maximo,
+                    semente,
+                    repeticoes,
+                ).result()
+            cargas.append(carga)
+            resultados.extend(medicoes)
+    return cargas, resultados
+
+
+def formatar_carga(carga):
+    linha = f"[{carga['motor']} | {carga['contas']} contas] carga em "
+    linha += f"{carga['segundos']:.1f} s"
+    if carga["memoria_residente"] is not None:
+        residente = carga["memoria_residente"] / 2**20
+        populacao = residente - carga["memoria_residente_antes"] / 2**20
+        linha += f", RSS {residente:.1f} MiB (+{populacao:.1f} MiB da população)"
+    return linha
+
+
+def formatar_linha(resultado):
+    latencia = resultado["latencia_us"]
+    return (
+        f"{resultado['motor']:<11}{resultado['contas']:>9}  "
+        f"{resultado['cenario']:<10}{resultado['vazao']:>12.0f} op/s"
+        f"{latencia['p50']:>10.1f}{latencia['p99']:>10.1f}"
+        f"{latencia['p99.9']:>10.1f} µs (p50/p99/p99.9)"
+        f"{resultado['memoria_pico'] / 1024:>10.1f} KiB"
+    )
+
+
+def ruido(amostras):
+    """Desvio absoluto mediano das amostras, relativo à sua mediana."""
+    if len(amostras) < 2:
+        return 0.0
+    centro = median(amostras)
+    if not centro:
+        return 0.0
+    return median(abs(amostra - centro) for amostra in amostras) / centro
+
+
+def _regressao(rotulo, nome, antes, depois, sentido, limite):
+    if not antes or sentido * (depois - antes) / antes <= limite:
+        return None
+    return (
+        f"{rotulo}: {nome} {antes:.1f} -> {depois:.1f} "
+        f"({(depois - antes) / antes:+.0%}, limite {limite:.0%})"
+    )
+
+
+def comparar(base, atual, tolerancia, fator_ruido=FATOR_RUIDO):
+    """Regressões de ``atual`` em relação a ``base``, uma frase por item.
+
+    Compara as medianas de vazão (menor é pior) e p99 (maior é pior). O
+    limite de cada uma é a tolerância relativa ou ``fator_ruido`` vezes o
+    ruído das amostras da base e da atual, o que for maior; resultados sem
+    amostras usam só a tolerância. Pico de memória e RSS após a carga usam a
+    tolerância. Cenários e cargas ausentes na base são ignorados.
+    """
+    regressoes = []
+    anteriores = {_chave(resultado): resultado for resultado in base["resultados"]}
+    for resultado in atual["resultados"]:
+        anterior = anteriores.get(_chave(resultado))
+        if anterior is None:
+            continue
+        rotulo = "/".join(map(str, _chave(resultado)))
+        metricas = (
+            ("vazão", "vazao", anterior["vazao"], resultado["vazao"], -1),
+            (
+                "p99",
+                "p99",
+                anterior["latencia_us"]["p99"],
+                resultado["latencia_us"]["p99"],
+                1,
+            ),
+        )
+        for nome, amostra, antes, depois, sentido in metricas:
+            variacao = max(
+                ruido(medicao.get("amostras", {}).get(amostra, ()))
+                for medicao in (anterior, resultado)
+            )
+            regressoes.append(
+                _regressao(
+                    rotulo,
+                    nome,
+                    antes,
+                    depois,
+                    sentido,
+                    max(tolerancia, fator_ruido * variacao),
+                )
+            )
+        regressoes.append(
+            _regressao(
+                rotulo,
+                "memória",
+                anterior["memoria_pico"],
+                resultado["memoria_pico"],
+                1,
+                tolerancia,
+            )
+        )
+
+    cargas = {
+        (carga["motor"], carga["contas"]): carga for carga in base.get("cargas", ())
+    }
+    for carga in atual.get("cargas", ()):
+        anterior = cargas.get((carga["motor"], carga["contas"]))
+        if anterior is None or None in (
+            anterior["memoria_residente"],
+            carga["memoria_residente"],
+        ):
+            continue
+        regressoes.append(
+            _regressao(
+                f"{carga['motor']}/{carga['contas']}/carga",
+                "RSS (MiB)",
+                anterior["memoria_residente"] / 2**20,
+                carga["memoria_residente"] / 2**20,
+                1,
+                tolerancia,
+            )
+        )
+    return [regressao for regressao in regressoes if regressao]
+
+
+def analisar_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS))
+    parser.add_argument(
+        "--motores", nargs="+", choices=list(MOTORES), default=list(MOTORES)
+    )
+    parser.add_argument(
+        "--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS)
+    )
+    parser.add_argument(
+        "--operacoes", type=int, default=5_000, help="operações/rodada"
+    )
+    parser.add_argument("--tempo", type=float, default=1.0, help="segundos/rodada")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10)
+    parser.add_argument("--fator-ruido", type=float, default=FATOR_RUIDO)
+    return parser.parse_args(argumentos)
+
+
+def main(argumentos=None):
+    args = analisar_argumentos(argumentos)
+    cargas, resultados = executar(
+        args.tamanhos,
+        args.motores,
+        args.cenarios,
+        args.operacoes,
+        args.tempo,
+        args.semente,
+        args.repeticoes,
+    )
+    relatorio = {
+        "metadados": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semente": args.semente,
+            "operacoes": args.operacoes,
+            "tempo": args.tempo,
+            "repeticoes": args.repeticoes,
+        },
+        "cargas": cargas,
+        "resultados": resultados,
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar(base, relatorio, args.tolerancia, args.fator_ruido)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}")
+        if regressoes:
+            return 1
+        print(f"Sem regressões acima de {args.tolerancia:.0%} nem do ruído.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Lista de dicts versus TabelaContas, pelas funções do sistema procedural.
+
+As duas estruturas são carregadas por ``AlvoProcedural`` e recebem o mesmo
+fluxo do ``GeradorCarga``, aplicado por ``depositar``, ``sacar``,
+``exibir_extrato`` e ``listar_contas`` de ``otimizando_sistema_bancario``;
+novas contas são abertas por ``criar_conta``. Um aquecimento com as mesmas
+funções dá aos extratos um tamanho realista antes das medições. A memória é a
+alocada pela carga e pelo aquecimento.
+
+Na lista de dicts, ``encontrar_conta`` percorre as contas a cada operação, e
+é isso que limita o número de contas: com 10⁴ o benchmark leva minutos.
+"""
+
+import time
+import tracemalloc
+
+from src.carga_sintetica import AlvoProcedural, GeradorCarga
+from src.saida import SaidaNula, usar_saida
+
+CONTAS = 10_000
+AQUECIMENTO = 50_000
+OPERACOES = 5_000
+ABERTURAS = 500
+SEMENTE = 0
+# Listagens percorrem todas as contas; ficam raras como no uso real.
+MIX = {"deposito": 0.45, "saque": 0.35, "extrato": 0.19, "listagem": 0.01}
+ESTRUTURAS = {"lista de dicts": list, "TabelaContas": None}
+
+
+def criar_gerador(semente=SEMENTE):
+    return GeradorCarga(
+        semente=semente, clientes=CONTAS, mix=MIX, falhas={}, limite_saques=10**9
+    )
+
+
+def preparar(contas):
+    """Alvo carregado e aquecido, com a memória que isso alocou."""
+    alvo = AlvoProcedural(contas=None if contas is None else contas())
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    alvo.carregar(criar_gerador())
+    alvo.executar(criar_gerador(SEMENTE + 1).operacoes(AQUECIMENTO))
+    memoria = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return alvo, memoria
+
+
+def medir_operacoes(alvo):
+    """µs por operação de cada tipo do mix, aplicadas pelas funções do menu."""
+    operacoes = list(criar_gerador(SEMENTE + 2).operacoes(OPERACOES))
+    tempos = {}
+    for tipo in MIX:
+        fluxo = [operacao for operacao in operacoes if operacao.tipo == tipo]
+        inicio = time.perf_counter()
+        alvo.executar(fluxo)
+        tempos[tipo] = (time.perf_counter() - inicio) / len(fluxo) * 1e6
+    return tempos
+
+
+def medir_aberturas(alvo):
+    cadastros = list(criar_gerador().novos_cadastros(ABERTURAS))
+    inicio = time.perf_counter()
+    for cadastro in cadastros:
+        alvo.cadastrar_cliente(cadastro)
+        alvo.abrir_conta(cadastro.cpf)
+    return (time.perf_counter() - inicio) / ABERTURAS * 1e6
+
+
+def main():
+    print(f"Contas: {CONTAS} (após {AQUECIMENTO} operações de aquecimento)")
+    with usar_saida(SaidaNula()):
+        for nome, contas in ESTRUTURAS.items():
+            alvo, memoria = preparar(contas)
+            extrato_medio = sum(
+                len(alvo.contas[indice]["extrato"]) for indice in range(CONTAS)
+            ) / CONTAS
+            print(f"\n{nome}: extrato médio de {extrato_medio:.0f} caracteres")
+            print(f"  Memória: {memoria / CONTAS:10.1f} B/conta")
+            for tipo, tempo in medir_operacoes(alvo).items():
+                print(f"  {tipo:<18} {tempo:10.2f} µs/op")
+            print(f"  {'cadastro + conta':<18} {medir_aberturas(alvo):10.2f} µs/op")
+
+
+if __name__ == "__main__":
+    main()
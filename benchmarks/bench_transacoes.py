@@ -0,0 +1,57 @@
+import sys
+import timeit
+
+from src.modelando_sistema_bancario_poo import Conta, Deposito, PessoaFisica, Saque
+from src.transacoes_rapidas import deposito_rapido, saque_rapido
+
+LANCAMENTOS = 100_000
+LANCAMENTOS_POR_CONTA = 10
+
+
+def nova_conta():
+    cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    return cliente, Conta(1, cliente)
+
+
+# O extrato cresce a cada lançamento; contas curtas isolam o custo por lançamento.
+def lancamentos_abc():
+    for _ in range(LANCAMENTOS // LANCAMENTOS_POR_CONTA):
+        cliente, conta = nova_conta()
+        for _ in range(LANCAMENTOS_POR_CONTA // 2):
+            cliente.realizar_transacao(conta, Deposito(10.0))
+            cliente.realizar_transacao(conta, Saque(5.0))
+
+
+def lancamentos_rapidos():
+    for _ in range(LANCAMENTOS // LANCAMENTOS_POR_CONTA):
+        cliente, conta = nova_conta()
+        for _ in range(LANCAMENTOS_POR_CONTA // 2):
+            cliente.realizar_transacao(conta, deposito_rapido(10.0))
+            cliente.realizar_transacao(conta, saque_rapido(5.0))
+
+
+def medir(func, repeticoes=5):
+    melhor = min(timeit.repeat(func, number=1, repeat=repeticoes))
+    return melhor / LANCAMENTOS * 1e9
+
+
+def main():
+    abc = medir(lancamentos_abc)
+    rapido = medir(lancamentos_rapidos)
+
+    print(f"Lançamentos por rodada: {LANCAMENTOS}")
+    print(f"Saque/Deposito (ABC):   {abc:8.1f} ns/lançamento")
+    print(f"RegistroTransacao:      {rapido:8.1f} ns/lançamento")
+    print(f"Diferença:              {abc - rapido:8.1f} ns ({abc / rapido:.2f}x)")
+
+    objeto = Deposito(10.0)
+    registro = deposito_rapido(10.0)
+    tamanho_objeto = sys.getsizeof(objeto) + sys.getsizeof(objeto.__dict__)
+    print(
+        f"Memória por transação:  {tamanho_objeto} B (ABC)"
+        f" vs {sys.getsizeof(registro)} B (registro)"
+    )
+
+
+if __name__ == "__main__":
+    main()
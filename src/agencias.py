@@ -0,0 +1,115 @@
+from collections import defaultdict
+
+from src.tabela_contas import TabelaContas
+
+
+class ParticaoAgencia:
+    """Contas de uma única agência com índices próprios por número e CPF."""
+
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self.contas = []
+        self._por_numero = {}
+        self._por_cpf = defaultdict(list)
+
+    def __len__(self):
+        return len(self.contas)
+
+    def __contains__(self, conta):
+        return self._por_numero.get(conta.numero) is conta
+
+    def adicionar(self, conta):
+        if conta.numero in self._por_numero:
+            raise ValueError(
+                f"Conta {conta.numero} já cadastrada na agência {self.codigo}."
+            )
+        self.contas.append(conta)
+        self._por_numero[conta.numero] = conta
+        self._por_cpf[conta.cliente.cpf].append(conta)
+
+    def buscar(self, numero):
+        try:
+            return self._por_numero.get(int(numero))
+        except (TypeError, ValueError):
+            return None
+
+    def contas_do_cliente(self, cpf):
+        return list(self._por_cpf.get(cpf, ()))
+
+    def relatorio(self):
+        return {
+            "agencia": self.codigo,
+            "contas": len(self.contas),
+            "clientes": len(self._por_cpf),
+            "saldo_total": sum(conta.saldo for conta in self.contas),
+        }
+
+
+class ParticoesAgencia:
+    """Partições por agência mantidas em sincronia com uma lista de contas."""
+
+    def __init__(self):
+        self._particoes = {}
+        self._origem = None
+        self._indexadas = 0
+
+    def __iter__(self):
+        return iter(self._particoes.values())
+
+    def __len__(self):
+        return len(self._particoes)
+
+    def codigos(self):
+        return sorted(self._particoes)
+
+    def particao(self, codigo):
+        particao = self._particoes.get(codigo)
+        if particao is None:
+            particao = self._particoes[codigo] = ParticaoAgencia(codigo)
+        return particao
+
+    def adicionar(self, conta):
+        self.particao(conta.agencia).adicionar(conta)
+
+    def buscar(self, codigo, numero):
+        particao = self._particoes.get(codigo)
+        return particao.buscar(numero) if particao is not None else None
+
+    def sincronizar(self, contas):
+        # A lista só cresce por append; se for trocada ou encolher,
+        # as partições são reconstruídas do zero.
+        if contas is not self._origem or len(contas) < self._indexadas:
+            self._particoes.clear()
+            self._origem = contas
+            self._indexadas = 0
+        # Avança conta a conta: se uma for recusada, as anteriores continuam
+        # indexadas e não são adicionadas de novo na próxima chamada.
+        for conta in contas[self._indexadas :]:
+            self.adicionar(conta)
+            self._indexadas += 1
+
+    def anexar(self, contas, conta):
+        """Adiciona ``conta`` às partições e, se aceita, ao fim de ``contas``."""
+        self.sincronizar(contas)
+        self.adicionar(conta)
+        contas.append(conta)
+        self._indexadas += 1
+
+
+class ContasPorAgencia:
+    """Uma ``TabelaContas`` por agência para o motor procedural."""
+
+    def __init__(self):
+        self._tabelas = {}
+
+    def __len__(self):
+        return len(self._tabelas)
+
+    def codigos(self):
+        return sorted(self._tabelas)
+
+    def tabela(self, agencia):
+        tabela = self._tabelas.get(agencia)
+        if tabela is None:
+            tabela = self._tabelas[agencia] = TabelaContas()
+        return tabela
@@ -0,0 +1,175 @@
+import itertools
+import time
+
+
+class Agendamento:
+    __slots__ = (
+        "id",
+        "momento",
+        "conta",
+        "transacao",
+        "intervalo",
+        "restantes",
+        "ocorrencia",
+        "posicao",
+    )
+
+    def __init__(self, id, momento, conta, transacao, intervalo, restantes):
+        self.id = id
+        self.momento = momento
+        self.conta = conta
+        self.transacao = transacao
+        self.intervalo = intervalo
+        self.restantes = restantes
+        self.ocorrencia = 0
+        self.posicao = None
+
+    def __lt__(self, outro):
+        return (self.momento, self.id) < (outro.momento, outro.id)
+
+    def nova_transacao(self):
+        # Com chave de idempotência, cada ocorrência recebe uma cópia cuja
+        # chave leva o número da ocorrência, para não colidirem entre si.
+        chave = getattr(self.transacao, "chave_idempotencia", None)
+        if chave is None:
+            return self.transacao
+        return self.transacao.com_chave(f"{chave}:{self.ocorrencia}")
+
+
+class AgendadorTransacoes:
+    """Transações futuras ou recorrentes num heap mínimo por momento.
+
+    O heap é indexado (cada agendamento conhece sua posição), então cancelar
+    por id custa O(log n). Após uma parada, ocorrências recorrentes perdidas
+    são calculadas diretamente a partir do intervalo, sem passar pelo heap
+    uma vez por ocorrência.
+    """
+
+    def __init__(self, relogio=None, recuperar_atrasadas=True):
+        self._relogio = relogio or time.time
+        self.recuperar_atrasadas = recuperar_atrasadas
+        self._heap = []
+        self._por_id = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, id_agendamento):
+        return id_agendamento in self._por_id
+
+    def proximo_momento(self):
+        return self._heap[0].momento if self._heap else None
+
+    def agendar(self, conta, transacao, momento, intervalo=None, repeticoes=None):
+        if intervalo is not None and intervalo <= 0:
+            raise ValueError("O intervalo de recorrência deve ser positivo.")
+        if repeticoes is None:
+            repeticoes = 1 if intervalo is None else None
+        agendamento = Agendamento(
+            next(self._ids), momento, conta, transacao, intervalo, repeticoes
+        )
+        self._por_id[agendamento.id] = agendamento
+        self._inserir(agendamento)
+        return agendamento.id
+
+    def cancelar(self, id_agendamento):
+        agendamento = self._por_id.pop(id_agendamento, None)
+        if agendamento is None:
+            return False
+        self._remover(agendamento.posicao)
+        return True
+
+    def executar_vencidos(self, agora=None, limite_lote=None):
+        """Executa, em ordem de momento, as ocorrências vencidas até ``agora``.
+
+        Retorna o número de transações disparadas.
+        """
+        if agora is None:
+            agora = self._relogio()
+        lote = []
+        while self._heap and self._heap[0].momento <= agora:
+            if limite_lote is not None and len(lote) >= limite_lote:
+                break
+            lote.append(self._remover(0))
+
+        executadas = 0
+        for indice, agendamento in enumerate(lote):
+            try:
+                executadas += self._disparar(agendamento, agora)
+            except Exception:
+                # O agendamento que falhou é descartado; os demais do lote
+                # voltam ao heap para a próxima execução.
+                self._por_id.pop(agendamento.id, None)
+                for restante in lote[indice + 1 :]:
+                    self._inserir(restante)
+                raise
+        return executadas
+
+    def _disparar(self, agendamento, agora):
+        vencidas = 1
+        if agendamento.intervalo is not None:
+            vencidas += int((agora - agendamento.momento) // agendamento.intervalo)
+        disparos = vencidas if self.recuperar_atrasadas else 1
+        if agendamento.restantes is not None:
+            disparos = min(disparos, agendamento.restantes)
+            agendamento.restantes -= disparos
+        # Sem recuperação, as ocorrências puladas só avançam a numeração.
+        agendamento.ocorrencia += vencidas - disparos
+
+        conta = agendamento.conta
+        for _ in range(disparos):
+            agendamento.ocorrencia += 1
+            conta.cliente.realizar_transacao(conta, agendamento.nova_transacao())
+
+        if agendamento.intervalo is None or agendamento.restantes == 0:
+            del self._por_id[agendamento.id]
+        else:
+            agendamento.momento += agendamento.intervalo * vencidas
+            self._inserir(agendamento)
+        return disparos
+
+    def _inserir(self, agendamento):
+        agendamento.posicao = len(self._heap)
+        self._heap.append(agendamento)
+        self._subir(agendamento.posicao)
+
+    def _remover(self, posicao):
+        heap = self._heap
+        agendamento = heap[posicao]
+        ultimo = heap.pop()
+        if posicao < len(heap):
+            heap[posicao] = ultimo
+            ultimo.posicao = posicao
+            self._subir(posicao)
+            self._descer(ultimo.posicao)
+        agendamento.posicao = None
+        return agendamento
+
+    def _trocar(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        heap[i].posicao = i
+        heap[j].posicao = j
+
+    def _subir(self, posicao):
+        heap = self._heap
+        while posicao > 0:
+            pai = (posicao - 1) // 2
+            if not heap[posicao] < heap[pai]:
+                break
+            self._trocar(posicao, pai)
+            posicao = pai
+
+    def _descer(self, posicao):
+        heap = self._heap
+        tamanho = len(heap)
+        while True:
+            menor = posicao
+            for filho in (2 * posicao + 1, 2 * posicao + 2):
+                if filho < tamanho and heap[filho] < heap[menor]:
+                    menor = filho
+            if menor == posicao:
+                return
+            self._trocar(posicao, menor)
+            posicao = menor
@@ -0,0 +1,127 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: só o armazenamento em arquivo depende de flock.
+    fcntl = None
+
+LARGURA_MARCA = 20
+
+
+class ArmazenamentoMemoria:
+    def __init__(self, inicio=1):
+        self.inicio = inicio
+        self._proximos = {}
+        self._trava = threading.Lock()
+
+    def reservar(self, chave, quantidade):
+        with self._trava:
+            inicio = self._proximos.get(chave, self.inicio)
+            self._proximos[chave] = inicio + quantidade
+        return inicio
+
+    def avancar(self, chave, minimo):
+        with self._trava:
+            self._proximos[chave] = max(self._proximos.get(chave, self.inicio), minimo)
+
+
+class ArmazenamentoArquivo:
+    """Marca d'água durável por chave, protegida por ``flock`` entre processos.
+
+    Após uma reinicialização a alocação continua do topo do último bloco
+    reservado; números não usados de blocos antigos são descartados. A marca
+    é um registro de largura fixa sobrescrito no lugar, sem truncar o
+    arquivo, de modo que uma queda no meio da gravação nunca o deixa vazio.
+    """
+
+    def __init__(self, diretorio, inicio=1):
+        if fcntl is None:
+            raise OSError("ArmazenamentoArquivo requer fcntl.flock (POSIX).")
+        self.diretorio = diretorio
+        self.inicio = inicio
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.seq")
+
+    def reservar(self, chave, quantidade):
+        descritor = os.open(self._caminho(chave), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descritor, fcntl.LOCK_EX)
+            dados = os.pread(descritor, 32, 0).strip()
+            inicio = int(dados) if dados else self.inicio
+            marca = f"{inicio + quantidade:0{LARGURA_MARCA}d}\n"
+            os.pwrite(descritor, marca.encode("ascii"), 0)
+            os.fsync(descritor)
+        finally:
+            os.close(descritor)
+        return inicio
+
+    def avancar(self, chave, minimo):
+        """Eleva a marca d'água de ``chave`` a ``minimo``, se estiver abaixo."""
+        descritor = os.open(self._caminho(chave), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descritor, fcntl.LOCK_EX)
+            dados = os.pread(descritor, 32, 0).strip()
+            atual = int(dados) if dados else self.inicio
+            if atual < minimo:
+                marca = f"{minimo:0{LARGURA_MARCA}d}\n"
+                os.pwrite(descritor, marca.encode("ascii"), 0)
+                os.fsync(descritor)
+        finally:
+            os.close(descritor)
+
+    def marca_dagua(self, chave):
+        try:
+            with open(self._caminho(chave), "rb") as arquivo:
+                dados = arquivo.read().strip()
+        except FileNotFoundError:
+            return self.inicio
+        return int(dados) if dados else self.inicio
+
+
+class AlocadorContas:
+    """Distribui números de conta reservando blocos por thread.
+
+    Cada thread consome o próprio bloco sem travas; só a reserva de um bloco
+    novo passa pelo armazenamento compartilhado.
+    """
+
+    def __init__(self, armazenamento=None, tamanho_bloco=100):
+        self.armazenamento = armazenamento or ArmazenamentoMemoria()
+        self.tamanho_bloco = tamanho_bloco
+        self._local = threading.local()
+        # Menor número ainda aceitável por chave; blocos de qualquer thread
+        # abaixo dele são descartados no próximo uso.
+        self._pisos = {}
+
+    def _blocos(self):
+        try:
+            return self._local.blocos
+        except AttributeError:
+            self._local.blocos = {}
+            return self._local.blocos
+
+    def proximo(self, chave="contas"):
+        blocos = self._blocos()
+        bloco = blocos.get(chave)
+        if (
+            bloco is None
+            or bloco[0] >= bloco[1]
+            or bloco[0] < self._pisos.get(chave, 0)
+        ):
+            inicio = self.armazenamento.reservar(chave, self.tamanho_bloco)
+            bloco = blocos[chave] = [inicio, inicio + self.tamanho_bloco]
+        numero = bloco[0]
+        bloco[0] += 1
+        return numero
+
+    def avancar(self, chave, minimo):
+        """Faz os próximos números de ``chave`` começarem em ``minimo`` ou depois.
+
+        Usado quando contas são carregadas de fora do alocador (snapshot,
+        eventos), para que ele não devolva números já ocupados.
+        """
+        self.armazenamento.avancar(chave, minimo)
+        self._pisos[chave] = max(self._pisos.get(chave, 0), minimo)
@@ -0,0 +1,166 @@
+import mmap
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from src.eventos import _ler_lancamentos
+from src.livro_razao import CREDITOS, FORMATO_REGISTRO, TIPOS
+from src.modelando_sistema_bancario_poo import HistoricoLivroRazao
+
+TOLERANCIA = 1e-6
+
+Divergencia = namedtuple(
+    "Divergencia", "agencia numero_conta inicio fim saldo saldo_historico"
+)
+
+
+class CheckpointAuditoria:
+    """Somas acumuladas do Historico já auditadas, por (agência, conta)."""
+
+    def __init__(self):
+        self._somas = {}
+
+    def __len__(self):
+        return len(self._somas)
+
+    def obter(self, chave):
+        return self._somas.get(chave, (0, 0.0))
+
+    def atualizar(self, chave, posicao, soma):
+        self._somas[chave] = (posicao, soma)
+
+    def salvar(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            for (agencia, numero), (posicao, soma) in self._somas.items():
+                arquivo.write(f"{agencia};{numero};{posicao};{soma!r}\n")
+
+    @classmethod
+    def carregar(cls, caminho):
+        checkpoint = cls()
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                agencia, numero, posicao, soma = linha.rstrip("\n").split(";")
+                checkpoint.atualizar((agencia, int(numero)), int(posicao), float(soma))
+        return checkpoint
+
+
+def _somar(soma, tipo, valor):
+    return soma + valor if tipo in CREDITOS else soma - valor
+
+
+def _auditar_conta(conta, checkpoint):
+    chave = (conta.agencia, conta.numero)
+    posicao, soma = checkpoint.obter(chave)
+    transacoes = conta.historico.transacoes
+    for indice in range(posicao, len(transacoes)):
+        transacao = transacoes[indice]
+        soma = _somar(soma, transacao["tipo"], transacao["valor"])
+    return chave, posicao, len(transacoes), conta.saldo, soma
+
+
+def _auditar_livro(tarefa):
+    # Cada processo mapeia o arquivo do livro e lê só os registros posteriores
+    # ao checkpoint, pelas posições recebidas; nada de lançamentos é copiado.
+    caminho, contas = tarefa
+    resultados = []
+    with open(caminho, "rb") as arquivo, mmap.mmap(
+        arquivo.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapa:
+        for chave, saldo, posicao, soma, posicoes in contas:
+            for registro in posicoes:
+                _, _, codigo, valor = FORMATO_REGISTRO.unpack_from(
+                    mapa, registro * FORMATO_REGISTRO.size
+                )
+                soma = _somar(soma, TIPOS[codigo], valor)
+            resultados.append((chave, posicao, posicao + len(posicoes), saldo, soma))
+    return resultados
+
+
+def _auditar_particao(tarefa):
+    # A partição do armazém de eventos traz os lançamentos das suas contas em
+    # ordem; os que o checkpoint já cobre são apenas contados.
+    fonte, contas = tarefa
+    vistos = defaultdict(int)
+    somas = {chave: soma for chave, (_, _, soma) in contas.items()}
+    for agencia, numero, tipo, valor, _ in _ler_lancamentos(fonte):
+        chave = (agencia, numero)
+        if chave not in contas:
+            continue
+        if vistos[chave] >= contas[chave][1]:
+            somas[chave] = _somar(somas[chave], tipo, valor)
+        vistos[chave] += 1
+    return [
+        (chave, posicao, max(vistos[chave], posicao), saldo, somas[chave])
+        for chave, (saldo, posicao, _) in contas.items()
+    ]
+
+
+def _preparar_tarefas(contas, checkpoint, armazem, tamanho_lote):
+    locais = []
+    livros = defaultdict(list)
+    particoes = defaultdict(dict)
+    for conta in contas:
+        chave = (conta.agencia, conta.numero)
+        historico = conta.historico
+        if isinstance(historico, HistoricoLivroRazao):
+            posicao, soma = checkpoint.obter(chave)
+            posicoes = historico.livro_razao.posicoes(historico.conta_livro, posicao)
+            livros[historico.livro_razao.caminho].append(
+                (chave, conta.saldo, posicao, soma, posicoes)
+            )
+        elif armazem is not None:
+            indice = armazem.particao(*chave)
+            particoes[indice][chave] = (conta.saldo, *checkpoint.obter(chave))
+        else:
+            locais.append(conta)
+
+    tarefas = []
+    for caminho, lote in livros.items():
+        for inicio in range(0, len(lote), tamanho_lote):
+            parte = lote[inicio : inicio + tamanho_lote]
+            tarefas.append((_auditar_livro, (caminho, parte)))
+    if particoes:
+        fontes = armazem.fontes()
+        for indice, contas_particao in sorted(particoes.items()):
+            tarefas.append((_auditar_particao, (fontes[indice], contas_particao)))
+    return locais, tarefas
+
+
+def auditar_saldos(
+    contas, checkpoint=None, processos=None, armazem=None, tamanho_lote=10_000
+):
+    """Compara o saldo de cada conta com a soma do seu Historico.
+
+    Contas do livro razão são somadas em paralelo, cada processo lendo do
+    arquivo só os registros posteriores ao checkpoint; com ``armazem``, as
+    demais contas são somadas a partir das partições do armazém de eventos,
+    também em paralelo. Históricos só em memória são somados aqui mesmo:
+    copiá-los para outro processo custaria mais que a soma.
+    ``processos=1`` executa tudo no processo atual.
+
+    Contas consistentes avançam o checkpoint; as demais são devolvidas como
+    ``Divergencia`` e o intervalo é revisto na próxima auditoria.
+    """
+    if checkpoint is None:
+        checkpoint = CheckpointAuditoria()
+
+    locais, tarefas = _preparar_tarefas(contas, checkpoint, armazem, tamanho_lote)
+    resultados = [[_auditar_conta(conta, checkpoint) for conta in locais]]
+    if processos == 1 or not tarefas:
+        resultados += [funcao(tarefa) for funcao, tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(funcao, tarefa) for funcao, tarefa in tarefas]
+            resultados += [futuro.result() for futuro in futuros]
+    return _consolidar(resultados, checkpoint)
+
+
+def _consolidar(resultados, checkpoint):
+    divergencias = []
+    for lote in resultados:
+        for chave, inicio, fim, saldo, soma in lote:
+            if abs(saldo - soma) > TOLERANCIA:
+                # O checkpoint não avança: a próxima auditoria revê o intervalo.
+                divergencias.append(Divergencia(*chave, inicio, fim, saldo, soma))
+            else:
+                checkpoint.atualizar(chave, fim, soma)
+    return divergencias
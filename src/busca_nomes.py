@@ -0,0 +1,135 @@
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e com espaços simples."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def trigramas(texto):
+    texto = f"  {texto} "
+    return {texto[i : i + 3] for i in range(len(texto) - 2)}
+
+
+def _nome(item):
+    return item["nome"] if isinstance(item, dict) else item.nome
+
+
+class IndiceNomes:
+    """Busca por nome de cliente, por prefixo e aproximada, sem acentos.
+
+    Os prefixos são resolvidos por busca binária numa lista ordenada de
+    palavras; a busca aproximada usa um índice invertido de trigramas e
+    ordena as candidatas pelo coeficiente de Dice. Funciona tanto com
+    objetos ``PessoaFisica`` quanto com os dicionários do motor procedural.
+    """
+
+    def __init__(self, frequencia_maxima=0.05):
+        self.frequencia_maxima = frequencia_maxima
+        self._origem = None
+        self.limpar()
+
+    def limpar(self):
+        self._itens = []
+        self._nomes = []
+        self._palavras = []
+        self._trigramas = defaultdict(list)
+
+    def __len__(self):
+        return len(self._itens)
+
+    def _registrar(self, item):
+        indice = len(self._itens)
+        nome = normalizar(_nome(item))
+        self._itens.append(item)
+        self._nomes.append(nome)
+        for trigrama in trigramas(nome):
+            self._trigramas[trigrama].append(indice)
+        return indice, nome
+
+    def adicionar(self, item):
+        indice, nome = self._registrar(item)
+        for palavra in set(nome.split()):
+            insort(self._palavras, (palavra, indice))
+
+    def adicionar_varias(self, itens):
+        for item in itens:
+            indice, nome = self._registrar(item)
+            self._palavras.extend((palavra, indice) for palavra in set(nome.split()))
+        self._palavras.sort()
+
+    def sincronizar(self, itens):
+        # Mesma regra das partições por agência: a lista só cresce por append.
+        if itens is not self._origem or len(itens) < len(self._itens):
+            self.limpar()
+            self._origem = itens
+        novos = itens[len(self._itens) :]
+        if len(novos) == 1:
+            self.adicionar(novos[0])
+        elif novos:
+            self.adicionar_varias(novos)
+
+    def _com_prefixo(self, prefixo):
+        posicao = bisect_left(self._palavras, (prefixo,))
+        palavras = self._palavras
+        while posicao < len(palavras) and palavras[posicao][0].startswith(prefixo):
+            yield palavras[posicao][1]
+            posicao += 1
+
+    def buscar_prefixo(self, consulta, limite=10):
+        """Nomes em que cada termo da consulta inicia alguma palavra."""
+        termos = normalizar(consulta).split()
+        if not termos:
+            return []
+        # Candidatas vêm do termo mais longo, em geral o mais seletivo, na
+        # ordem alfabética da palavra casada; a varredura para no limite.
+        termos.sort(key=len, reverse=True)
+        encontrados = {}
+        for indice in self._com_prefixo(termos[0]):
+            if indice in encontrados:
+                continue
+            palavras = self._nomes[indice].split()
+            if all(
+                any(palavra.startswith(termo) for palavra in palavras)
+                for termo in termos[1:]
+            ):
+                encontrados[indice] = None
+                if len(encontrados) == limite:
+                    break
+        return [self._itens[indice] for indice in encontrados]
+
+    def buscar_aproximado(self, consulta, limite=10, similaridade_minima=0.4):
+        """Nomes parecidos com a consulta, do mais ao menos similar."""
+        nome = normalizar(consulta)
+        consulta_trigramas = trigramas(nome)
+        if not nome or not self._itens:
+            return []
+        # Trigramas muito frequentes quase não discriminam e custam caro.
+        teto = max(1, int(len(self._itens) * self.frequencia_maxima))
+        postagens = [
+            self._trigramas[t] for t in consulta_trigramas if t in self._trigramas
+        ]
+        seletivas = [lista for lista in postagens if len(lista) <= teto]
+        contagem = Counter()
+        for lista in seletivas or postagens:
+            contagem.update(lista)
+
+        resultados = []
+        for indice, _ in contagem.most_common(limite * 20):
+            candidatos = trigramas(self._nomes[indice])
+            comuns = len(consulta_trigramas & candidatos)
+            dice = 2 * comuns / (len(consulta_trigramas) + len(candidatos))
+            if dice >= similaridade_minima:
+                resultados.append((-dice, self._nomes[indice], indice))
+        resultados.sort()
+        return [self._itens[indice] for _, _, indice in resultados[:limite]]
+
+    def buscar(self, consulta, limite=10):
+        """Busca por prefixo e, sem resultados, recorre à busca aproximada."""
+        return self.buscar_prefixo(consulta, limite) or self.buscar_aproximado(
+            consulta, limite
+        )
@@ -0,0 +1,74 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+class CacheExtrato:
+    """Extratos já renderizados por conta, com orçamento global de memória (LRU).
+
+    A entrada de uma conta é invalidada pelo observador registrado na conta, que
+    só é chamado quando um depósito ou saque é concluído com sucesso. O
+    observador existe apenas enquanto a conta tem entrada no cache: ele é
+    removido na invalidação, no descarte por orçamento e em ``limpar``.
+
+    O cache é compartilhado por contas de travas diferentes e tem trava
+    própria, sempre adquirida depois da trava da conta.
+    """
+
+    def __init__(self, orcamento_bytes=8 * 1024 * 1024):
+        self.orcamento_bytes = orcamento_bytes
+        self._entradas = OrderedDict()
+        self.uso_bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, conta):
+        return conta in self._entradas
+
+    def obter(self, conta, renderizar):
+        # Com a trava da conta, nenhuma movimentação dela acontece entre a
+        # renderização e o armazenamento, que guardaria um extrato vencido.
+        with conta.trava:
+            with self._trava:
+                texto = self._entradas.get(conta)
+                if texto is not None:
+                    self._entradas.move_to_end(conta)
+                    self.acertos += 1
+                    return texto
+                self.falhas += 1
+
+            texto = renderizar(conta)
+            with self._trava:
+                self._armazenar(conta, texto)
+            return texto
+
+    def _armazenar(self, conta, texto):
+        tamanho = sys.getsizeof(texto)
+        if tamanho > self.orcamento_bytes:
+            return
+        conta.adicionar_observador(self.invalidar)
+        self._entradas[conta] = texto
+        self.uso_bytes += tamanho
+        while self.uso_bytes > self.orcamento_bytes:
+            removida, removido = self._entradas.popitem(last=False)
+            self._descartar(removida, removido)
+
+    def _descartar(self, conta, texto):
+        conta.remover_observador(self.invalidar)
+        self.uso_bytes -= sys.getsizeof(texto)
+
+    def invalidar(self, conta, saldo_anterior=None):
+        with self._trava:
+            texto = self._entradas.pop(conta, None)
+            if texto is not None:
+                self._descartar(conta, texto)
+
+    def limpar(self):
+        with self._trava:
+            while self._entradas:
+                self._descartar(*self._entradas.popitem())
+            self.uso_bytes = 0
@@ -0,0 +1,435 @@
+import math
+import random
+from array import array
+from collections import deque, namedtuple
+from itertools import accumulate, repeat
+
+from src.busca_nomes import IndiceNomes
+from src.constant import Constants
+from src.coortes import formatar_nascimento, ordinal_nascimento
+from src.enderecos import interpretar_endereco
+from src.memoria import coleta_pausada
+from src.modelando_sistema_bancario_poo import (ContaCorrente, PessoaFisica,
+                                                SistemaBancario)
+from src.otimizando_sistema_bancario import (criar_conta, criar_usuario,
+                                             depositar, encontrar_conta,
+                                             exibir_extrato, listar_contas,
+                                             sacar)
+from src.tabela_contas import TabelaContas
+
+Cadastro = namedtuple("Cadastro", "nome nascimento cpf endereco")
+Operacao = namedtuple("Operacao", "tipo conta valor cpf_invalido")
+
+TIPOS_OPERACAO = ("deposito", "saque", "extrato", "consulta", "listagem")
+MIX_PADRAO = {"deposito": 0.45, "saque": 0.40, "extrato": 0.10, "consulta": 0.05}
+FALHAS_PADRAO = {"conta_inexistente": 0.01, "valor_invalido": 0.005}
+TIPOS_FALHA = ("conta_inexistente", "valor_invalido", "cpf_invalido")
+
+CPF_INVALIDO = "000.000.000"
+NUMERO_INEXISTENTE = "0"
+
+PRENOMES = (
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Diego",
+    "Élida",
+    "Fábio",
+    "Gabriela",
+    "Heitor",
+    "Iara",
+    "João",
+    "Luíza",
+    "Marcos",
+    "Natália",
+    "Otávio",
+    "Patrícia",
+    "Renato",
+)
+SOBRENOMES = (
+    "Almeida",
+    "Barbosa",
+    "Cardoso",
+    "Conceição",
+    "Ferreira",
+    "Gonçalves",
+    "Lima",
+    "Monteiro",
+    "Nascimento",
+    "Oliveira",
+    "Pereira",
+    "Santos",
+)
+LOGRADOUROS = ("Rua das Flores", "Av. Brasil", "Rua Sete de Setembro", "Rua XV")
+BAIRROS = ("Centro", "Jardim América", "Vila Nova", "Boa Vista")
+CIDADES = (
+    ("São Paulo", "SP"),
+    ("Campinas", "SP"),
+    ("Rio de Janeiro", "RJ"),
+    ("Belo Horizonte", "MG"),
+    ("Salvador", "BA"),
+    ("Curitiba", "PR"),
+    ("Porto Alegre", "RS"),
+    ("São Luís", "MA"),
+)
+
+ANO_NASCIMENTO_MINIMO = 1940
+ANO_NASCIMENTO_MAXIMO = 2006
+
+
+def formatar_cpf(indice):
+    digitos = f"{indice:011d}"
+    return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+
+
+def _acumular(pesos, chaves):
+    desconhecidas = set(pesos) - set(chaves)
+    if desconhecidas:
+        nomes = ", ".join(sorted(desconhecidas))
+        raise ValueError(f"Tipos desconhecidos: {nomes}.")
+    return [pesos.get(chave, 0) for chave in chaves]
+
+
+class GeradorCarga:
+    """Clientes, contas e fluxos de operações sintéticos e reproduzíveis.
+
+    A atividade por conta segue uma distribuição de Zipf com expoente
+    ``assimetria``: poucas contas quentes concentram a maior parte das
+    operações e o restante forma uma cauda longa (``assimetria=0`` é
+    uniforme). As contas quentes são sorteadas, não as primeiras criadas.
+
+    ``mix`` dá o peso de cada tipo de operação e ``falhas`` a probabilidade
+    de cada falha injetada por operação. Saldo insuficiente e limites de
+    saque surgem naturalmente dos valores sorteados; como os motores não
+    zeram ``numero_saques``, um ``limite_saques`` alto simula vários dias.
+    A mesma semente gera sempre os mesmos cadastros e o mesmo fluxo.
+    """
+
+    def __init__(
+        self,
+        semente=0,
+        clientes=1_000,
+        contas=None,
+        assimetria=1.1,
+        mix=None,
+        falhas=None,
+        valor_medio=100.0,
+        dispersao=1.0,
+        limite_saques=3,
+        tamanho_lote=10_000,
+    ):
+        if clientes < 1:
+            raise ValueError("A carga precisa de ao menos um cliente.")
+        self.semente = semente
+        self.clientes = clientes
+        self.contas = clientes if contas is None else contas
+        self.assimetria = assimetria
+        self.mix = dict(MIX_PADRAO if mix is None else mix)
+        self.falhas = dict(FALHAS_PADRAO if falhas is None else falhas)
+        self.valor_medio = valor_medio
+        self.dispersao = dispersao
+        self.limite_saques = limite_saques
+        self.tamanho_lote = tamanho_lote
+
+        self._pesos_tipos = _acumular(self.mix, TIPOS_OPERACAO)
+        self._pesos_falhas = _acumular(self.falhas, TIPOS_FALHA)
+        if sum(self._pesos_falhas) > 1:
+            raise ValueError("A soma das taxas de falha não pode passar de 1.")
+        # Média da lognormal = exp(mu + sigma²/2).
+        self._mu = math.log(valor_medio) - dispersao**2 / 2
+        self._contas_por_rank = None
+        self._distribuicao = None
+
+    def _aleatorio(self, fluxo):
+        return random.Random(f"{self.semente}/{fluxo}")
+
+    def cpf(self, indice_cliente):
+        return formatar_cpf(indice_cliente + 1)
+
+    def cliente_da_conta(self, indice_conta):
+        return indice_conta % self.clientes
+
+    def cadastros(self):
+        """Um ``Cadastro`` por cliente, em ordem."""
+        return self._gerar_cadastros("cadastros", range(self.clientes))
+
+    def novos_cadastros(self, quantidade):
+        """Clientes além da população inicial, com CPFs ainda não usados."""
+        indices = range(self.clientes, self.clientes + quantidade)
+        return self._gerar_cadastros("novos", indices)
+
+    def _gerar_cadastros(self, fluxo, indices):
+        gerador = self._aleatorio(fluxo)
+        inicio = ordinal_nascimento(f"01/01/{ANO_NASCIMENTO_MINIMO}")
+        fim = ordinal_nascimento(f"31/12/{ANO_NASCIMENTO_MAXIMO}")
+        for indice in indices:
+            nome = (
+                f"{gerador.choice(PRENOMES)} {gerador.choice(SOBRENOMES)} "
+                f"{gerador.choice(SOBRENOMES)}"
+            )
+            nascimento = gerador.randint(inicio, fim)
+            cidade, estado = gerador.choice(CIDADES)
+            endereco = (
+                f"{gerador.choice(LOGRADOUROS)}, {gerador.randint(1, 9999)} - "
+                f"{gerador.choice(BAIRROS)} - {cidade}/{estado}"
+            )
+            yield Cadastro(nome, nascimento, self.cpf(indice), endereco)
+
+    def saldos_iniciais(self):
+        """Saldo de abertura de cada conta, em ordem."""
+        gerador = self._aleatorio("saldos")
+        for _ in range(self.contas):
+            yield round(gerador.lognormvariate(self._mu, self.dispersao) * 5, 2)
+
+    def _preparar_distribuicao(self):
+        if self._distribuicao is not None or self.assimetria == 0:
+            return
+        contas = array("l", range(self.contas))
+        self._aleatorio("ranks").shuffle(contas)
+        self._contas_por_rank = contas
+        pesos = map(pow, range(1, self.contas + 1), repeat(-self.assimetria))
+        self._distribuicao = array("d", accumulate(pesos))
+
+    def sortear_contas(self, gerador, quantidade):
+        self._preparar_distribuicao()
+        if self._distribuicao is None:
+            return [gerador.randrange(self.contas) for _ in range(quantidade)]
+        return gerador.choices(
+            self._contas_por_rank, cum_weights=self._distribuicao, k=quantidade
+        )
+
+    def operacoes(self, quantidade=None):
+        """Fluxo preguiçoso de ``Operacao``; sem ``quantidade`` não termina.
+
+        Só um lote de ``tamanho_lote`` operações fica em memória por vez.
+        ``Operacao.conta`` é ``None`` quando a falha sorteada é de conta
+        inexistente.
+        """
+        gerador = self._aleatorio("operacoes")
+        tipos_falha = TIPOS_FALHA + (None,)
+        pesos_falha = self._pesos_falhas + [1 - sum(self._pesos_falhas)]
+        restantes = quantidade
+        while restantes is None or restantes > 0:
+            lote = self.tamanho_lote
+            if restantes is not None:
+                lote = min(lote, restantes)
+                restantes -= lote
+            tipos = gerador.choices(TIPOS_OPERACAO, self._pesos_tipos, k=lote)
+            contas = self.sortear_contas(gerador, lote)
+            falhas = gerador.choices(tipos_falha, pesos_falha, k=lote)
+            for tipo, conta, falha in zip(tipos, contas, falhas):
+                valor = round(gerador.lognormvariate(self._mu, self.dispersao), 2)
+                if falha == "valor_invalido":
+                    valor = -valor
+                elif falha == "conta_inexistente":
+                    conta = None
+                yield Operacao(tipo, conta, valor, falha == "cpf_invalido")
+
+
+class _Alvo:
+    def __init__(self):
+        self._respostas = deque()
+        self._cpfs = []
+
+    def _responder(self, mensagem=""):
+        """Função de entrada injetada no motor: devolve a próxima resposta."""
+        return self._respostas.popleft()
+
+    def _identificar(self, operacao):
+        if not self._cpfs:
+            raise RuntimeError(
+                "Nenhuma conta carregada: use carregar ou cadastrar_todos "
+                "antes de aplicar operações."
+            )
+        if operacao.conta is None:
+            cpf, numero = self._cpfs[0], NUMERO_INEXISTENTE
+        else:
+            cpf, numero = self._cpfs[operacao.conta], str(operacao.conta + 1)
+        return (CPF_INVALIDO if operacao.cpf_invalido else cpf), numero
+
+    def executar(self, operacoes):
+        """Aplica cada operação pelos fluxos interativos do motor."""
+        aplicadas = 0
+        for operacao in operacoes:
+            self.aplicar(operacao)
+            aplicadas += 1
+        return aplicadas
+
+    def cadastrar_todos(self, gerador):
+        """Cadastra clientes e contas um a um, como faria um operador."""
+        cadastros = list(gerador.cadastros())
+        for cadastro in cadastros:
+            self.cadastrar_cliente(cadastro)
+        for indice in range(gerador.contas):
+            self.abrir_conta(cadastros[gerador.cliente_da_conta(indice)].cpf)
+
+
+class AlvoOrientado(_Alvo):
+    """Conduz a carga sobre um ``SistemaBancario``.
+
+    As respostas aos menus chegam pela ``entrada`` do sistema, que passa a ser
+    a fila deste alvo.
+    """
+
+    def __init__(self, sistema=None):
+        super().__init__()
+        self.sistema = sistema if sistema is not None else SistemaBancario()
+        self.sistema.entrada = self._responder
+
+    @coleta_pausada()
+    def carregar(self, gerador):
+        """Monta clientes e contas diretamente, sem passar pelo menu.
+
+        O saldo inicial é gravado direto em ``_saldo``, sem lançamento no
+        extrato nem aviso aos observadores, como faz ``carregar`` do snapshot.
+        Por isso todos os índices derivados do sistema são reconstruídos logo
+        em seguida, antes de qualquer operação.
+        """
+        sistema = self.sistema
+        clientes = [PessoaFisica(*cadastro) for cadastro in gerador.cadastros()]
+        for indice, saldo in enumerate(gerador.saldos_iniciais()):
+            cliente = clientes[gerador.cliente_da_conta(indice)]
+            conta = ContaCorrente(
+                indice + 1,
+                cliente,
+                limite_saques=gerador.limite_saques,
+                agencia=sistema.agencia,
+            )
+            conta._saldo = saldo
+            cliente.adicionar_conta(conta)
+            sistema.contas.append(conta)
+            self._cpfs.append(cliente.cpf)
+        sistema.clientes.extend(clientes)
+        sistema.indice_nomes.sincronizar(sistema.clientes)
+        sistema.indice_saldos.adicionar_varias(sistema.contas)
+        sistema.contadores_regionais.reconstruir(sistema.clientes, sistema.contas)
+        sistema.vincular_contas()
+        sistema.ajustar_numeracao()
+        return sistema
+
+    def cadastrar_cliente(self, cadastro):
+        self._respostas.extend(
+            (
+                cadastro.cpf,
+                cadastro.nome,
+                formatar_nascimento(cadastro.nascimento),
+                cadastro.endereco,
+            )
+        )
+        self.sistema.criar_usuario()
+
+    def abrir_conta(self, cpf):
+        contas = len(self.sistema.contas)
+        self._respostas.append(cpf)
+        self.sistema.criar_conta()
+        if len(self.sistema.contas) > contas:
+            self._cpfs.append(cpf)
+
+    def aplicar(self, operacao):
+        cpf, numero = self._identificar(operacao)
+        sistema = self.sistema
+        tipo = operacao.tipo
+        if tipo == "deposito":
+            self._respostas.extend((cpf, numero, f"{operacao.valor:.2f}"))
+            sistema.depositar()
+        elif tipo == "saque":
+            self._respostas.extend((cpf, numero, f"{operacao.valor:.2f}"))
+            sistema.sacar()
+        elif tipo == "extrato":
+            self._respostas.extend((cpf, numero))
+            sistema.exibir_extrato()
+        elif tipo == "consulta":
+            sistema.filtrar_conta(cpf, numero)
+        else:
+            self._respostas.append(cpf)
+            sistema.listar_contas()
+        # Fluxos que falham cedo deixam respostas sem ler.
+        self._respostas.clear()
+
+
+class AlvoProcedural(_Alvo):
+    """Conduz a carga sobre as funções de ``otimizando_sistema_bancario``.
+
+    As contas ficam numa ``TabelaContas``, salvo se ``contas`` (uma lista de
+    dicts, por exemplo) for informado.
+    """
+
+    def __init__(self, agencia=Constants.BRANCH, contas=None):
+        super().__init__()
+        self.agencia = agencia
+        self.usuarios = []
+        self.contas = TabelaContas() if contas is None else contas
+        self.indice_nomes = IndiceNomes()
+
+    @coleta_pausada()
+    def carregar(self, gerador):
+        """Monta usuários e contas diretamente, sem passar pelo menu."""
+        usuarios = self.usuarios
+        for cadastro in gerador.cadastros():
+            usuarios.append(
+                {
+                    "nome": cadastro.nome,
+                    "nascimento": cadastro.nascimento,
+                    "cpf": cadastro.cpf,
+                    "endereco": cadastro.endereco,
+                    "local": interpretar_endereco(cadastro.endereco),
+                }
+            )
+        for indice, saldo in enumerate(gerador.saldos_iniciais()):
+            usuario = usuarios[gerador.cliente_da_conta(indice)]
+            self.contas.append(
+                {
+                    "agencia": self.agencia,
+                    "numero_conta": indice + 1,
+                    "usuario": usuario,
+                    "saldo": saldo,
+                    "extrato": "",
+                    "numero_saques": 0,
+                    "limite": 500,
+                    "limite_saques": gerador.limite_saques,
+                    "quantidade_transacoes": 0,
+                    "volume": 0.0,
+                }
+            )
+            self._cpfs.append(usuario["cpf"])
+        self.indice_nomes.sincronizar(usuarios)
+        return usuarios, self.contas
+
+    def cadastrar_cliente(self, cadastro):
+        self._respostas.extend(
+            (
+                cadastro.cpf,
+                cadastro.nome,
+                formatar_nascimento(cadastro.nascimento),
+                cadastro.endereco,
+            )
+        )
+        criar_usuario(self.usuarios, self.indice_nomes, entrada=self._responder)
+
+    def abrir_conta(self, cpf):
+        self._respostas.append(cpf)
+        conta = criar_conta(
+            self.agencia, len(self.contas) + 1, self.usuarios, entrada=self._responder
+        )
+        if conta:
+            self.contas.append(conta)
+            self._cpfs.append(cpf)
+
+    def aplicar(self, operacao):
+        cpf, numero = self._identificar(operacao)
+        tipo = operacao.tipo
+        if tipo == "deposito":
+            self._respostas.extend((cpf, numero, f"{operacao.valor:.2f}"))
+            depositar(self.contas, entrada=self._responder)
+        elif tipo == "saque":
+            self._respostas.extend((cpf, numero, f"{operacao.valor:.2f}"))
+            sacar(self.contas, entrada=self._responder)
+        elif tipo == "extrato":
+            self._respostas.extend((cpf, numero))
+            exibir_extrato(self.contas, entrada=self._responder)
+        elif tipo == "consulta":
+            encontrar_conta(self.contas, cpf, numero)
+        else:
+            self._respostas.append(cpf)
+            listar_contas(self.contas, entrada=self._responder)
+        self._respostas.clear()
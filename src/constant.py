@@ -1,6 +1,7 @@
 class Constants:
     CPF_PATTERN = r"^\d{3}\.\d{3}\.\d{3}-\d{2}$"
     BIRTH_DATE_PATTERN = r"^\d{2}/\d{2}/\d{4}$"
+    BRANCH_PATTERN = r"^\d{4}$"
 
     FAIL_CPF_MESSAGE = "CPF inválido! O CPF deve estar no formato xxx.xxx.xxx-xx."
     FAIL_OPERATION_MESSAGE = "Operação falhou! Nenhuma conta cadastrada."
@@ -12,10 +13,21 @@ class Constants:
         "Usuário não encontrado, fluxo de criação de conta encerrado."
     )
     FAIL_VALUE_MESSAGE = "Operação falhou! O valor informado é inválido."
+    FAIL_SAME_ACCOUNT_TRANSFER_MESSAGE = (
+        "Operação falhou! Conta de origem e destino são iguais."
+    )
+    FAIL_BRANCH_MESSAGE = "Agência inválida! A agência deve ter 4 dígitos."
+    FAIL_DUPLICATED_TRANSACTION_MESSAGE = (
+        "Operação ignorada! Transação já processada anteriormente."
+    )
 
     INFO_CPF_MESSAGE = "Informe o CPF (formato xxx.xxx.xxx-xx): "
     INFO_ACCOUNT_NUMBER_MESSAGE = "Informe o número da conta: "
+    INFO_BRANCH_MESSAGE = "Informe a agência (formato xxxx): "
 
     BRANCH = "0001"
     WITHDRAWAL_LIMIT = 1000.00
     DAILY_WITHDRAWAL_LIMIT = 3
+    SAVINGS_DAILY_RATE = 0.0002
+
+    METRICS_PORT_ENV = "BANCO_METRICAS_PORTA"
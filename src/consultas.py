@@ -0,0 +1,235 @@
+import threading
+from collections import defaultdict, namedtuple
+
+PlanoConsulta = namedtuple("PlanoConsulta", "indice estimativa estimativas")
+
+
+class IndiceSaques:
+    """Contas agrupadas por ``numero_saques``, com o conjunto das esgotadas.
+
+    Compartilhado por contas de travas diferentes, o índice tem trava própria.
+    """
+
+    def __init__(self):
+        self._por_valor = defaultdict(dict)
+        self._valores = {}
+        self._esgotadas = {}
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._valores)
+
+    def __contains__(self, conta):
+        return id(conta) in self._valores
+
+    def adicionar(self, conta):
+        if not hasattr(conta, "numero_saques"):
+            return
+        with self._trava:
+            if conta in self:
+                return
+            conta.adicionar_observador(self.atualizar)
+            self._gravar(conta)
+
+    def remover(self, conta):
+        with self._trava:
+            if conta not in self:
+                return
+            self._apagar(conta)
+            conta.remover_observador(self.atualizar)
+
+    def limpar(self):
+        with self._trava:
+            for grupo in list(self._por_valor.values()):
+                for conta in list(grupo.values()):
+                    self._apagar(conta)
+                    conta.remover_observador(self.atualizar)
+
+    def atualizar(self, conta, saldo_anterior):
+        with self._trava:
+            valor = self._valores.get(id(conta))
+            if valor is not None and valor != conta.numero_saques:
+                self._apagar(conta)
+                self._gravar(conta)
+
+    def _gravar(self, conta):
+        valor = conta.numero_saques
+        self._valores[id(conta)] = valor
+        self._por_valor[valor][id(conta)] = conta
+        if valor >= conta.limite_saques:
+            self._esgotadas[id(conta)] = conta
+
+    def _apagar(self, conta):
+        valor = self._valores.pop(id(conta))
+        grupo = self._por_valor[valor]
+        del grupo[id(conta)]
+        if not grupo:
+            del self._por_valor[valor]
+        self._esgotadas.pop(id(conta), None)
+
+    def _valores_na_faixa(self, minimo, maximo):
+        return [
+            valor
+            for valor in self._por_valor
+            if (minimo is None or valor >= minimo)
+            and (maximo is None or valor <= maximo)
+        ]
+
+    def contar_faixa(self, minimo=None, maximo=None):
+        with self._trava:
+            return sum(
+                len(self._por_valor[valor])
+                for valor in self._valores_na_faixa(minimo, maximo)
+            )
+
+    def contas_por_faixa(self, minimo=None, maximo=None):
+        with self._trava:
+            return [
+                conta
+                for valor in sorted(self._valores_na_faixa(minimo, maximo))
+                for conta in self._por_valor[valor].values()
+            ]
+
+    def contar_esgotadas(self):
+        return len(self._esgotadas)
+
+    def esgotadas(self):
+        with self._trava:
+            return list(self._esgotadas.values())
+
+
+class MotorConsultas:
+    """Consultas combinadas sobre ``SistemaBancario.contas``.
+
+    Cada critério disponível estima quantas contas ele seleciona a partir do
+    próprio índice; o planejador busca as candidatas no índice mais seletivo
+    e aplica os demais critérios só sobre elas.
+    """
+
+    def __init__(self, sistema):
+        self.sistema = sistema
+        self.indice_saques = IndiceSaques()
+        self._origem = None
+        self._indexadas = 0
+
+    def _sincronizar(self):
+        contas = self.sistema.contas
+        if contas is not self._origem or len(contas) < self._indexadas:
+            self.indice_saques.limpar()
+            self._origem = contas
+            self._indexadas = 0
+        novas = contas[self._indexadas :]
+        if novas:
+            self.sistema.indice_saldos.adicionar_varias(novas)
+        for conta in novas:
+            self.indice_saques.adicionar(conta)
+        self._indexadas = len(contas)
+
+    def _candidatos(
+        self,
+        agencia,
+        saldo_minimo,
+        saldo_maximo,
+        saques_minimo,
+        saques_maximo,
+        saques_esgotados,
+    ):
+        # (nome do índice, estimativa, função que materializa as candidatas)
+        saldos = self.sistema.indice_saldos
+        saques = self.indice_saques
+        candidatos = []
+        if agencia is not None:
+            particao = self.sistema.particao_agencia(agencia)
+            candidatos.append(("agencia", len(particao), lambda: particao.contas))
+        if saldo_minimo is not None or saldo_maximo is not None:
+            candidatos.append(
+                (
+                    "saldo",
+                    saldos.contar_faixa(saldo_minimo, saldo_maximo),
+                    lambda: saldos.contas_por_faixa(saldo_minimo, saldo_maximo),
+                )
+            )
+        if saques_minimo is not None or saques_maximo is not None:
+            candidatos.append(
+                (
+                    "numero_saques",
+                    saques.contar_faixa(saques_minimo, saques_maximo),
+                    lambda: saques.contas_por_faixa(saques_minimo, saques_maximo),
+                )
+            )
+        if saques_esgotados:
+            candidatos.append(
+                ("saques_esgotados", saques.contar_esgotadas(), saques.esgotadas)
+            )
+        return candidatos
+
+    def planejar(self, **criterios):
+        self._sincronizar()
+        candidatos = self._candidatos(**_normalizar(criterios))
+        estimativas = {nome: estimativa for nome, estimativa, _ in candidatos}
+        if not candidatos:
+            return PlanoConsulta("varredura", len(self.sistema.contas), estimativas)
+        nome, estimativa, _ = min(candidatos, key=lambda candidato: candidato[1])
+        return PlanoConsulta(nome, estimativa, estimativas)
+
+    def consultar(self, **criterios):
+        """Contas que atendem a todos os critérios informados.
+
+        Critérios: ``agencia``, ``saldo_minimo``, ``saldo_maximo``,
+        ``saques_minimo``, ``saques_maximo`` e ``saques_esgotados``.
+        """
+        self._sincronizar()
+        criterios = _normalizar(criterios)
+        candidatos = self._candidatos(**criterios)
+        if candidatos:
+            _, _, materializar = min(candidatos, key=lambda candidato: candidato[1])
+            contas = materializar()
+        else:
+            contas = self.sistema.contas
+        return [conta for conta in contas if _atende(conta, **criterios)]
+
+
+CRITERIOS = (
+    "agencia",
+    "saldo_minimo",
+    "saldo_maximo",
+    "saques_minimo",
+    "saques_maximo",
+    "saques_esgotados",
+)
+
+
+def _normalizar(criterios):
+    desconhecidos = set(criterios) - set(CRITERIOS)
+    if desconhecidos:
+        nomes = ", ".join(sorted(desconhecidos))
+        raise TypeError(f"Critérios desconhecidos: {nomes}.")
+    return {nome: criterios.get(nome) for nome in CRITERIOS}
+
+
+def _atende(
+    conta,
+    agencia,
+    saldo_minimo,
+    saldo_maximo,
+    saques_minimo,
+    saques_maximo,
+    saques_esgotados,
+):
+    if agencia is not None and conta.agencia != agencia:
+        return False
+    if saldo_minimo is not None and conta.saldo < saldo_minimo:
+        return False
+    if saldo_maximo is not None and conta.saldo > saldo_maximo:
+        return False
+    numero_saques = getattr(conta, "numero_saques", None)
+    if saques_minimo is not None or saques_maximo is not None or saques_esgotados:
+        if numero_saques is None:
+            return False
+        if saques_minimo is not None and numero_saques < saques_minimo:
+            return False
+        if saques_maximo is not None and numero_saques > saques_maximo:
+            return False
+        if saques_esgotados and numero_saques < conta.limite_saques:
+            return False
+    return True
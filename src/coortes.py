@@ -0,0 +1,151 @@
+import re
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import date
+from itertools import repeat
+
+from src.constant import Constants
+
+LIMITES_IDADE = (18, 26, 36, 46, 60)
+DESCONHECIDA = "desconhecida"
+
+Coorte = namedtuple(
+    "Coorte", "faixa clientes contas saldo_total quantidade_transacoes volume"
+)
+
+
+def ordinal_nascimento(texto):
+    """Converte "DD/MM/AAAA" no ordinal do dia (``date.toordinal``)."""
+    if not re.match(Constants.BIRTH_DATE_PATTERN, texto):
+        raise ValueError(f"Data de nascimento inválida: {texto!r}.")
+    dia, mes, ano = texto.split("/")
+    return date(int(ano), int(mes), int(dia)).toordinal()
+
+
+def formatar_nascimento(ordinal):
+    return date.fromordinal(ordinal).strftime("%d/%m/%Y")
+
+
+def _subtrair_anos(dia, anos):
+    try:
+        return dia.replace(year=dia.year - anos)
+    except ValueError:  # 29/02 em ano não bissexto
+        return dia.replace(year=dia.year - anos, day=28)
+
+
+def rotulos_faixas(limites=LIMITES_IDADE):
+    rotulos = [f"<{limites[0]}"]
+    rotulos += [f"{inicio}-{fim - 1}" for inicio, fim in zip(limites, limites[1:])]
+    rotulos.append(f"{limites[-1]}+")
+    return rotulos
+
+
+def _indices_faixas(ordinais, hoje, limites):
+    # Quem tem ao menos ``n`` anos nasceu até ``hoje - n anos``. Com os cortes
+    # das idades maiores primeiro, bisect_left conta quantos limites a pessoa
+    # não atingiu; a faixa é o complemento dessa contagem.
+    cortes = [
+        _subtrair_anos(hoje, limite).toordinal() for limite in reversed(limites)
+    ]
+    ultima = len(limites)
+    return array(
+        "B",
+        (
+            ultima - posicao
+            for posicao in map(bisect_left, repeat(cortes), ordinais)
+        ),
+    )
+
+
+def _agregar(ordinais, saldos, contas, quantidades, volumes, hoje, limites):
+    if hoje is None:
+        hoje = date.today()
+    rotulos = rotulos_faixas(limites)
+    faixa_desconhecida = len(rotulos)
+    totais = [[0, 0, 0.0, 0, 0.0] for _ in range(faixa_desconhecida + 1)]
+    indices = _indices_faixas(ordinais, hoje, limites)
+    for ordinal, faixa, saldo, n_contas, quantidade, volume in zip(
+        ordinais, indices, saldos, contas, quantidades, volumes
+    ):
+        total = totais[faixa if ordinal else faixa_desconhecida]
+        total[0] += 1
+        total[1] += n_contas
+        total[2] += saldo
+        total[3] += quantidade
+        total[4] += volume
+    return [
+        Coorte(rotulo, *total)
+        for rotulo, total in zip(rotulos + [DESCONHECIDA], totais)
+        if rotulo != DESCONHECIDA or total[0]
+    ]
+
+
+def coortes_etarias(clientes, hoje=None, limites=LIMITES_IDADE):
+    """Clientes, contas, saldos e transações por faixa etária.
+
+    As colunas são montadas numa única passada pelos clientes e a faixa de
+    todos os ordinais é calculada de uma vez com ``bisect``. Quantidade e
+    volume vêm dos totais que o ``Historico`` de cada conta mantém a cada
+    lançamento, sem percorrer as transações.
+    """
+    ordinais = array("l")
+    saldos = array("d")
+    contas = array("l")
+    quantidades = array("l")
+    volumes = array("d")
+    for cliente in clientes:
+        ordinais.append(getattr(cliente, "nascimento", None) or 0)
+        saldos.append(sum(conta.saldo for conta in cliente.contas))
+        contas.append(len(cliente.contas))
+        historicos = [conta.historico for conta in cliente.contas]
+        quantidades.append(sum(h.quantidade_transacoes for h in historicos))
+        volumes.append(sum(h.volume for h in historicos))
+    return _agregar(ordinais, saldos, contas, quantidades, volumes, hoje, limites)
+
+
+def totais_extrato(extrato):
+    """Quantidade e volume dos lançamentos de um extrato em texto."""
+    quantidade, volume = 0, 0.0
+    for linha in extrato.splitlines():
+        _, _, valor = linha.rpartition("R$ ")
+        if valor:
+            quantidade += 1
+            volume += float(valor)
+    return quantidade, volume
+
+
+def _ordinal_usuario(usuario):
+    # ``criar_usuario`` guarda só o ordinal; dicionários montados à mão no
+    # formato antigo trazem apenas o texto.
+    if usuario.get("nascimento"):
+        return usuario["nascimento"]
+    try:
+        return ordinal_nascimento(usuario.get("data_nascimento", ""))
+    except ValueError:
+        return 0
+
+
+def coortes_procedurais(usuarios, contas, hoje=None, limites=LIMITES_IDADE):
+    """Mesma análise para os dicionários e a tabela do motor procedural."""
+    posicoes = {id(usuario): indice for indice, usuario in enumerate(usuarios)}
+    ordinais = array("l", map(_ordinal_usuario, usuarios))
+    saldos = array("d", [0.0]) * len(usuarios)
+    n_contas = array("l", [0]) * len(usuarios)
+    quantidades = array("l", [0]) * len(usuarios)
+    volumes = array("d", [0.0]) * len(usuarios)
+    for conta in contas:
+        indice = posicoes.get(id(conta["usuario"]))
+        if indice is None:
+            continue
+        saldos[indice] += conta["saldo"]
+        n_contas[indice] += 1
+        quantidade = conta.get("quantidade_transacoes")
+        if quantidade is None:
+            # Conta montada fora de ``criar_conta``, sem os totais mantidos.
+            quantidade, volume = totais_extrato(conta["extrato"])
+        else:
+            volume = conta["volume"]
+        quantidades[indice] += quantidade
+        volumes[indice] += volume
+    return _agregar(ordinais, saldos, n_contas, quantidades, volumes, hoje, limites)
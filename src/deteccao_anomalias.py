@@ -0,0 +1,104 @@
+import math
+import time
+from collections import OrderedDict, deque, namedtuple
+
+Alerta = namedtuple("Alerta", "conta tipo valor motivo escore")
+
+
+class EstatisticasConta:
+    """Média e variância móveis (EWMA) do valor e taxa de eventos com decaimento."""
+
+    __slots__ = ("amostras", "media", "variancia", "rajada", "ultimo_evento")
+
+    def __init__(self):
+        self.amostras = 0
+        self.media = 0.0
+        self.variancia = 0.0
+        self.rajada = 0.0
+        self.ultimo_evento = None
+
+
+class DetectorAnomalias:
+    def __init__(
+        self,
+        alfa=0.1,
+        limite_escore=4.0,
+        minimo_amostras=5,
+        janela_rajada=60.0,
+        limite_rajada=10.0,
+        capacidade=1_000_000,
+        maximo_alertas=10_000,
+        relogio=None,
+    ):
+        self.alfa = alfa
+        self.limite_escore = limite_escore
+        self.minimo_amostras = minimo_amostras
+        self.janela_rajada = janela_rajada
+        self.limite_rajada = limite_rajada
+        self.capacidade = capacidade
+        self._relogio = relogio or time.monotonic
+        self._estatisticas = OrderedDict()
+        self.alertas = deque(maxlen=maximo_alertas)
+        self.ao_alertar = None
+
+    def __len__(self):
+        return len(self._estatisticas)
+
+    def anexar(self, sistema):
+        sistema.assinar_lancamentos(self.observar)
+
+    def desanexar(self, sistema):
+        sistema.cancelar_lancamentos(self.observar)
+
+    def _obter_estatisticas(self, conta, tipo):
+        # Chave estável: ``id`` pode ser reaproveitado por outra conta depois
+        # que a original é coletada.
+        chave = (conta.agencia, conta.numero, tipo)
+        estatisticas = self._estatisticas.get(chave)
+        if estatisticas is None:
+            estatisticas = self._estatisticas[chave] = EstatisticasConta()
+            if len(self._estatisticas) > self.capacidade:
+                self._estatisticas.popitem(last=False)
+        else:
+            self._estatisticas.move_to_end(chave)
+        return estatisticas
+
+    def _emitir(self, conta, tipo, valor, motivo, escore):
+        alerta = Alerta(conta, tipo, valor, motivo, escore)
+        self.alertas.append(alerta)
+        if self.ao_alertar is not None:
+            self.ao_alertar(alerta)
+
+    def observar(self, conta, tipo, valor):
+        estatisticas = self._obter_estatisticas(conta, tipo)
+        agora = self._relogio()
+
+        if estatisticas.ultimo_evento is None:
+            estatisticas.rajada = 1.0
+        else:
+            decorrido = agora - estatisticas.ultimo_evento
+            estatisticas.rajada = (
+                estatisticas.rajada * math.exp(-decorrido / self.janela_rajada) + 1.0
+            )
+        estatisticas.ultimo_evento = agora
+        if estatisticas.rajada > self.limite_rajada:
+            self._emitir(conta, tipo, valor, "rajada", estatisticas.rajada)
+
+        if (
+            estatisticas.amostras >= self.minimo_amostras
+            and estatisticas.variancia > 0
+        ):
+            escore = (valor - estatisticas.media) / math.sqrt(estatisticas.variancia)
+            if escore > self.limite_escore:
+                self._emitir(conta, tipo, valor, "valor_atipico", escore)
+
+        if estatisticas.amostras == 0:
+            estatisticas.media = valor
+        else:
+            diferenca = valor - estatisticas.media
+            incremento = self.alfa * diferenca
+            estatisticas.media += incremento
+            estatisticas.variancia = (1 - self.alfa) * (
+                estatisticas.variancia + diferenca * incremento
+            )
+        estatisticas.amostras += 1
@@ -0,0 +1,141 @@
+import re
+import threading
+from collections import namedtuple
+
+from src.busca_nomes import normalizar
+
+Endereco = namedtuple("Endereco", "logradouro numero bairro cidade estado")
+
+PADRAO_ENDERECO = re.compile(
+    r"^\s*(?P<logradouro>[^,]+?)\s*,\s*(?P<numero>.+?)\s+-\s+(?P<bairro>.+?)"
+    r"\s+-\s+(?P<cidade>[^/]+?)\s*/\s*(?P<estado>[A-Za-z]{2})\s*$"
+)
+
+
+def interpretar_endereco(texto):
+    """Separa "logradouro, número - bairro - cidade/sigla estado" em campos.
+
+    Endereços fora do formato ficam só com o logradouro preenchido.
+    """
+    correspondencia = PADRAO_ENDERECO.match(texto)
+    if correspondencia is None:
+        return Endereco(texto.strip(), None, None, None, None)
+    campos = correspondencia.groupdict()
+    campos["estado"] = campos["estado"].upper()
+    return Endereco(**campos)
+
+
+class Regiao:
+    __slots__ = ("nome", "clientes", "contas", "saldo_total")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.clientes = 0
+        self.contas = 0
+        self.saldo_total = 0.0
+
+    def __repr__(self):
+        return (
+            f"Regiao({self.nome!r}, clientes={self.clientes}, "
+            f"contas={self.contas}, saldo_total={self.saldo_total:.2f})"
+        )
+
+
+class ContadoresRegionais:
+    """Clientes, contas e saldo total por cidade e por estado.
+
+    Os contadores são atualizados no cadastro (como ouvinte do
+    ``SistemaBancario``) e a cada movimentação (como observador da conta),
+    então a leitura de uma região é O(1). Contas de travas diferentes
+    notificam ao mesmo tempo, por isso os contadores têm trava própria.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        # conta -> (saldo já somado às regiões, *regiões)
+        self._regioes_conta = {}
+        # (cidade como digitada, sigla) -> Regiao, para não normalizar o
+        # nome da cidade de novo a cada cliente e conta.
+        self._cidades_texto = {}
+        self.limpar()
+
+    def limpar(self):
+        with self._trava:
+            for conta in self._regioes_conta:
+                conta.remover_observador(self._atualizar_saldo)
+            self._estados = {}
+            self._cidades = {}
+            self._cidades_texto = {}
+            self._regioes_conta = {}
+
+    def _regioes(self, cliente):
+        local = getattr(cliente, "local", None)
+        if local is None or local.estado is None:
+            return ()
+        estado = self._estados.get(local.estado)
+        if estado is None:
+            estado = self._estados[local.estado] = Regiao(local.estado)
+        cidade = self._cidades_texto.get((local.cidade, local.estado))
+        if cidade is None:
+            chave = (normalizar(local.cidade), local.estado)
+            cidade = self._cidades.get(chave)
+            if cidade is None:
+                cidade = self._cidades[chave] = Regiao(
+                    f"{local.cidade}/{local.estado}"
+                )
+            self._cidades_texto[(local.cidade, local.estado)] = cidade
+        return cidade, estado
+
+    def registrar_cliente(self, cliente):
+        with self._trava:
+            for regiao in self._regioes(cliente):
+                regiao.clientes += 1
+
+    def registrar_conta(self, conta):
+        with self._trava:
+            if conta in self._regioes_conta:
+                return
+            conta.adicionar_observador(self._atualizar_saldo)
+            regioes = self._regioes(conta.cliente)
+            saldo = conta.saldo
+            self._regioes_conta[conta] = (saldo, *regioes)
+            for regiao in regioes:
+                regiao.contas += 1
+                regiao.saldo_total += saldo
+
+    def _atualizar_saldo(self, conta, saldo_anterior):
+        # A variação parte do saldo já somado, não de ``saldo_anterior``: uma
+        # notificação que chega depois do cadastro da conta não conta duas vezes.
+        with self._trava:
+            somado, *regioes = self._regioes_conta[conta]
+            saldo = conta.saldo
+            self._regioes_conta[conta] = (saldo, *regioes)
+            for regiao in regioes:
+                regiao.saldo_total += saldo - somado
+
+    def reconstruir(self, clientes, contas):
+        self.limpar()
+        for cliente in clientes:
+            self.registrar_cliente(cliente)
+        for conta in contas:
+            self.registrar_conta(conta)
+
+    def estado(self, sigla):
+        return self._estados.get(sigla.upper()) or Regiao(sigla.upper())
+
+    def cidade(self, cidade, sigla):
+        chave = (normalizar(cidade), sigla.upper())
+        return self._cidades.get(chave) or Regiao(f"{cidade}/{sigla.upper()}")
+
+    def estados(self):
+        return sorted(self._estados.values(), key=lambda regiao: regiao.nome)
+
+    def cidades(self, sigla=None):
+        return sorted(
+            (
+                regiao
+                for (_, estado), regiao in self._cidades.items()
+                if sigla is None or estado == sigla.upper()
+            ),
+            key=lambda regiao: regiao.nome,
+        )
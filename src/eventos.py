@@ -0,0 +1,245 @@
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.livro_razao import CREDITOS, ROTULOS_EXTRATO
+from src.modelando_sistema_bancario_poo import (ContaCorrente, ContaPoupanca,
+                                                PessoaFisica, SistemaBancario)
+
+ARQUIVO_CADASTRO = "cadastro.jsonl"
+
+
+class EventoInvalido(ValueError):
+    pass
+
+
+class ArmazemEventos:
+    """Eventos do banco gravados em ordem, particionados por conta.
+
+    Cadastros de clientes e contas ficam num fluxo único; lançamentos vão
+    para a partição da conta (``crc32`` de agência/número), de modo que cada
+    partição pode ser reproduzida de forma independente. Sem ``diretorio``
+    os eventos ficam em memória.
+    """
+
+    def __init__(self, diretorio=None, particoes=8):
+        self.diretorio = diretorio
+        self.particoes = particoes
+        if diretorio is None:
+            self._cadastro = []
+            self._lancamentos = [[] for _ in range(particoes)]
+        else:
+            os.makedirs(diretorio, exist_ok=True)
+            self._cadastro = open(
+                os.path.join(diretorio, ARQUIVO_CADASTRO), "a", encoding="utf-8"
+            )
+            self._lancamentos = [
+                open(caminho, "a", encoding="utf-8")
+                for caminho in self._caminhos_particoes()
+            ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _caminhos_particoes(self):
+        return [
+            os.path.join(self.diretorio, f"particao-{indice:04d}.tsv")
+            for indice in range(self.particoes)
+        ]
+
+    def particao(self, agencia, numero):
+        return zlib.crc32(f"{agencia}/{numero}".encode("ascii")) % self.particoes
+
+    def _registrar_cadastro(self, evento):
+        if self.diretorio is None:
+            self._cadastro.append(evento)
+        else:
+            self._cadastro.write(json.dumps(evento, ensure_ascii=False) + "\n")
+
+    def registrar_cliente(self, cliente):
+        self._registrar_cadastro(
+            [
+                "cliente",
+                cliente.nome,
+                cliente.data_nascimento,
+                cliente.cpf,
+                cliente.endereco,
+            ]
+        )
+
+    def registrar_conta(self, conta):
+        if isinstance(conta, ContaPoupanca):
+            self._registrar_cadastro(
+                [
+                    "poupanca",
+                    conta.agencia,
+                    conta.numero,
+                    conta.cliente.cpf,
+                    conta.taxa_diaria,
+                ]
+            )
+            return
+        self._registrar_cadastro(
+            [
+                "conta",
+                conta.agencia,
+                conta.numero,
+                conta.cliente.cpf,
+                conta.limite,
+                conta.limite_saques,
+            ]
+        )
+
+    def registrar_transacao(self, conta, tipo, valor, data=None):
+        if conta is None:
+            # Historico avulso, sem conta: não há partição a que pertença.
+            return
+        if data is None:
+            data = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        destino = self._lancamentos[self.particao(conta.agencia, conta.numero)]
+        if self.diretorio is None:
+            destino.append((conta.agencia, conta.numero, tipo, valor, data))
+        else:
+            destino.write(
+                f"{conta.agencia}\t{conta.numero}\t{tipo}\t{valor!r}\t{data}\n"
+            )
+
+    def anexar(self, sistema):
+        sistema.assinar_lancamentos(self.registrar_transacao)
+        if self not in sistema.ouvintes_cadastro:
+            sistema.ouvintes_cadastro.append(self)
+
+    def desanexar(self, sistema):
+        sistema.cancelar_lancamentos(self.registrar_transacao)
+        if self in sistema.ouvintes_cadastro:
+            sistema.ouvintes_cadastro.remove(self)
+
+    def cadastro(self):
+        if self.diretorio is None:
+            return iter(self._cadastro)
+        self._cadastro.flush()
+        return _ler_cadastro(self._cadastro.name)
+
+    def fontes(self):
+        """Uma fonte por partição: a lista de eventos ou o caminho do arquivo."""
+        if self.diretorio is None:
+            return list(self._lancamentos)
+        self.descarregar()
+        return self._caminhos_particoes()
+
+    def descarregar(self):
+        if self.diretorio is not None:
+            self._cadastro.flush()
+            for arquivo in self._lancamentos:
+                arquivo.flush()
+
+    def fechar(self):
+        if self.diretorio is not None:
+            self._cadastro.close()
+            for arquivo in self._lancamentos:
+                arquivo.close()
+
+
+def _ler_cadastro(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            yield json.loads(linha)
+
+
+def _ler_lancamentos(fonte):
+    if not isinstance(fonte, str):
+        yield from fonte
+        return
+    with open(fonte, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            agencia, numero, tipo, valor, data = linha.rstrip("\n").split("\t")
+            yield agencia, int(numero), tipo, float(valor), data
+
+
+def _reproduzir_particao(fonte):
+    estados = {}
+    for agencia, numero, tipo, valor, data in _ler_lancamentos(fonte):
+        estado = estados.get((agencia, numero))
+        if estado is None:
+            estado = estados[agencia, numero] = [0, 0, [], []]
+        if tipo not in ROTULOS_EXTRATO:
+            raise EventoInvalido(f"Tipo de lançamento desconhecido: {tipo!r}.")
+        if tipo in CREDITOS:
+            estado[0] += valor
+        else:
+            estado[0] -= valor
+        # Só saques consomem o limite diário; transferências, não.
+        if tipo == "Saque":
+            estado[1] += 1
+        estado[2].append(f"{ROTULOS_EXTRATO[tipo]}: R$ {valor:.2f}\n")
+        estado[3].append({"tipo": tipo, "valor": valor, "data": data})
+    return {
+        chave: (saldo, numero_saques, "".join(extrato), transacoes)
+        for chave, (saldo, numero_saques, extrato, transacoes) in estados.items()
+    }
+
+
+def _reconstruir_cadastro(sistema, eventos):
+    clientes = {}
+    contas = {}
+    for evento in eventos:
+        if evento[0] == "cliente":
+            _, nome, data_nascimento, cpf, endereco = evento
+            cliente = PessoaFisica(nome, data_nascimento, cpf, endereco)
+            clientes[cpf] = cliente
+            sistema.clientes.append(cliente)
+        elif evento[0] in ("conta", "poupanca"):
+            agencia, numero, cpf, *parametros = evento[1:]
+            cliente = clientes.get(cpf)
+            if cliente is None:
+                raise EventoInvalido(f"Conta {agencia}/{numero} sem cliente {cpf}.")
+            classe = ContaCorrente if evento[0] == "conta" else ContaPoupanca
+            conta = classe(numero, cliente, *parametros, agencia=agencia)
+            contas[agencia, numero] = conta
+            sistema.contas.append(conta)
+            cliente.adicionar_conta(conta)
+        else:
+            raise EventoInvalido(f"Evento de cadastro desconhecido: {evento[0]!r}.")
+    return contas
+
+
+def reconstruir_sistema(armazem, sistema=None, processos=None):
+    """Reconstrói clientes, contas e históricos reproduzindo os eventos.
+
+    O cadastro é reproduzido em sequência; as partições de lançamentos são
+    reproduzidas em paralelo (``processos=1`` executa tudo no processo atual).
+    """
+    if sistema is None:
+        sistema = SistemaBancario()
+    contas = _reconstruir_cadastro(sistema, armazem.cadastro())
+
+    fontes = armazem.fontes()
+    if processos == 1:
+        estados = map(_reproduzir_particao, fontes)
+        _aplicar_estados(contas, estados)
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            _aplicar_estados(contas, executor.map(_reproduzir_particao, fontes))
+
+    sistema.indice_saldos.adicionar_varias(sistema.contas)
+    sistema.contadores_regionais.reconstruir(sistema.clientes, sistema.contas)
+    sistema.vincular_contas()
+    sistema.ajustar_numeracao()
+    return sistema
+
+
+def _aplicar_estados(contas, estados):
+    for particao in estados:
+        for chave, (saldo, numero_saques, extrato, transacoes) in particao.items():
+            conta = contas.get(chave)
+            if conta is None:
+                raise EventoInvalido(f"Lançamento para conta inexistente {chave}.")
+            conta._saldo = saldo
+            conta._numero_saques = numero_saques
+            conta.extrato = extrato
+            conta.historico.restaurar(transacoes)
@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import deque, namedtuple
+
+BLOQUEAR = "bloquear"
+DESCARTAR_ANTIGO = "descartar_antigo"
+TRANSBORDAR = "transbordar"
+POLITICAS = (BLOQUEAR, DESCARTAR_ANTIGO, TRANSBORDAR)
+
+Alteracao = namedtuple(
+    "Alteracao", "sequencia tipo agencia numero_conta cpf valor momento"
+)
+
+
+class Assinatura:
+    """Fila limitada de um assinante do feed com sua política de contrapressão.
+
+    ``bloquear``: produtores assíncronos esperam espaço; o caminho de
+    lançamentos, que nunca pode esperar, deixa o excedente pendente em
+    memória até ``capacidade_pendentes`` (por padrão dez vezes a fila) e
+    descarta o que passar disso, contando em ``descartadas``.
+    ``descartar_antigo`` descarta a alteração mais
+    antiga da fila. ``transbordar`` grava o excedente em disco e o devolve à
+    fila, em ordem, conforme o assinante consome.
+    """
+
+    def __init__(
+        self,
+        nome,
+        capacidade=1000,
+        politica=BLOQUEAR,
+        diretorio=None,
+        capacidade_pendentes=None,
+    ):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de contrapressão desconhecida: {politica!r}.")
+        if politica == TRANSBORDAR and diretorio is None:
+            raise ValueError("A política transbordar exige um diretório.")
+        self.nome = nome
+        self.politica = politica
+        self.fila = asyncio.Queue(capacidade)
+        self.descartadas = 0
+        self.capacidade_pendentes = (
+            10 * capacidade if capacidade_pendentes is None else capacidade_pendentes
+        )
+        self._pendentes = deque()
+        self._transbordo = None
+        self._lidas_transbordo = 0
+        self._escritas_transbordo = 0
+        if politica == TRANSBORDAR:
+            os.makedirs(diretorio, exist_ok=True)
+            caminho = os.path.join(diretorio, f"{nome}.transbordo")
+            self._transbordo = open(caminho, "w+", encoding="utf-8")
+
+    @property
+    def atrasadas(self):
+        """Alterações retidas fora da fila (em memória ou em disco)."""
+        return len(self._pendentes) + (
+            self._escritas_transbordo - self._lidas_transbordo
+        )
+
+    def oferecer(self, alteracao):
+        if self.politica == DESCARTAR_ANTIGO:
+            if self.fila.full():
+                self.fila.get_nowait()
+                self.descartadas += 1
+            self.fila.put_nowait(alteracao)
+        else:
+            self._reabastecer()
+            if self.atrasadas or self.fila.full():
+                self._reter(alteracao)
+            else:
+                self.fila.put_nowait(alteracao)
+
+    async def colocar(self, alteracao):
+        if self.politica == BLOQUEAR and not self._pendentes:
+            await self.fila.put(alteracao)
+        else:
+            self.oferecer(alteracao)
+
+    def _reter(self, alteracao):
+        if self._transbordo is None:
+            if len(self._pendentes) >= self.capacidade_pendentes:
+                self.descartadas += 1
+            else:
+                self._pendentes.append(alteracao)
+            return
+        posicao = self._transbordo.tell()
+        self._transbordo.seek(0, os.SEEK_END)
+        self._transbordo.write(json.dumps(alteracao) + "\n")
+        self._transbordo.seek(posicao)
+        self._escritas_transbordo += 1
+
+    def _reabastecer(self):
+        while not self.fila.full() and self.atrasadas:
+            if self._pendentes:
+                self.fila.put_nowait(self._pendentes.popleft())
+                continue
+            self.fila.put_nowait(Alteracao(*json.loads(self._transbordo.readline())))
+            self._lidas_transbordo += 1
+            if self._lidas_transbordo == self._escritas_transbordo:
+                # Transbordo esvaziado: o arquivo recomeça do zero.
+                self._transbordo.seek(0)
+                self._transbordo.truncate()
+                self._lidas_transbordo = self._escritas_transbordo = 0
+
+    async def receber(self):
+        alteracao = await self.fila.get()
+        self._reabastecer()
+        return alteracao
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.receber()
+
+    def fechar(self):
+        if self._transbordo is not None:
+            self._transbordo.close()
+
+
+class FeedAlteracoes:
+    """Publica lançamentos e cadastros para assinantes assíncronos.
+
+    ``publicar`` nunca bloqueia nem falha: chamado fora da thread do loop,
+    agenda a entrega com ``call_soon_threadsafe``; se o loop já foi fechado,
+    a alteração é descartada e contada em ``perdidas``, pois o lançamento que
+    a gerou já foi aplicado.
+    """
+
+    def __init__(self, loop=None):
+        self._loop = loop
+        self._assinaturas = []
+        self._sequencia = itertools.count(1)
+        self.perdidas = 0
+
+    def assinar(
+        self,
+        nome,
+        capacidade=1000,
+        politica=BLOQUEAR,
+        diretorio=None,
+        capacidade_pendentes=None,
+    ):
+        if self._loop is None:
+            self._loop = _loop_atual()
+        assinatura = Assinatura(
+            nome, capacidade, politica, diretorio, capacidade_pendentes
+        )
+        self._assinaturas.append(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        self._assinaturas.remove(assinatura)
+        assinatura.fechar()
+
+    def _nova_alteracao(self, tipo, agencia, numero_conta, cpf, valor):
+        return Alteracao(
+            next(self._sequencia),
+            tipo,
+            agencia,
+            numero_conta,
+            cpf,
+            valor,
+            time.time_ns() // 1000,
+        )
+
+    def _distribuir(self, alteracao):
+        for assinatura in self._assinaturas:
+            assinatura.oferecer(alteracao)
+
+    def publicar(self, alteracao):
+        if self._loop is None or _loop_atual() is self._loop:
+            self._distribuir(alteracao)
+        else:
+            try:
+                self._loop.call_soon_threadsafe(self._distribuir, alteracao)
+            except RuntimeError:  # loop fechado
+                self.perdidas += 1
+
+    async def publicar_async(self, alteracao):
+        for assinatura in self._assinaturas:
+            await assinatura.colocar(alteracao)
+
+    def registrar_transacao(self, conta, tipo, valor):
+        if conta is None:
+            return
+        self.publicar(
+            self._nova_alteracao(
+                tipo, conta.agencia, conta.numero, conta.cliente.cpf, valor
+            )
+        )
+
+    def registrar_cliente(self, cliente):
+        self.publicar(
+            self._nova_alteracao("cliente_criado", None, None, cliente.cpf, 0.0)
+        )
+
+    def registrar_conta(self, conta):
+        self.publicar(
+            self._nova_alteracao(
+                "conta_criada", conta.agencia, conta.numero, conta.cliente.cpf, 0.0
+            )
+        )
+
+    def anexar(self, sistema):
+        sistema.assinar_lancamentos(self.registrar_transacao)
+        if self not in sistema.ouvintes_cadastro:
+            sistema.ouvintes_cadastro.append(self)
+
+    def desanexar(self, sistema):
+        sistema.cancelar_lancamentos(self.registrar_transacao)
+        if self in sistema.ouvintes_cadastro:
+            sistema.ouvintes_cadastro.remove(self)
+
+
+def _loop_atual():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
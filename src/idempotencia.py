@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+
+
+class CacheIdempotencia:
+    """Cache limitado de chaves de idempotência particionado por tempo.
+
+    As chaves são agrupadas em partições por janela de ``ttl / particoes``
+    segundos (e por tamanho). Expirar ou liberar espaço descarta a partição mais
+    antiga inteira, sem varrer o restante do cache.
+
+    ``reservar`` marca a chave como pendente de forma atômica, antes de a
+    transação ser lançada; ``confirmar`` a registra e ``liberar`` a descarta
+    se a transação falhar, permitindo nova tentativa.
+    """
+
+    def __init__(self, capacidade=100_000, ttl=3600.0, particoes=60, relogio=None):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._largura = ttl / particoes
+        self._tamanho_particao = max(1, capacidade // particoes)
+        self._relogio = relogio or time.monotonic
+        self._particoes = deque()
+        self._sequencia = 0
+        self._indice = {}
+        self._pendentes = set()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._indice)
+
+    def __contains__(self, chave):
+        return self.contem(chave)
+
+    def _particao_atual(self, agora):
+        janela = int(agora // self._largura)
+        if self._particoes:
+            particao = self._particoes[-1]
+            if particao[1] == janela and len(particao[2]) < self._tamanho_particao:
+                return particao
+        self._sequencia += 1
+        particao = (self._sequencia, janela, [])
+        self._particoes.append(particao)
+        return particao
+
+    def _descartar_mais_antiga(self):
+        sequencia, _, chaves = self._particoes.popleft()
+        for chave in chaves:
+            if self._indice.get(chave) == sequencia:
+                del self._indice[chave]
+
+    def _expirar(self, agora):
+        limite = int((agora - self.ttl) // self._largura)
+        while self._particoes and self._particoes[0][1] <= limite:
+            self._descartar_mais_antiga()
+
+    def contem(self, chave):
+        if chave not in self._indice:
+            return False
+        with self._trava:
+            self._expirar(self._relogio())
+            return chave in self._indice
+
+    def registrar(self, chave):
+        with self._trava:
+            return self._registrar(chave)
+
+    def reservar(self, chave):
+        with self._trava:
+            self._expirar(self._relogio())
+            if chave in self._indice or chave in self._pendentes:
+                return False
+            self._pendentes.add(chave)
+            return True
+
+    def confirmar(self, chave):
+        with self._trava:
+            self._pendentes.discard(chave)
+            self._registrar(chave)
+
+    def liberar(self, chave):
+        with self._trava:
+            self._pendentes.discard(chave)
+
+    def _registrar(self, chave):
+        agora = self._relogio()
+        self._expirar(agora)
+        if chave in self._indice:
+            return False
+        sequencia, _, chaves = self._particao_atual(agora)
+        chaves.append(chave)
+        self._indice[chave] = sequencia
+        while len(self._indice) > self.capacidade:
+            self._descartar_mais_antiga()
+        return True
+
+    def limpar(self):
+        with self._trava:
+            self._particoes.clear()
+            self._indice.clear()
+            self._pendentes.clear()
+
+
+cache_idempotencia = CacheIdempotencia()
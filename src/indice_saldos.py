@@ -0,0 +1,185 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+
+
+class _ListaOrdenada:
+    """Lista ordenada em blocos de até ``2 * carga`` chaves.
+
+    Inserir ou remover toca só um bloco, localizado por busca binária nos
+    máximos: o custo não cresce com o total de chaves, como num ``insort``
+    sobre uma lista única.
+    """
+
+    def __init__(self, carga=1000):
+        self._carga = carga
+        self._blocos = []
+        self._maximos = []
+        self._tamanho = 0
+
+    def __len__(self):
+        return self._tamanho
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocos)
+
+    def __reversed__(self):
+        return chain.from_iterable(map(reversed, reversed(self._blocos)))
+
+    def adicionar(self, chave):
+        blocos, maximos = self._blocos, self._maximos
+        if not blocos:
+            blocos.append([chave])
+            maximos.append(chave)
+        else:
+            posicao = min(bisect_left(maximos, chave), len(maximos) - 1)
+            bloco = blocos[posicao]
+            insort(bloco, chave)
+            maximos[posicao] = bloco[-1]
+            if len(bloco) > 2 * self._carga:
+                blocos.insert(posicao + 1, bloco[self._carga :])
+                del bloco[self._carga :]
+                maximos[posicao] = bloco[-1]
+                maximos.insert(posicao + 1, blocos[posicao + 1][-1])
+        self._tamanho += 1
+
+    def remover(self, chave):
+        blocos, maximos = self._blocos, self._maximos
+        posicao = bisect_left(maximos, chave)
+        if posicao == len(maximos):
+            return
+        bloco = blocos[posicao]
+        indice = bisect_left(bloco, chave)
+        if indice == len(bloco) or bloco[indice] != chave:
+            return
+        del bloco[indice]
+        if bloco:
+            maximos[posicao] = bloco[-1]
+        else:
+            del blocos[posicao]
+            del maximos[posicao]
+        self._tamanho -= 1
+
+    def estender(self, chaves):
+        """Junta ``chaves`` e reparte tudo em blocos, com uma só ordenação."""
+        todas = sorted(chain(self, chaves))
+        carga = self._carga
+        self._blocos = [todas[i : i + carga] for i in range(0, len(todas), carga)]
+        self._maximos = [bloco[-1] for bloco in self._blocos]
+        self._tamanho = len(todas)
+
+    def _posicao(self, chave, lado):
+        # (bloco, índice no bloco) do ponto de inserção de ``chave``.
+        busca = bisect_left if lado == "esquerda" else bisect_right
+        posicao = busca(self._maximos, chave)
+        if posicao == len(self._blocos):
+            return posicao, 0
+        return posicao, busca(self._blocos[posicao], chave)
+
+    def faixa(self, minimo, maximo):
+        """Chaves entre ``minimo`` e ``maximo``, e quantas são."""
+        inicio = (0, 0) if minimo is None else self._posicao(minimo, "esquerda")
+        fim = (
+            (len(self._blocos), 0)
+            if maximo is None
+            else self._posicao(maximo, "direita")
+        )
+        if fim <= inicio:
+            return iter(()), 0
+        (bloco_inicio, i), (bloco_fim, j) = inicio, fim
+        if bloco_inicio == bloco_fim:
+            return iter(self._blocos[bloco_inicio][i:j]), j - i
+        meio = self._blocos[bloco_inicio + 1 : bloco_fim]
+        partes = [self._blocos[bloco_inicio][i:], *meio]
+        if bloco_fim < len(self._blocos):
+            partes.append(self._blocos[bloco_fim][:j])
+        return chain.from_iterable(partes), sum(map(len, partes))
+
+
+class IndiceSaldos:
+    """Índice ordenado de contas por saldo, mantido a cada movimentação.
+
+    As contas notificam sob as suas próprias travas, que não excluem umas às
+    outras; o índice, compartilhado, tem a sua. Cada conta guarda a chave com
+    o saldo já indexado, então uma notificação que chega depois de a conta
+    ter sido (re)indexada não a duplica.
+    """
+
+    def __init__(self):
+        self._chaves = _ListaOrdenada()
+        # id(conta) -> chave (saldo, número, id, conta); o id desempata antes
+        # que a comparação chegue à conta.
+        self._contas = {}
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def __contains__(self, conta):
+        return id(conta) in self._contas
+
+    @staticmethod
+    def _chave(conta):
+        return (conta.saldo, conta.numero, id(conta), conta)
+
+    def adicionar(self, conta):
+        with self._trava:
+            if conta in self:
+                return
+            conta.adicionar_observador(self.atualizar)
+            chave = self._contas[id(conta)] = self._chave(conta)
+            self._chaves.adicionar(chave)
+
+    def adicionar_varias(self, contas):
+        with self._trava:
+            novas = [conta for conta in contas if conta not in self]
+            if not novas:
+                return
+            for conta in novas:
+                conta.adicionar_observador(self.atualizar)
+                self._contas[id(conta)] = self._chave(conta)
+            self._chaves.estender(self._contas[id(conta)] for conta in novas)
+
+    def remover(self, conta):
+        with self._trava:
+            chave = self._contas.pop(id(conta), None)
+            if chave is None:
+                return
+            self._chaves.remover(chave)
+            conta.remover_observador(self.atualizar)
+
+    def atualizar(self, conta, saldo_anterior):
+        with self._trava:
+            chave = self._contas.get(id(conta))
+            if chave is None or chave[0] == conta.saldo:
+                return
+            self._chaves.remover(chave)
+            chave = self._contas[id(conta)] = self._chave(conta)
+            self._chaves.adicionar(chave)
+
+    def maiores_saldos(self, k):
+        if k <= 0:
+            return []
+        with self._trava:
+            return [chave[3] for chave in islice(reversed(self._chaves), k)]
+
+    def menores_saldos(self, k):
+        if k <= 0:
+            return []
+        with self._trava:
+            return [chave[3] for chave in islice(self._chaves, k)]
+
+    def _faixa(self, minimo, maximo):
+        return self._chaves.faixa(
+            None if minimo is None else (minimo,),
+            None if maximo is None else (maximo, float("inf")),
+        )
+
+    def contar_faixa(self, minimo=None, maximo=None):
+        with self._trava:
+            return self._faixa(minimo, maximo)[1]
+
+    def contas_por_faixa(self, minimo=None, maximo=None):
+        with self._trava:
+            chaves, _ = self._faixa(minimo, maximo)
+            return [chave[3] for chave in chaves]
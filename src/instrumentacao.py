@@ -0,0 +1,136 @@
+import math
+import threading
+from time import perf_counter_ns
+
+
+class Histograma:
+    """Histograma log-linear (estilo HDR) de latências em nanossegundos."""
+
+    def __init__(self, bits_precisao=5):
+        self._bits = bits_precisao
+        self._sub = 1 << bits_precisao
+        self._baldes = []
+        self.contagem = 0
+        self.total = 0
+        self.maximo = 0
+
+    def _indice(self, valor):
+        if valor < self._sub:
+            return valor
+        expoente = valor.bit_length() - self._bits - 1
+        return expoente * self._sub + (valor >> expoente)
+
+    def _valor(self, indice):
+        if indice < 2 * self._sub:
+            return indice
+        expoente = indice // self._sub - 1
+        mantissa = indice - expoente * self._sub
+        return ((mantissa + 1) << expoente) - 1
+
+    def registrar(self, valor):
+        indice = self._indice(valor)
+        if indice >= len(self._baldes):
+            self._baldes.extend([0] * (indice + 1 - len(self._baldes)))
+        self._baldes[indice] += 1
+        self.contagem += 1
+        self.total += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, percentual):
+        if not self.contagem:
+            return 0
+        alvo = max(1, math.ceil(self.contagem * percentual / 100))
+        acumulado = 0
+        for indice, quantidade in enumerate(self._baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(self._valor(indice), self.maximo)
+        return self.maximo
+
+    def media(self):
+        return self.total / self.contagem if self.contagem else 0
+
+
+class Instrumentacao:
+    def __init__(self, ativo=False):
+        self.ativo = ativo
+        self.histogramas = {}
+        # Operações de várias threads caem nos mesmos histogramas.
+        self._trava = threading.Lock()
+
+    def ativar(self):
+        self.ativo = True
+
+    def desativar(self):
+        self.ativo = False
+
+    def alternar(self):
+        self.ativo = not self.ativo
+        return self.ativo
+
+    def limpar(self):
+        with self._trava:
+            self.histogramas.clear()
+
+    def registrar(self, operacao, duracao_ns):
+        with self._trava:
+            histograma = self.histogramas.get(operacao)
+            if histograma is None:
+                histograma = self.histogramas[operacao] = Histograma()
+            histograma.registrar(duracao_ns)
+
+    def relatorio(self):
+        with self._trava:
+            return self._resumo()
+
+    def _resumo(self):
+        return {
+            operacao: {
+                "chamadas": histograma.contagem,
+                "p50": histograma.percentil(50),
+                "p99": histograma.percentil(99),
+                "p999": histograma.percentil(99.9),
+                "max": histograma.maximo,
+            }
+            for operacao, histograma in sorted(self.histogramas.items())
+        }
+
+    def medir(self, operacao):
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                if not self.ativo:
+                    return func(*args, **kwargs)
+                inicio = perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.registrar(operacao, perf_counter_ns() - inicio)
+
+            return wrapper
+
+        return decorator
+
+
+instrumentacao = Instrumentacao()
+
+
+def medir_latencia(operacao):
+    return instrumentacao.medir(operacao)
+
+
+def formatar_relatorio(relatorio):
+    if not relatorio:
+        return "Nenhuma métrica registrada."
+
+    linhas = [
+        f"{'Operação':<16}{'Chamadas':>10}{'p50 (µs)':>12}"
+        f"{'p99 (µs)':>12}{'p999 (µs)':>12}"
+    ]
+    for operacao, dados in relatorio.items():
+        linhas.append(
+            f"{operacao:<16}{dados['chamadas']:>10}"
+            f"{dados['p50'] / 1000:>12.1f}{dados['p99'] / 1000:>12.1f}"
+            f"{dados['p999'] / 1000:>12.1f}"
+        )
+    return "\n".join(linhas)
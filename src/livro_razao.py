@@ -0,0 +1,212 @@
+import mmap
+import os
+import struct
+import time
+from array import array
+from datetime import datetime
+
+FORMATO_REGISTRO = struct.Struct("<IqB3xd")
+# Novos tipos entram no fim, para não mudar o código dos já gravados.
+TIPOS = ("Deposito", "Saque", "TransferenciaEnviada", "TransferenciaRecebida")
+CODIGOS = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+CREDITOS = frozenset({"Deposito", "TransferenciaRecebida"})
+ROTULOS_EXTRATO = {
+    "Deposito": "Depósito",
+    "Saque": "Saque",
+    "TransferenciaEnviada": "Transferência enviada",
+    "TransferenciaRecebida": "Transferência recebida",
+}
+
+
+class LivroRazao:
+    """Livro razão em arquivo binário de registros de tamanho fixo.
+
+    Cada registro guarda (conta, momento em µs, tipo, valor). A leitura é feita
+    sobre um ``mmap`` do arquivo através de ``memoryview``, sem copiar dados.
+    Os momentos nunca decrescem, e um índice em memória guarda a posição dos
+    registros de cada conta, para que o extrato não percorra o arquivo todo.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._descartar_registro_incompleto()
+        self._arquivo = open(caminho, "ab")
+        self._mapa = None
+        self._visao = None
+        self._posicoes = {}
+        self._indexados = 0
+        self._ultimo_momento = self._ler_ultimo_momento()
+
+    def __len__(self):
+        return self._arquivo.tell() // FORMATO_REGISTRO.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _descartar_registro_incompleto(self):
+        # Uma gravação interrompida deixa um registro pela metade no fim do
+        # arquivo; sem cortá-lo, todos os registros seguintes ficariam
+        # desalinhados.
+        try:
+            tamanho = os.path.getsize(self.caminho)
+        except FileNotFoundError:
+            return
+        resto = tamanho % FORMATO_REGISTRO.size
+        if resto:
+            os.truncate(self.caminho, tamanho - resto)
+
+    def _ler_ultimo_momento(self):
+        tamanho = self._arquivo.tell()
+        if tamanho == 0:
+            return 0
+        with open(self.caminho, "rb") as arquivo:
+            registro = os.pread(
+                arquivo.fileno(),
+                FORMATO_REGISTRO.size,
+                tamanho - FORMATO_REGISTRO.size,
+            )
+        return FORMATO_REGISTRO.unpack(registro)[1]
+
+    def adicionar(self, numero_conta, tipo, valor, momento=None):
+        if momento is None:
+            # O relógio de parede pode voltar; o livro não.
+            momento = max(time.time_ns() // 1000, self._ultimo_momento)
+        elif momento < self._ultimo_momento:
+            raise ValueError(
+                f"momento {momento} anterior ao último registro "
+                f"({self._ultimo_momento})"
+            )
+        posicao = len(self)
+        self._arquivo.write(
+            FORMATO_REGISTRO.pack(numero_conta, momento, CODIGOS[tipo], valor)
+        )
+        self._ultimo_momento = momento
+        if self._indexados == posicao:
+            self._posicoes_conta(numero_conta).append(posicao)
+            self._indexados += 1
+
+    def _posicoes_conta(self, numero_conta):
+        posicoes = self._posicoes.get(numero_conta)
+        if posicoes is None:
+            posicoes = self._posicoes[numero_conta] = array("Q")
+        return posicoes
+
+    def _atualizar_indice(self, visao):
+        # Só registros gravados antes da abertura do livro ficam de fora do
+        # índice; eles são indexados uma única vez, na primeira consulta.
+        inicio = self._indexados * FORMATO_REGISTRO.size
+        registros = FORMATO_REGISTRO.iter_unpack(visao[inicio:])
+        for posicao, (conta, _, _, _) in enumerate(registros, self._indexados):
+            self._posicoes_conta(conta).append(posicao)
+        self._indexados = len(visao) // FORMATO_REGISTRO.size
+
+    def _registros_mapeados(self):
+        self._arquivo.flush()
+        tamanho = len(self) * FORMATO_REGISTRO.size
+        if tamanho == 0:
+            return memoryview(b"")
+        if self._mapa is None or len(self._mapa) < tamanho:
+            self._liberar_mapa()
+            with open(self.caminho, "rb") as arquivo:
+                self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self._visao = memoryview(self._mapa)
+        return self._visao[:tamanho]
+
+    def _posicao_momento(self, visao, momento):
+        inicio, fim = 0, len(visao) // FORMATO_REGISTRO.size
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            _, momento_meio, _, _ = FORMATO_REGISTRO.unpack_from(
+                visao, meio * FORMATO_REGISTRO.size
+            )
+            if momento_meio < momento:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return inicio
+
+    def _registros_da_conta(self, visao, numero_conta, inicio, fim):
+        posicoes = self._posicoes.get(numero_conta, ())
+
+        def momento_em(indice):
+            return FORMATO_REGISTRO.unpack_from(
+                visao, posicoes[indice] * FORMATO_REGISTRO.size
+            )[1]
+
+        def busca(momento):
+            baixo, alto = 0, len(posicoes)
+            while baixo < alto:
+                meio = (baixo + alto) // 2
+                if momento_em(meio) < momento:
+                    baixo = meio + 1
+                else:
+                    alto = meio
+            return baixo
+
+        primeiro = 0 if inicio is None else busca(inicio)
+        ultimo = len(posicoes) if fim is None else busca(fim)
+        for posicao in posicoes[primeiro:ultimo]:
+            conta, momento, codigo, valor = FORMATO_REGISTRO.unpack_from(
+                visao, posicao * FORMATO_REGISTRO.size
+            )
+            yield conta, momento, TIPOS[codigo], valor
+
+    def registros(self, numero_conta=None, inicio=None, fim=None):
+        # Os registros são anexados em ordem cronológica, então o intervalo
+        # de tempo é localizado por busca binária antes da varredura.
+        visao = self._registros_mapeados()
+        if numero_conta is not None:
+            self._atualizar_indice(visao)
+            yield from self._registros_da_conta(visao, numero_conta, inicio, fim)
+            return
+        if inicio is not None:
+            posicao = self._posicao_momento(visao, inicio)
+            visao = visao[posicao * FORMATO_REGISTRO.size :]
+        if fim is not None:
+            posicao = self._posicao_momento(visao, fim)
+            visao = visao[: posicao * FORMATO_REGISTRO.size]
+
+        for conta, momento, codigo, valor in FORMATO_REGISTRO.iter_unpack(visao):
+            yield conta, momento, TIPOS[codigo], valor
+
+    def posicoes(self, numero_conta, inicio=0):
+        """Posições no arquivo dos registros da conta, a partir do ``inicio``-ésimo.
+
+        O arquivo fica descarregado em disco, para que outro processo possa
+        ler esses registros diretamente.
+        """
+        self._atualizar_indice(self._registros_mapeados())
+        return self._posicoes.get(numero_conta, array("Q"))[inicio:]
+
+    def maior_conta(self):
+        """Maior número de conta já gravado, ou 0 num livro vazio."""
+        self._atualizar_indice(self._registros_mapeados())
+        return max(self._posicoes, default=0)
+
+    def linhas_extrato(self, numero_conta, inicio=None, fim=None):
+        for _, _, tipo, valor in self.registros(numero_conta, inicio, fim):
+            yield f"{ROTULOS_EXTRATO[tipo]}: R$ {valor:.2f}"
+
+    def _liberar_mapa(self):
+        if self._mapa is None:
+            return
+        self._visao.release()
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Uma leitura ainda em andamento usa o mapa; ele é liberado
+            # quando ela terminar.
+            pass
+        self._visao = None
+        self._mapa = None
+
+    def fechar(self):
+        self._liberar_mapa()
+        self._arquivo.close()
+
+
+def formatar_momento(momento):
+    return datetime.fromtimestamp(momento / 1_000_000).strftime("%d-%m-%Y %H:%M:%S")
@@ -0,0 +1,18 @@
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def coleta_pausada():
+    """Desliga o coletor cíclico durante cargas em massa.
+
+    Milhões de objetos novos disparariam o coletor repetidas vezes; ao sair,
+    o estado anterior é restaurado. Também serve como decorador.
+    """
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
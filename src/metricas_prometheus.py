@@ -0,0 +1,127 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Contador:
+    """Contador fragmentado por thread: cada thread escreve só no seu fragmento."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._fragmentos = []
+        self._trava = threading.Lock()
+
+    def _novo_fragmento(self):
+        fragmento = [0]
+        with self._trava:
+            self._fragmentos.append(fragmento)
+        self._local.fragmento = fragmento
+        return fragmento
+
+    def incrementar(self, valor=1):
+        try:
+            fragmento = self._local.fragmento
+        except AttributeError:
+            fragmento = self._novo_fragmento()
+        fragmento[0] += valor
+
+    @property
+    def valor(self):
+        with self._trava:
+            fragmentos = list(self._fragmentos)
+        return sum(fragmento[0] for fragmento in fragmentos)
+
+
+class ContadorRotulado:
+    def __init__(self, rotulo, valores):
+        self.rotulo = rotulo
+        self._contadores = {valor: Contador() for valor in valores}
+
+    def incrementar(self, valor_rotulo, valor=1):
+        self._contadores[valor_rotulo].incrementar(valor)
+
+    def valores(self):
+        return {rotulo: contador.valor for rotulo, contador in self._contadores.items()}
+
+
+class MetricasBanco:
+    TIPOS_TRANSACAO = ("Saque", "Deposito", "Transferencia")
+    MOTIVOS_FALHA = (
+        "saldo_insuficiente",
+        "limite_excedido",
+        "saques_excedidos",
+        "cpf_invalido",
+    )
+
+    def __init__(self):
+        self.limpar()
+
+    def limpar(self):
+        self.transacoes = ContadorRotulado("tipo", self.TIPOS_TRANSACAO)
+        self.falhas = ContadorRotulado("motivo", self.MOTIVOS_FALHA)
+        self.total_depositos = Contador()
+
+    def registrar_transacao(self, tipo, valor):
+        self.transacoes.incrementar(tipo)
+        if tipo == "Deposito":
+            self.total_depositos.incrementar(valor)
+
+    def registrar_falha(self, motivo):
+        self.falhas.incrementar(motivo)
+
+    def exportar(self, sistema=None):
+        linhas = [
+            "# HELP banco_transacoes_total Transações realizadas com sucesso.",
+            "# TYPE banco_transacoes_total counter",
+        ]
+        for tipo, valor in self.transacoes.valores().items():
+            linhas.append(f'banco_transacoes_total{{tipo="{tipo}"}} {valor}')
+
+        linhas += [
+            "# HELP banco_falhas_total Operações recusadas por motivo.",
+            "# TYPE banco_falhas_total counter",
+        ]
+        for motivo, valor in self.falhas.valores().items():
+            linhas.append(f'banco_falhas_total{{motivo="{motivo}"}} {valor}')
+
+        linhas += [
+            "# HELP banco_depositos_valor_total Valor total depositado.",
+            "# TYPE banco_depositos_valor_total counter",
+            f"banco_depositos_valor_total {float(self.total_depositos.valor)}",
+        ]
+
+        if sistema is not None:
+            linhas += [
+                "# HELP banco_contas Contas cadastradas.",
+                "# TYPE banco_contas gauge",
+                f"banco_contas {len(sistema.contas)}",
+                "# HELP banco_clientes Clientes cadastrados.",
+                "# TYPE banco_clientes gauge",
+                f"banco_clientes {len(sistema.clientes)}",
+            ]
+
+        return "\n".join(linhas) + "\n"
+
+
+metricas = MetricasBanco()
+
+
+def iniciar_servidor_metricas(sistema, porta=8000, endereco="127.0.0.1"):
+    class MetricasHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            corpo = metricas.exportar(sistema).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    servidor = ThreadingHTTPServer((endereco, porta), MetricasHandler)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    return servidor
@@ -1,15 +1,32 @@
+import copy
+import os
 import re
+import threading
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from datetime import datetime
 
+from src.agencias import ParticoesAgencia
+from src.busca_nomes import IndiceNomes
 from src.constant import Constants
+from src.cache_extrato import CacheExtrato
+from src.coortes import formatar_nascimento, ordinal_nascimento
+from src.enderecos import ContadoresRegionais, interpretar_endereco
+from src.idempotencia import cache_idempotencia
+from src.indice_saldos import IndiceSaldos
+from src.instrumentacao import (formatar_relatorio, instrumentacao,
+                                medir_latencia)
+from src.livro_razao import ROTULOS_EXTRATO, formatar_momento
+from src.metricas_prometheus import iniciar_servidor_metricas, metricas
+from src.saida import emitir
 
 
 def validar_cpf(func):
     def wrapper(*args, **kwargs):
         cpf = kwargs.get("cpf") or (args[1] if len(args) > 1 else None)
         if cpf and not re.match(Constants.CPF_PATTERN, cpf):
-            print(Constants.FAIL_CPF_MESSAGE)
+            metricas.registrar_falha("cpf_invalido")
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
             return None
         return func(*args, **kwargs)
 
@@ -19,13 +36,33 @@ def validar_cpf(func):
 def verificar_contas(func):
     def wrapper(self, *args, **kwargs):
         if not self.contas:
-            print(Constants.FAIL_OPERATION_MESSAGE)
+            emitir(Constants.FAIL_OPERATION_MESSAGE, "operacao_falhou")
             return None
         return func(self, *args, **kwargs)
 
     return wrapper
 
 
+def transacao_duplicada(chave_idempotencia):
+    """Reserva a chave; verdadeiro se ela já foi usada ou está em andamento."""
+    if chave_idempotencia is None:
+        return False
+    if not cache_idempotencia.reservar(chave_idempotencia):
+        emitir(Constants.FAIL_DUPLICATED_TRANSACTION_MESSAGE, "transacao_duplicada")
+        return True
+    return False
+
+
+def concluir_chave(chave_idempotencia, sucesso):
+    """Confirma a chave reservada, ou a libera para nova tentativa."""
+    if chave_idempotencia is None:
+        return
+    if sucesso:
+        cache_idempotencia.confirmar(chave_idempotencia)
+    else:
+        cache_idempotencia.liberar(chave_idempotencia)
+
+
 class Cliente:
     def __init__(self, endereco):
         self.endereco = endereco
@@ -39,25 +76,56 @@ class Cliente:
 
 
 class PessoaFisica(Cliente):
-    def __init__(self, nome, data_nascimento, cpf, endereco):
+    def __init__(self, nome, data_nascimento, cpf, endereco, local=None):
         super().__init__(endereco)
         self.nome = nome
-        self.data_nascimento = data_nascimento
         self.cpf = cpf
+        # Quem já tem o endereço interpretado (ex.: o snapshot) o repassa.
+        self.local = local if local is not None else interpretar_endereco(endereco)
+        # A data é guardada como ordinal do dia; o texto original só é
+        # mantido quando não pôde ser interpretado.
+        self._data_bruta = None
+        if isinstance(data_nascimento, int):
+            self.nascimento = data_nascimento
+        else:
+            try:
+                self.nascimento = ordinal_nascimento(data_nascimento)
+            except ValueError:
+                self.nascimento = None
+                self._data_bruta = data_nascimento
+
+    @property
+    def data_nascimento(self):
+        if self.nascimento is None:
+            return self._data_bruta
+        return formatar_nascimento(self.nascimento)
+
+
+QUANTIDADE_TRAVAS = 1024
+# Travas compartilhadas por faixas de contas. São reentrantes para que uma
+# transferência, que já detém as travas das duas contas, possa chamar
+# ``debitar``/``creditar``, que também as adquirem.
+_travas = [threading.RLock() for _ in range(QUANTIDADE_TRAVAS)]
 
 
 class Conta:
-    def __init__(self, numero, cliente):
+    def __init__(self, numero, cliente, historico=None, agencia=None):
         self._saldo = 0
         self._numero = numero
-        self._agencia = Constants.BRANCH
+        self._agencia = agencia if agencia is not None else Constants.BRANCH
+        self._trava = _travas[hash((self._agencia, numero)) % QUANTIDADE_TRAVAS]
         self._cliente = cliente
-        self._historico = Historico()
-        self._extrato = ""
+        self._historico = historico if historico is not None else Historico()
+        self._historico.conta = self
+        # Contas com livro razão derivam o extrato dele, sem duplicá-lo aqui.
+        self._extrato = None if isinstance(self._historico, HistoricoLivroRazao) else ""
+        # Tupla trocada a cada alteração: um observador pode se remover
+        # durante a notificação sem afetar a iteração em curso.
+        self._observadores = ()
 
     @classmethod
-    def nova_conta(cls, cliente, numero):
-        return cls(numero, cliente)
+    def nova_conta(cls, cliente, numero, **kwargs):
+        return cls(numero, cliente, **kwargs)
 
     @property
     def saldo(self):
@@ -75,46 +143,93 @@ class Conta:
     def cliente(self):
         return self._cliente
 
+    @property
+    def trava(self):
+        return self._trava
+
     @property
     def historico(self):
         return self._historico
 
     @property
     def extrato(self):
+        if self._extrato is None:
+            return "".join(f"{linha}\n" for linha in self._historico.linhas_extrato())
         return self._extrato
 
     @extrato.setter
     def extrato(self, value):
-        self._extrato = value
+        if self._extrato is not None:
+            self._extrato = value
 
-    def sacar(self, valor):
-        saldo = self.saldo
-        excedeu_saldo = valor > saldo
+    def _anotar_extrato(self, linha):
+        if self._extrato is not None:
+            self._extrato += linha
 
-        if excedeu_saldo:
-            print("Operação falhou! Saldo insuficiente.")
-            return False
-        elif valor > 0:
-            self._saldo -= valor
-            self._extrato += f"Saque: R$ {valor:.2f}\n"
-            return True
-        else:
-            print(Constants.FAIL_VALUE_MESSAGE)
-            return False
+    def adicionar_observador(self, observador):
+        self._observadores += (observador,)
+
+    def remover_observador(self, observador):
+        observadores = list(self._observadores)
+        observadores.remove(observador)
+        self._observadores = tuple(observadores)
+
+    def _notificar(self, saldo_anterior):
+        for observador in self._observadores:
+            observador(self, saldo_anterior)
+
+    @medir_latencia("sacar")
+    def sacar(self, valor):
+        return self.debitar(valor, ROTULOS_EXTRATO["Saque"])
 
+    @medir_latencia("depositar")
     def depositar(self, valor):
-        if valor > 0:
-            self._saldo += valor
-            self._extrato += f"Depósito: R$ {valor:.2f}\n"
-            return True
-        else:
-            print(Constants.FAIL_VALUE_MESSAGE)
-            return False
+        return self.creditar(valor, ROTULOS_EXTRATO["Deposito"])
+
+    def debitar(self, valor, rotulo):
+        """Retira ``valor`` do saldo, anotado no extrato como ``rotulo``.
+
+        Só verifica o saldo; regras de saque ficam em ``sacar``.
+        """
+        with self._trava:
+            saldo = self._saldo
+            if valor > saldo:
+                metricas.registrar_falha("saldo_insuficiente")
+                emitir("Operação falhou! Saldo insuficiente.", "saldo_insuficiente")
+                return False
+            elif valor > 0:
+                self._saldo -= valor
+                self._anotar_extrato(f"{rotulo}: R$ {valor:.2f}\n")
+                self._notificar(saldo)
+                return True
+            else:
+                emitir(Constants.FAIL_VALUE_MESSAGE, "valor_invalido")
+                return False
+
+    def creditar(self, valor, rotulo):
+        with self._trava:
+            if valor > 0:
+                saldo = self._saldo
+                self._saldo += valor
+                self._anotar_extrato(f"{rotulo}: R$ {valor:.2f}\n")
+                self._notificar(saldo)
+                return True
+            else:
+                emitir(Constants.FAIL_VALUE_MESSAGE, "valor_invalido")
+                return False
 
 
 class ContaCorrente(Conta):
-    def __init__(self, numero, cliente, limite=500, limite_saques=3):
-        super().__init__(numero, cliente)
+    def __init__(
+        self,
+        numero,
+        cliente,
+        limite=500,
+        limite_saques=3,
+        historico=None,
+        agencia=None,
+    ):
+        super().__init__(numero, cliente, historico, agencia)
         self._limite = limite
         self._limite_saques = limite_saques
         self._numero_saques = 0
@@ -125,7 +240,10 @@ class ContaCorrente(Conta):
 
     @numero_saques.setter
     def numero_saques(self, value):
-        self._numero_saques = value
+        # Só ajustes externos (ex.: zerar o contador do dia) notificam por aqui.
+        if value != self._numero_saques:
+            self._numero_saques = value
+            self._notificar(self._saldo)
 
     @property
     def limite(self):
@@ -135,42 +253,147 @@ class ContaCorrente(Conta):
     def limite_saques(self):
         return self._limite_saques
 
-    def sacar(self, valor):
-        excedeu_limite = valor > self._limite
-        excedeu_saques = self._numero_saques >= self._limite_saques
+    def _excede_limite(self, valor):
+        if valor > self._limite:
+            metricas.registrar_falha("limite_excedido")
+            emitir(
+                "Operação falhou! O valor do saque excede o limite.",
+                "limite_excedido",
+            )
+            return True
+        return False
 
-        if excedeu_limite:
-            print("Operação falhou! O valor do saque excede o limite.")
+    def debitar(self, valor, rotulo):
+        # Transferências respeitam o limite por operação, mas não contam como
+        # saque no limite diário.
+        if self._excede_limite(valor):
             return False
-        elif excedeu_saques:
-            print("Operação falhou! Número máximo de saques diários excedido.")
-            return False
-        else:
-            sucesso = super().sacar(valor)
-            if sucesso:
+        return super().debitar(valor, rotulo)
+
+    @medir_latencia("sacar")
+    def sacar(self, valor):
+        with self._trava:
+            if self._excede_limite(valor):
+                return False
+            elif self._numero_saques >= self._limite_saques:
+                metricas.registrar_falha("saques_excedidos")
+                emitir(
+                    "Operação falhou! Número máximo de saques diários excedido.",
+                    "saques_excedidos",
+                )
+                return False
+            elif valor > self._saldo or valor <= 0:
+                # Conta.debitar recusa e emite a mensagem, sem alterar a conta.
+                return Conta.debitar(self, valor, ROTULOS_EXTRATO["Saque"])
+            else:
+                # Sob a trava o débito não pode mais falhar: o contador é
+                # atualizado antes para que a única notificação já o inclua.
                 self._numero_saques += 1
-            return sucesso
+                return Conta.debitar(self, valor, ROTULOS_EXTRATO["Saque"])
+
+
+class ContaPoupanca(Conta):
+    def __init__(
+        self,
+        numero,
+        cliente,
+        taxa_diaria=Constants.SAVINGS_DAILY_RATE,
+        historico=None,
+        agencia=None,
+    ):
+        super().__init__(numero, cliente, historico, agencia)
+        self._taxa_diaria = taxa_diaria
+
+    @property
+    def taxa_diaria(self):
+        return self._taxa_diaria
 
 
 class Historico:
     def __init__(self):
         self._transacoes = []
+        self.conta = None
+        # Assinantes do sistema dono da conta (``SistemaBancario.vincular_contas``).
+        self.ouvintes = ()
+        # Mantidos a cada lançamento, para relatórios que não precisam
+        # percorrer o histórico (como ``coortes_etarias``).
+        self.quantidade_transacoes = 0
+        self.volume = 0.0
 
     @property
     def transacoes(self):
         return self._transacoes
 
     def adicionar_transacao(self, transacao):
+        self.adicionar_registro(transacao.tipo, transacao.valor)
+
+    def adicionar_registro(self, tipo, valor):
+        self._gravar(tipo, valor)
+        with self.conta.trava if self.conta is not None else nullcontext():
+            self.quantidade_transacoes += 1
+            self.volume += valor
+        for ouvinte in self.ouvintes:
+            ouvinte(self.conta, tipo, valor)
+
+    def restaurar(self, transacoes, quantidade=None, volume=None):
+        """Acrescenta lançamentos já efetivados, sem avisar os ouvintes.
+
+        Quem já guardou os totais (o snapshot) os informa; senão são somados.
+        """
+        transacoes = list(transacoes)
+        self._transacoes.extend(transacoes)
+        if quantidade is None:
+            quantidade = len(transacoes)
+            volume = sum(transacao["valor"] for transacao in transacoes)
+        self.quantidade_transacoes += quantidade
+        self.volume += volume
+
+    def _gravar(self, tipo, valor):
         self._transacoes.append(
             {
-                "tipo": transacao.__class__.__name__,
-                "valor": transacao.valor,
+                "tipo": tipo,
+                "valor": valor,
                 "data": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
             }
         )
 
 
+class HistoricoLivroRazao(Historico):
+    def __init__(self, livro_razao, numero_conta):
+        super().__init__()
+        self._livro_razao = livro_razao
+        self._numero_conta = numero_conta
+
+    @property
+    def transacoes(self):
+        return [
+            {"tipo": tipo, "valor": valor, "data": formatar_momento(momento)}
+            for _, momento, tipo, valor in self._livro_razao.registros(
+                self._numero_conta
+            )
+        ]
+
+    @property
+    def livro_razao(self):
+        return self._livro_razao
+
+    @property
+    def conta_livro(self):
+        return self._numero_conta
+
+    def _gravar(self, tipo, valor):
+        self._livro_razao.adicionar(self._numero_conta, tipo, valor)
+
+    def linhas_extrato(self, inicio=None, fim=None):
+        return self._livro_razao.linhas_extrato(self._numero_conta, inicio, fim)
+
+
 class Transacao(ABC):
+    @property
+    @abstractmethod
+    def tipo(self):
+        """Tipo gravado no histórico, um dos ``livro_razao.TIPOS``."""
+
     @property
     @abstractmethod
     def valor(self):
@@ -180,40 +403,121 @@ class Transacao(ABC):
     def registrar(self, conta):
         pass
 
+    def com_chave(self, chave_idempotencia):
+        """Cópia da transação com outra chave de idempotência."""
+        copia = copy.copy(self)
+        copia._chave_idempotencia = chave_idempotencia
+        return copia
+
 
 class Saque(Transacao):
-    def __init__(self, valor):
+    tipo = "Saque"
+
+    def __init__(self, valor, chave_idempotencia=None):
         self._valor = valor
+        self._chave_idempotencia = chave_idempotencia
 
     @property
     def valor(self):
         return self._valor
 
+    @property
+    def chave_idempotencia(self):
+        return self._chave_idempotencia
+
+    @medir_latencia("registrar_saque")
     def registrar(self, conta):
-        sucesso_transacao = conta.sacar(self.valor)
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+        if transacao_duplicada(self.chave_idempotencia):
+            return False
+        sucesso_transacao = False
+        try:
+            sucesso_transacao = conta.sacar(self.valor)
+            if sucesso_transacao:
+                conta.historico.adicionar_transacao(self)
+                metricas.registrar_transacao(self.tipo, self.valor)
+        finally:
+            concluir_chave(self.chave_idempotencia, sucesso_transacao)
+        return sucesso_transacao
 
 
 class Deposito(Transacao):
-    def __init__(self, valor):
+    tipo = "Deposito"
+
+    def __init__(self, valor, chave_idempotencia=None):
         self._valor = valor
+        self._chave_idempotencia = chave_idempotencia
 
     @property
     def valor(self):
         return self._valor
 
+    @property
+    def chave_idempotencia(self):
+        return self._chave_idempotencia
+
+    @medir_latencia("registrar_deposito")
     def registrar(self, conta):
-        sucesso_transacao = conta.depositar(self.valor)
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+        if transacao_duplicada(self.chave_idempotencia):
+            return False
+        sucesso_transacao = False
+        try:
+            sucesso_transacao = conta.depositar(self.valor)
+            if sucesso_transacao:
+                conta.historico.adicionar_transacao(self)
+                metricas.registrar_transacao(self.tipo, self.valor)
+        finally:
+            concluir_chave(self.chave_idempotencia, sucesso_transacao)
+        return sucesso_transacao
 
 
 class SistemaBancario:
-    def __init__(self):
+    def __init__(
+        self,
+        livro_razao=None,
+        alocador=None,
+        agencia=Constants.BRANCH,
+        eventos=None,
+        entrada=None,
+    ):
+        self.livro_razao = livro_razao
+        # Lê as respostas do operador; sem ela, ``input``. Quem conduz o
+        # sistema por código (carga sintética) injeta a sua.
+        self.entrada = entrada
+        self.alocador = alocador
+        self.eventos = eventos
+        self.contadores_regionais = ContadoresRegionais()
+        # Recebem registrar_cliente/registrar_conta a cada cadastro.
+        self.ouvintes_cadastro = [self.contadores_regionais]
+        # Recebem (conta, tipo, valor) a cada lançamento nas contas do sistema.
+        self.assinantes_lancamentos = []
+        self.agencia = agencia
         self.clientes = []
         self.contas = []
-        self.numero_conta = 1
+        if eventos is not None:
+            eventos.anexar(self)
+        self.agencias = ParticoesAgencia()
+        self._numeros_conta = {}
+        # O arquivo do livro sobrevive ao processo: a sequência continua do
+        # maior número já gravado, para que uma conta nova nunca herde os
+        # lançamentos de outra.
+        self._contas_livro = (
+            livro_razao.maior_conta() if livro_razao is not None else 0
+        )
+        self.indice_saldos = IndiceSaldos()
+        self.indice_nomes = IndiceNomes()
+        self.cache_extrato = CacheExtrato()
+
+    def _ler(self, mensagem):
+        return (self.entrada or input)(mensagem)
+
+    @property
+    def numero_conta(self):
+        """Próximo número de conta da agência corrente."""
+        return self._numeros_conta.get(self.agencia, 1)
+
+    @numero_conta.setter
+    def numero_conta(self, valor):
+        self._numeros_conta[self.agencia] = valor
 
     def menu(self):
         print("\n=== Menu ===")
@@ -222,9 +526,16 @@ class SistemaBancario:
         print("[e] Extrato")
         print("[q] Sair")
         print("[n] Nova Conta")
+        print("[np] Nova Conta Poupança")
         print("[lc] Listar Contas")
         print("[nu] Novo Usuário")
-        return input("Escolha uma opção: ").lower()
+        print("[bn] Buscar Cliente por Nome")
+        print("[ag] Trocar Agência")
+        print("[ra] Relatório da Agência")
+        print("[rr] Relatório Regional")
+        print("[m] Métricas")
+        print("[am] Ativar/Desativar Métricas")
+        return self._ler("Escolha uma opção: ").lower()
 
     @validar_cpf
     def filtrar_cliente(self, cpf):
@@ -233,51 +544,92 @@ class SistemaBancario:
         ]
         return clientes_filtrados[0] if clientes_filtrados else None
 
-    def filtrar_conta(self, cpf, numero_conta):
+    def vincular_contas(self, contas=None):
+        """Liga o Historico das contas aos assinantes de lançamentos do sistema.
+
+        Chamado ao abrir uma conta; quem carrega contas direto em ``contas``
+        chama sem argumentos ao final.
+        """
+        for conta in self.contas if contas is None else contas:
+            conta.historico.ouvintes = self.assinantes_lancamentos
+
+    def assinar_lancamentos(self, assinante):
+        if assinante not in self.assinantes_lancamentos:
+            self.assinantes_lancamentos.append(assinante)
+        self.vincular_contas()
+
+    def cancelar_lancamentos(self, assinante):
+        if assinante in self.assinantes_lancamentos:
+            self.assinantes_lancamentos.remove(assinante)
+
+    def ajustar_numeracao(self):
+        """Faz cada agência continuar depois do maior número já carregado."""
+        self.agencias.sincronizar(self.contas)
+        for particao in self.agencias:
+            maior = max((conta.numero for conta in particao.contas), default=0)
+            atual = self._numeros_conta.get(particao.codigo, 1)
+            self._numeros_conta[particao.codigo] = max(atual, maior + 1)
+            if self.alocador is not None:
+                self.alocador.avancar(particao.codigo, maior + 1)
         for conta in self.contas:
-            if str(conta.numero) == numero_conta and conta.cliente.cpf == cpf:
-                return conta
+            if isinstance(conta.historico, HistoricoLivroRazao):
+                self._contas_livro = max(
+                    self._contas_livro, conta.historico.conta_livro
+                )
+
+    def particao_agencia(self, agencia=None):
+        self.agencias.sincronizar(self.contas)
+        return self.agencias.particao(agencia or self.agencia)
+
+    def filtrar_conta(self, cpf, numero_conta):
+        conta = self.particao_agencia().buscar(numero_conta)
+        if conta is not None and conta.cliente.cpf == cpf:
+            return conta
         return None
 
     @verificar_contas
     def depositar(self, cpf=None, numero_conta=None):
         if cpf is None:
-            cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+            cpf = self._ler(Constants.INFO_CPF_MESSAGE).strip()
 
         if not re.match(Constants.CPF_PATTERN, cpf):
-            print(Constants.FAIL_CPF_MESSAGE)
+            metricas.registrar_falha("cpf_invalido")
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
             return
 
         if numero_conta is None:
-            numero_conta = input(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
+            numero_conta = self._ler(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
 
-        valor = float(input("Informe o valor do depósito: "))
+        valor = float(self._ler("Informe o valor do depósito: "))
         if valor <= 0:
-            print("Operação falhou! O valor informado é inválido.")
+            emitir(
+                "Operação falhou! O valor informado é inválido.", "valor_invalido"
+            )
             return
 
         conta = self.filtrar_conta(cpf, numero_conta)
         if not conta:
-            print(Constants.FAIL_OPERATION_MESSAGE)
+            emitir(Constants.FAIL_OPERATION_MESSAGE, "operacao_falhou")
             return
 
         transacao = Deposito(valor)
         conta.cliente.realizar_transacao(conta, transacao)
-        print("Depósito realizado com sucesso!")
+        emitir("Depósito realizado com sucesso!")
 
     @verificar_contas
     def sacar(self):
-        cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+        cpf = self._ler(Constants.INFO_CPF_MESSAGE).strip()
         if not re.match(Constants.CPF_PATTERN, cpf):
-            print(Constants.FAIL_CPF_MESSAGE)
+            metricas.registrar_falha("cpf_invalido")
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
             return
 
-        numero_conta = input(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
-        valor = float(input("Informe o valor do saque: "))
+        numero_conta = self._ler(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
+        valor = float(self._ler("Informe o valor do saque: "))
 
         conta = self.filtrar_conta(cpf, numero_conta)
         if not conta:
-            print(Constants.FAIL_OPERATION_MESSAGE)
+            emitir(Constants.FAIL_OPERATION_MESSAGE, "operacao_falhou")
             return
 
         transacao = Saque(valor)
@@ -285,93 +637,160 @@ class SistemaBancario:
 
     @verificar_contas
     def exibir_extrato(self):
-        cpf = input(Constants.INFO_CPF_MESSAGE).strip()
-        numero_conta = input(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
+        cpf = self._ler(Constants.INFO_CPF_MESSAGE).strip()
+        numero_conta = self._ler(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
 
         conta = self.filtrar_conta(cpf, numero_conta)
         if not conta:
-            print(Constants.FAIL_OPERATION_MESSAGE)
+            emitir(Constants.FAIL_OPERATION_MESSAGE, "operacao_falhou")
             return
 
-        print("\n=== Extrato ===")
-        print(f"CPF: {cpf} | Conta: {numero_conta}")
+        emitir(self.obter_extrato(conta))
+
+    @medir_latencia("exibir_extrato")
+    def obter_extrato(self, conta):
+        return self.cache_extrato.obter(conta, self.renderizar_extrato)
 
-        if not conta.extrato.strip():
-            print("Não foram realizadas movimentações.")
+    def renderizar_extrato(self, conta):
+        if isinstance(conta.historico, HistoricoLivroRazao):
+            extrato = "\n".join(conta.historico.linhas_extrato())
         else:
-            print(conta.extrato.strip())
+            extrato = conta.extrato.strip()
 
-        print(f"Saldo atual: R$ {conta.saldo:.2f}")
-        print("================")
+        if not extrato:
+            extrato = "Não foram realizadas movimentações."
+
+        return (
+            "\n=== Extrato ===\n"
+            f"CPF: {conta.cliente.cpf} | Conta: {conta.numero}\n"
+            f"{extrato}\n"
+            f"Saldo atual: R$ {conta.saldo:.2f}\n"
+            "================"
+        )
 
     def criar_usuario(self):
-        cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+        cpf = self._ler(Constants.INFO_CPF_MESSAGE).strip()
         if not re.match(Constants.CPF_PATTERN, cpf):
-            print(Constants.FAIL_CPF_MESSAGE)
+            metricas.registrar_falha("cpf_invalido")
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
             return
 
         cliente = self.filtrar_cliente(cpf)
         if cliente:
-            print(Constants.FAIL_REGISTERED_CPF_MESSAGE)
+            emitir(Constants.FAIL_REGISTERED_CPF_MESSAGE, "cpf_cadastrado")
             return
 
-        nome = input("Informe o nome completo: ").strip()
-        data_nascimento = input("Informe a data de nascimento (DD/MM/AAAA): ").strip()
+        nome = self._ler("Informe o nome completo: ").strip()
+        data_nascimento = self._ler(
+            "Informe a data de nascimento (DD/MM/AAAA): "
+        ).strip()
 
         try:
-            datetime.strptime(data_nascimento, "%d/%m/%Y")
+            nascimento = ordinal_nascimento(data_nascimento)
         except ValueError:
-            print("Data de nascimento inválida! Utilize o formato DD/MM/AAAA.")
+            emitir(
+                "Data de nascimento inválida! Utilize o formato DD/MM/AAAA.",
+                "data_invalida",
+            )
             return
 
-        endereco = input(
+        endereco = self._ler(
             "Informe o endereço (logradouro, número - bairro - cidade/sigla estado): "
         ).strip()
 
-        cliente = PessoaFisica(nome, data_nascimento, cpf, endereco)
+        self.cadastrar_cliente(nome, nascimento, cpf, endereco)
+        emitir("Usuário criado com sucesso!")
+
+    @medir_latencia("criar_usuario")
+    def cadastrar_cliente(self, nome, nascimento, cpf, endereco):
+        cliente = PessoaFisica(nome, nascimento, cpf, endereco)
         self.clientes.append(cliente)
-        print("Usuário criado com sucesso!")
+        self.indice_nomes.sincronizar(self.clientes)
+        for ouvinte in self.ouvintes_cadastro:
+            ouvinte.registrar_cliente(cliente)
+        return cliente
+
+    def proximo_numero_conta(self):
+        if self.alocador is not None:
+            return self.alocador.proximo(self.agencia)
+        numero = self.numero_conta
+        self.numero_conta += 1
+        return numero
 
     def criar_conta(self):
-        cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+        self._abrir_conta(ContaCorrente)
+
+    def criar_conta_poupanca(self):
+        self._abrir_conta(ContaPoupanca)
+
+    def _abrir_conta(self, classe):
+        cpf = self._ler(Constants.INFO_CPF_MESSAGE).strip()
 
         if not re.match(Constants.CPF_PATTERN, cpf):
-            print(Constants.FAIL_CPF_MESSAGE)
+            metricas.registrar_falha("cpf_invalido")
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
             return
 
         cliente = self.filtrar_cliente(cpf)
         if not cliente:
-            print("Usuário não encontrado, fluxo de criação de conta encerrado.")
+            emitir(
+                "Usuário não encontrado, fluxo de criação de conta encerrado.",
+                "usuario_nao_encontrado",
+            )
             return
 
-        conta = ContaCorrente.nova_conta(cliente=cliente, numero=self.numero_conta)
-        self.contas.append(conta)
+        self.abrir_conta(classe, cliente)
+        emitir("Conta criada com sucesso!")
+
+    @medir_latencia("criar_conta")
+    def abrir_conta(self, classe, cliente):
+        numero = self.proximo_numero_conta()
+        historico = None
+        if self.livro_razao is not None:
+            # Os números se repetem entre agências, então o livro razão
+            # identifica cada conta por um sequencial próprio.
+            historico = HistoricoLivroRazao(self.livro_razao, self._contas_livro + 1)
+
+        conta = classe.nova_conta(
+            cliente=cliente, numero=numero, historico=historico, agencia=self.agencia
+        )
+        # A partição recusa um número repetido antes de a conta entrar em
+        # ``contas``; nada do sistema muda numa recusa.
+        self.agencias.anexar(self.contas, conta)
+        if historico is not None:
+            self._contas_livro += 1
+        self.vincular_contas((conta,))
         cliente.adicionar_conta(conta)
-        self.numero_conta += 1
-        print("Conta criada com sucesso!")
+        for ouvinte in self.ouvintes_cadastro:
+            ouvinte.registrar_conta(conta)
+        self.indice_saldos.adicionar(conta)
+        return conta
 
     def listar_contas(self):
-        cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+        cpf = self._ler(Constants.INFO_CPF_MESSAGE).strip()
+        if cpf and not re.match(Constants.CPF_PATTERN, cpf):
+            metricas.registrar_falha("cpf_invalido")
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
+            return
+        self._listar_contas(cpf)
 
-        contas_filtradas = self.contas
+    @medir_latencia("listar_contas")
+    def _listar_contas(self, cpf):
+        particao = self.particao_agencia()
+        contas_filtradas = particao.contas
         if cpf:
-            if not re.match(Constants.CPF_PATTERN, cpf):
-                print(Constants.FAIL_CPF_MESSAGE)
-                return
-            contas_filtradas = [
-                conta for conta in self.contas if conta.cliente.cpf == cpf
-            ]
+            contas_filtradas = particao.contas_do_cliente(cpf)
 
         if not contas_filtradas:
-            print("Nenhuma conta encontrada.")
+            emitir("Nenhuma conta encontrada.")
             return
 
-        print()
+        emitir()
         for conta in contas_filtradas:
             usuario = conta.cliente
             saldo = conta.saldo
-            print("==============================")
-            print(
+            emitir("==============================")
+            emitir(
                 f"""\
 Agência: {conta.agencia}
 Número da Conta: {conta.numero}
@@ -380,6 +799,64 @@ CPF: {usuario.cpf}
 Saldo: R$ {saldo:.2f}"""
             )
 
+    def buscar_clientes(self, consulta=None):
+        if consulta is None:
+            consulta = self._ler("Informe o nome ou parte dele: ").strip()
+        self.indice_nomes.sincronizar(self.clientes)
+        clientes = self.indice_nomes.buscar(consulta)
+        if not clientes:
+            emitir("Nenhum cliente encontrado.")
+            return clientes
+        for cliente in clientes:
+            emitir(f"{cliente.nome} | CPF: {cliente.cpf}")
+        return clientes
+
+    def trocar_agencia(self):
+        agencia = self._ler(Constants.INFO_BRANCH_MESSAGE).strip()
+        if not re.match(Constants.BRANCH_PATTERN, agencia):
+            emitir(Constants.FAIL_BRANCH_MESSAGE, "agencia_invalida")
+            return
+        self.agencia = agencia
+        emitir(f"Agência {agencia} selecionada.")
+
+    def relatorio_agencia(self, agencia=None):
+        relatorio = self.particao_agencia(agencia).relatorio()
+        emitir(
+            f"""\
+\n=== Agência {relatorio['agencia']} ===
+Contas: {relatorio['contas']}
+Clientes: {relatorio['clientes']}
+Saldo total: R$ {relatorio['saldo_total']:.2f}"""
+        )
+        return relatorio
+
+    def relatorio_regional(self, sigla=None):
+        if sigla is None:
+            sigla = self._ler("Informe a sigla do estado (vazio para todos): ").strip()
+        contadores = self.contadores_regionais
+        regioes = contadores.cidades(sigla) if sigla else contadores.estados()
+        if not regioes:
+            emitir("Nenhuma região encontrada.")
+            return regioes
+        emitir("\n=== Relatório Regional ===")
+        for regiao in regioes:
+            emitir(
+                f"{regiao.nome}: {regiao.clientes} clientes, {regiao.contas} contas, "
+                f"saldo total R$ {regiao.saldo_total:.2f}"
+            )
+        return regioes
+
+    def exibir_metricas(self):
+        emitir("\n=== Métricas ===")
+        emitir(formatar_relatorio(instrumentacao.relatorio()))
+        emitir("================")
+
+    def alternar_metricas(self):
+        if instrumentacao.alternar():
+            emitir("Métricas ativadas.")
+        else:
+            emitir("Métricas desativadas.")
+
     def executar(self):
         while True:
             opcao = self.menu()
@@ -392,20 +869,37 @@ Saldo: R$ {saldo:.2f}"""
                 self.exibir_extrato()
             elif opcao == "n":
                 self.criar_conta()
+            elif opcao == "np":
+                self.criar_conta_poupanca()
             elif opcao == "lc":
                 self.listar_contas()
             elif opcao == "nu":
                 self.criar_usuario()
+            elif opcao == "bn":
+                self.buscar_clientes()
+            elif opcao == "ag":
+                self.trocar_agencia()
+            elif opcao == "ra":
+                self.relatorio_agencia()
+            elif opcao == "rr":
+                self.relatorio_regional()
+            elif opcao == "m":
+                self.exibir_metricas()
+            elif opcao == "am":
+                self.alternar_metricas()
             elif opcao == "q":
                 break
             else:
-                print(
+                emitir(
                     "Operação inválida, por favor selecione novamente a operação desejada."
                 )
 
 
 def main():
     sistema = SistemaBancario()
+    porta_metricas = os.environ.get(Constants.METRICS_PORT_ENV)
+    if porta_metricas:
+        iniciar_servidor_metricas(sistema, int(porta_metricas))
     sistema.executar()
 
 
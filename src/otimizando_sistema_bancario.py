@@ -1,10 +1,22 @@
 import re
-from datetime import datetime
 
+from src.agencias import ContasPorAgencia
+from src.alocador_contas import AlocadorContas
+from src.busca_nomes import IndiceNomes
 from src.constant import Constants
+from src.coortes import ordinal_nascimento, totais_extrato
+from src.enderecos import interpretar_endereco
+from src.saida import emitir
+from src.tabela_contas import TabelaContas
 
 
-def menu():
+def _ler(entrada, mensagem):
+    # ``entrada`` é a função injetada por quem conduz o sistema (carga
+    # sintética, testes); sem ela, lê do terminal.
+    return (entrada or input)(mensagem)
+
+
+def menu(entrada=None):
     print("\n=== Menu ===")
     print("[d] Depositar")
     print("[s] Sacar")
@@ -13,11 +25,16 @@ def menu():
     print("[n] Nova Conta")
     print("[lc] Listar Contas")
     print("[nu] Novo Usuário")
-    return input("Escolha uma opção: ").lower()
+    print("[bn] Buscar Usuário por Nome")
+    print("[ag] Trocar Agência")
+    print("[ra] Relatório da Agência")
+    return _ler(entrada, "Escolha uma opção: ").lower()
 
 
 def encontrar_conta(contas, cpf, numero_conta):
     """Função auxiliar para encontrar uma conta específica"""
+    if isinstance(contas, TabelaContas):
+        return contas.encontrar(cpf, numero_conta)
     for conta in contas:
         if (
             str(conta.get("numero_conta")) == numero_conta
@@ -27,66 +44,80 @@ def encontrar_conta(contas, cpf, numero_conta):
     return None
 
 
-def depositar(contas, cpf=None, numero_conta=None):
+def _somar_movimento(conta, valor):
+    """Mantém quantidade e volume de lançamentos junto com o extrato."""
+    quantidade = conta.get("quantidade_transacoes")
+    if quantidade is None:
+        quantidade, volume = totais_extrato(conta.get("extrato", ""))
+    else:
+        volume = conta["volume"]
+    conta["quantidade_transacoes"] = quantidade + 1
+    conta["volume"] = volume + valor
+
+
+def depositar(contas, cpf=None, numero_conta=None, entrada=None):
     if not contas:
-        print("Operação falhou! Nenhuma conta cadastrada.")
+        emitir("Operação falhou! Nenhuma conta cadastrada.", "operacao_falhou")
         return contas
 
     if cpf is None:
-        cpf = input("Informe o CPF (formato xxx.xxx.xxx-xx): ").strip()
+        cpf = _ler(entrada, "Informe o CPF (formato xxx.xxx.xxx-xx): ").strip()
     if not re.match(Constants.CPF_PATTERN, cpf):
-        print(Constants.FAIL_CPF_MESSAGE)
+        emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
         return contas
 
     if numero_conta is None:
-        numero_conta = input("Informe o número da conta: ").strip()
+        numero_conta = _ler(entrada, "Informe o número da conta: ").strip()
 
     try:
-        valor = float(input("Informe o valor do depósito: "))
+        valor = float(_ler(entrada, "Informe o valor do depósito: "))
         if valor <= 0:
-            print("Operação falhou! O valor informado é inválido.")
+            emitir(
+                "Operação falhou! O valor informado é inválido.", "valor_invalido"
+            )
             return contas
     except ValueError:
-        print("Operação falhou! Valor inválido.")
+        emitir("Operação falhou! Valor inválido.", "valor_invalido")
         return contas
 
     conta_encontrada = encontrar_conta(contas, cpf, numero_conta)
     if not conta_encontrada:
-        print(Constants.FAIL_INVALID_ACCOUNT_MESSAGE)
+        emitir(Constants.FAIL_INVALID_ACCOUNT_MESSAGE, "conta_nao_encontrada")
         return contas
 
     saldo_atual = conta_encontrada.get("saldo", 0)
     conta_encontrada["saldo"] = saldo_atual + valor
+    _somar_movimento(conta_encontrada, valor)
 
     extrato_conta = conta_encontrada.get("extrato", "")
     extrato_conta += f"Depósito: R$ {valor:.2f}\n"
     conta_encontrada["extrato"] = extrato_conta
 
-    print("Depósito realizado com sucesso!")
+    emitir("Depósito realizado com sucesso!")
     return contas
 
 
-def sacar(contas):
+def sacar(contas, entrada=None):
     if not contas:
-        print(Constants.FAIL_OPERATION_MESSAGE)
+        emitir(Constants.FAIL_OPERATION_MESSAGE, "operacao_falhou")
         return contas
 
-    cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+    cpf = _ler(entrada, Constants.INFO_CPF_MESSAGE).strip()
     if not re.match(Constants.CPF_PATTERN, cpf):
-        print(Constants.FAIL_CPF_MESSAGE)
+        emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
         return contas
 
-    numero_conta = input(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
+    numero_conta = _ler(entrada, Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
 
     try:
-        valor = float(input("Informe o valor do saque: "))
+        valor = float(_ler(entrada, "Informe o valor do saque: "))
     except ValueError:
-        print("Operação falhou! Valor inválido.")
+        emitir("Operação falhou! Valor inválido.", "valor_invalido")
         return contas
 
     conta_encontrada = encontrar_conta(contas, cpf, numero_conta)
     if not conta_encontrada:
-        print(Constants.FAIL_INVALID_ACCOUNT_MESSAGE)
+        emitir(Constants.FAIL_INVALID_ACCOUNT_MESSAGE, "conta_nao_encontrada")
         return contas
 
     saldo_conta = conta_encontrada.get("saldo", 0)
@@ -99,92 +130,108 @@ def sacar(contas):
     excedeu_saques = numero_saques >= limite_saques
 
     if excedeu_saldo:
-        print("Operação falhou! Saldo insuficiente.")
+        emitir("Operação falhou! Saldo insuficiente.", "saldo_insuficiente")
         return contas
     elif excedeu_limite:
-        print("Operação falhou! O valor do saque excede o limite.")
+        emitir(
+            "Operação falhou! O valor do saque excede o limite.", "limite_excedido"
+        )
         return contas
     elif excedeu_saques:
-        print("Operação falhou! Número máximo de saques diários excedido.")
+        emitir(
+            "Operação falhou! Número máximo de saques diários excedido.",
+            "saques_excedidos",
+        )
         return contas
     elif valor <= 0:
-        print("Operação falhou! O valor informado é inválido.")
+        emitir(
+            "Operação falhou! O valor informado é inválido.", "valor_invalido"
+        )
         return contas
 
     # Realizar saque
     conta_encontrada["saldo"] = saldo_conta - valor
     conta_encontrada["numero_saques"] = numero_saques + 1
+    _somar_movimento(conta_encontrada, valor)
 
     extrato_conta = conta_encontrada.get("extrato", "")
     extrato_conta += f"Saque: R$ {valor:.2f}\n"
     conta_encontrada["extrato"] = extrato_conta
 
-    print("Saque realizado com sucesso!")
+    emitir("Saque realizado com sucesso!")
     return contas
 
 
-def exibir_extrato(contas):
+def exibir_extrato(contas, entrada=None):
     if not contas:
-        print(Constants.FAIL_OPERATION_MESSAGE)
+        emitir(Constants.FAIL_OPERATION_MESSAGE, "operacao_falhou")
         return
 
-    cpf = input("Informe o CPF (formato xxx.xxx.xxx-xx): ").strip()
-    numero_conta = input(Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
+    cpf = _ler(entrada, "Informe o CPF (formato xxx.xxx.xxx-xx): ").strip()
+    numero_conta = _ler(entrada, Constants.INFO_ACCOUNT_NUMBER_MESSAGE).strip()
 
     conta_encontrada = encontrar_conta(contas, cpf, numero_conta)
     if not conta_encontrada:
-        print(Constants.FAIL_INVALID_ACCOUNT_MESSAGE)
+        emitir(Constants.FAIL_INVALID_ACCOUNT_MESSAGE, "conta_nao_encontrada")
         return
 
     saldo_conta = conta_encontrada.get("saldo", 0)
     extrato_conta = conta_encontrada.get("extrato", "")
 
-    print("\n=== Extrato ===")
-    print(f"CPF: {cpf} | Conta: {numero_conta}")
+    emitir("\n=== Extrato ===")
+    emitir(f"CPF: {cpf} | Conta: {numero_conta}")
 
     if not extrato_conta.strip():
-        print("Não foram realizadas movimentações.")
+        emitir("Não foram realizadas movimentações.")
     else:
-        print(extrato_conta.strip())
+        emitir(extrato_conta.strip())
 
-    print(f"Saldo atual: R$ {saldo_conta:.2f}")
-    print("================")
+    emitir(f"Saldo atual: R$ {saldo_conta:.2f}")
+    emitir("================")
 
 
-def criar_usuario(usuarios):
-    cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+def criar_usuario(usuarios, indice_nomes=None, entrada=None):
+    cpf = _ler(entrada, Constants.INFO_CPF_MESSAGE).strip()
     if not re.match(Constants.CPF_PATTERN, cpf):
-        print(Constants.FAIL_CPF_MESSAGE)
+        emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
         return usuarios
 
     usuario = filtrar_usuario(cpf, usuarios)
     if usuario:
-        print("Já existe um usuário com esse CPF!")
+        emitir("Já existe um usuário com esse CPF!", "cpf_cadastrado")
         return usuarios
 
-    nome = input("Informe o nome completo: ").strip()
-    data_nascimento = input("Informe a data de nascimento (DD/MM/AAAA): ").strip()
+    nome = _ler(entrada, "Informe o nome completo: ").strip()
+    data_nascimento = _ler(
+        entrada, "Informe a data de nascimento (DD/MM/AAAA): "
+    ).strip()
 
     try:
-        datetime.strptime(data_nascimento, "%d/%m/%Y")
+        nascimento = ordinal_nascimento(data_nascimento)
     except ValueError:
-        print("Data de nascimento inválida! Utilize o formato DD/MM/AAAA.")
+        emitir(
+            "Data de nascimento inválida! Utilize o formato DD/MM/AAAA.",
+            "data_invalida",
+        )
         return usuarios
 
-    endereco = input(
+    endereco = _ler(entrada, 
         "Informe o endereço (logradouro, número - bairro - cidade/sigla estado): "
     ).strip()
 
     usuarios.append(
         {
             "nome": nome,
-            "data_nascimento": data_nascimento,
+            "nascimento": nascimento,
             "cpf": cpf,
             "endereco": endereco,
+            "local": interpretar_endereco(endereco),
         }
     )
+    if indice_nomes is not None:
+        indice_nomes.sincronizar(usuarios)
 
-    print("Usuário criado com sucesso!")
+    emitir("Usuário criado com sucesso!")
     return usuarios
 
 
@@ -193,16 +240,19 @@ def filtrar_usuario(cpf, usuarios):
     return usuarios_filtrados[0] if usuarios_filtrados else None
 
 
-def criar_conta(agencia, numero_conta, usuarios):
-    cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+def criar_conta(agencia, numero_conta, usuarios, entrada=None):
+    cpf = _ler(entrada, Constants.INFO_CPF_MESSAGE).strip()
 
     if not re.match(Constants.CPF_PATTERN, cpf):
-        print(Constants.FAIL_CPF_MESSAGE)
+        emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
         return None
 
     usuario = filtrar_usuario(cpf, usuarios)
     if not usuario:
-        print("Usuário não encontrado, fluxo de criação de conta encerrado.")
+        emitir(
+            "Usuário não encontrado, fluxo de criação de conta encerrado.",
+            "usuario_nao_encontrado",
+        )
         return None
 
     conta = {
@@ -214,34 +264,36 @@ def criar_conta(agencia, numero_conta, usuarios):
         "numero_saques": 0,
         "limite": 500,
         "limite_saques": 3,
+        "quantidade_transacoes": 0,
+        "volume": 0.0,
     }
 
-    print("Conta criada com sucesso!")
+    emitir("Conta criada com sucesso!")
     return conta
 
 
-def listar_contas(contas):
-    cpf = input(Constants.INFO_CPF_MESSAGE).strip()
+def listar_contas(contas, entrada=None):
+    cpf = _ler(entrada, Constants.INFO_CPF_MESSAGE).strip()
 
     contas_filtradas = contas
     if cpf:
         if not re.match(Constants.CPF_PATTERN, cpf):
-            print(Constants.FAIL_CPF_MESSAGE)
+            emitir(Constants.FAIL_CPF_MESSAGE, "cpf_invalido")
             return
         contas_filtradas = [
             conta for conta in contas if conta["usuario"].get("cpf") == cpf
         ]
 
     if not contas_filtradas:
-        print("Nenhuma conta encontrada.")
+        emitir("Nenhuma conta encontrada.")
         return
 
-    print()
+    emitir()
     for conta in contas_filtradas:
         usuario = conta["usuario"]
         saldo = conta.get("saldo", 0)
-        print("==============================")
-        print(
+        emitir("==============================")
+        emitir(
             f"""\
 Agência: {conta['agencia']}
 Número da Conta: {conta['numero_conta']}
@@ -251,11 +303,60 @@ Saldo: R$ {saldo:.2f}"""
         )
 
 
+def buscar_usuarios(usuarios, indice_nomes, entrada=None):
+    consulta = _ler(entrada, "Informe o nome ou parte dele: ").strip()
+    indice_nomes.sincronizar(usuarios)
+    encontrados = indice_nomes.buscar(consulta)
+    if not encontrados:
+        emitir("Nenhum usuário encontrado.")
+        return encontrados
+    for usuario in encontrados:
+        emitir(f"{usuario['nome']} | CPF: {usuario.get('cpf', 'N/A')}")
+    return encontrados
+
+
+def trocar_agencia(agencia, entrada=None):
+    nova_agencia = _ler(entrada, Constants.INFO_BRANCH_MESSAGE).strip()
+    if not re.match(Constants.BRANCH_PATTERN, nova_agencia):
+        emitir(Constants.FAIL_BRANCH_MESSAGE, "agencia_invalida")
+        return agencia
+    emitir(f"Agência {nova_agencia} selecionada.")
+    return nova_agencia
+
+
+def relatorio_agencia(agencia, contas):
+    if isinstance(contas, TabelaContas):
+        saldo_total = sum(contas.saldo)
+        clientes = {id(usuario) for usuario in contas.usuario}
+    else:
+        saldo_total = sum(conta.get("saldo", 0) for conta in contas)
+        clientes = {id(conta["usuario"]) for conta in contas}
+    relatorio = {
+        "agencia": agencia,
+        "contas": len(contas),
+        "clientes": len(clientes),
+        "saldo_total": saldo_total,
+    }
+    emitir(
+        f"""\
+\n=== Agência {agencia} ===
+Contas: {relatorio['contas']}
+Clientes: {relatorio['clientes']}
+Saldo total: R$ {saldo_total:.2f}"""
+    )
+    return relatorio
+
+
 def main():
     usuarios = []
-    contas = []
-    agencia = "0001"
-    numero_conta = 1
+    indice_nomes = IndiceNomes()
+    contas_por_agencia = ContasPorAgencia()
+    agencia = Constants.BRANCH
+    contas = contas_por_agencia.tabela(agencia)
+    alocador = AlocadorContas()
+    # Número reservado e ainda não usado, por agência: cada tabela exige
+    # números sequenciais, então uma falha não pode abrir lacunas.
+    numeros_pendentes = {}
 
     while True:
         opcao = menu()
@@ -267,18 +368,27 @@ def main():
         elif opcao == "e":
             exibir_extrato(contas)
         elif opcao == "n":
-            conta = criar_conta(agencia, numero_conta, usuarios)
+            if agencia not in numeros_pendentes:
+                numeros_pendentes[agencia] = alocador.proximo(agencia)
+            conta = criar_conta(agencia, numeros_pendentes[agencia], usuarios)
             if conta:
                 contas.append(conta)
-                numero_conta += 1
+                del numeros_pendentes[agencia]
         elif opcao == "lc":
             listar_contas(contas)
         elif opcao == "nu":
-            usuarios = criar_usuario(usuarios)
+            usuarios = criar_usuario(usuarios, indice_nomes)
+        elif opcao == "bn":
+            buscar_usuarios(usuarios, indice_nomes)
+        elif opcao == "ag":
+            agencia = trocar_agencia(agencia)
+            contas = contas_por_agencia.tabela(agencia)
+        elif opcao == "ra":
+            relatorio_agencia(agencia, contas)
         elif opcao == "q":
             break
         else:
-            print(
+            emitir(
                 "Operação inválida, por favor selecione novamente a operação desejada."
             )
 
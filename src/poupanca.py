@@ -0,0 +1,69 @@
+from array import array
+from operator import mul
+
+from src.modelando_sistema_bancario_poo import ContaPoupanca, Deposito
+
+VALOR_MINIMO_JUROS = 0.01
+
+
+class CarteiraPoupanca:
+    """Saldos e taxas das contas poupança em colunas ``array('d')``.
+
+    Os saldos são mantidos em sincronia pelo observador de cada conta, de
+    modo que o cálculo dos juros percorre apenas as colunas, sem tocar nos
+    objetos ``Conta``. A carteira também serve de ouvinte de cadastro do
+    ``SistemaBancario`` e passa a acompanhar cada poupança aberta.
+    """
+
+    def __init__(self):
+        self.contas = []
+        self.saldos = array("d")
+        self.taxas = array("d")
+        self._indices = {}
+
+    def __len__(self):
+        return len(self.contas)
+
+    def adicionar(self, conta):
+        if conta in self._indices:
+            return
+        self._indices[conta] = len(self.contas)
+        self.contas.append(conta)
+        self.saldos.append(conta.saldo)
+        self.taxas.append(conta.taxa_diaria)
+        conta.adicionar_observador(self._atualizar_saldo)
+
+    @classmethod
+    def de_contas(cls, contas):
+        carteira = cls()
+        for conta in contas:
+            if isinstance(conta, ContaPoupanca):
+                carteira.adicionar(conta)
+        return carteira
+
+    def registrar_cliente(self, cliente):
+        pass
+
+    def registrar_conta(self, conta):
+        if isinstance(conta, ContaPoupanca):
+            self.adicionar(conta)
+
+    def _atualizar_saldo(self, conta, saldo_anterior):
+        self.saldos[self._indices[conta]] = conta.saldo
+
+    def calcular_juros(self):
+        """Juros do dia por conta, arredondados ao centavo."""
+        juros = map(mul, self.saldos, self.taxas)
+        return array("d", [round(valor, 2) for valor in juros])
+
+    def creditar_juros(self):
+        """Lança os juros do dia como ``Deposito`` e retorna o total creditado."""
+        juros = self.calcular_juros()
+        contas = self.contas
+        total = 0.0
+        for indice, valor in enumerate(juros):
+            if valor >= VALOR_MINIMO_JUROS:
+                conta = contas[indice]
+                conta.cliente.realizar_transacao(conta, Deposito(valor))
+                total += valor
+        return total
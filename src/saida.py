@@ -0,0 +1,73 @@
+import sys
+from contextlib import contextmanager
+
+
+class SaidaTerminal:
+    def escrever(self, mensagem, codigo=None):
+        print(mensagem)
+
+
+class SaidaNula:
+    def escrever(self, mensagem, codigo=None):
+        pass
+
+
+class SaidaBuffer:
+    """Acumula mensagens e as grava no destino em uma única escrita.
+
+    Ao atingir ``capacidade`` o buffer é descarregado no destino (ou em
+    ``sys.stdout``), de modo que a memória fica limitada mesmo sem destino;
+    ``codigos`` e ``texto`` refletem apenas as mensagens ainda retidas.
+    """
+
+    def __init__(self, destino=None, capacidade=10_000):
+        self.destino = destino
+        self.capacidade = capacidade
+        self.mensagens = []
+
+    def __len__(self):
+        return len(self.mensagens)
+
+    def escrever(self, mensagem, codigo=None):
+        self.mensagens.append((codigo, mensagem))
+        if len(self.mensagens) >= self.capacidade:
+            self.descarregar()
+
+    def codigos(self):
+        return [codigo for codigo, _ in self.mensagens if codigo is not None]
+
+    def texto(self):
+        return "".join(f"{mensagem}\n" for _, mensagem in self.mensagens)
+
+    def descarregar(self):
+        destino = self.destino if self.destino is not None else sys.stdout
+        if self.mensagens:
+            destino.write(self.texto())
+            self.mensagens.clear()
+
+
+_saida = SaidaTerminal()
+
+
+def obter_saida():
+    return _saida
+
+
+def definir_saida(saida):
+    global _saida
+    anterior = _saida
+    _saida = saida
+    return anterior
+
+
+@contextmanager
+def usar_saida(saida):
+    anterior = definir_saida(saida)
+    try:
+        yield saida
+    finally:
+        definir_saida(anterior)
+
+
+def emitir(mensagem="", codigo=None):
+    _saida.escrever(mensagem, codigo)
@@ -0,0 +1,448 @@
+import struct
+import sys
+from array import array
+from operator import itemgetter
+
+from src.coortes import ordinal_nascimento, totais_extrato
+from src.enderecos import Endereco, interpretar_endereco
+from src.livro_razao import CODIGOS, TIPOS
+from src.memoria import coleta_pausada
+from src.modelando_sistema_bancario_poo import (ContaCorrente, ContaPoupanca,
+                                                PessoaFisica, SistemaBancario)
+from src.tabela_contas import TabelaContas
+
+MAGICO = b"BANCO3"
+CABECALHO = struct.Struct("<6sQQQq")
+TAMANHO_BLOCO = struct.Struct("<Q")
+SEPARADOR = "\x00"
+LARGURA_DATA = 19
+
+# Campos já interpretados são gravados como colunas próprias, para que a
+# carga monte os objetos sem rodar expressões regulares linha a linha.
+COLUNAS_LOCAL = tuple(f"local_{campo}" for campo in Endereco._fields)
+# "data_bruta" só é preenchida quando a data de nascimento não pôde ser
+# interpretada (e "nascimento" fica 0).
+COLUNAS_CLIENTES = ("nome", "data_bruta", "cpf", "endereco") + COLUNAS_LOCAL
+COLUNAS_NUMERICAS_CLIENTES = (("nascimento", "i"),)
+COLUNAS_TEXTO_CONTAS = ("agencia", "extrato")
+COLUNAS_CONTAS = (
+    ("numero", "q"),
+    ("cliente", "I"),
+    ("saldo", "d"),
+    ("numero_saques", "i"),
+    ("limite", "d"),
+    ("limite_saques", "i"),
+    ("classe", "B"),
+    ("taxa_diaria", "d"),
+    ("quantidade_transacoes", "q"),
+    ("volume", "d"),
+)
+# A posição na tupla é o código gravado na coluna "classe".
+CLASSES_CONTA = (ContaCorrente, ContaPoupanca)
+CODIGOS_CLASSE = {classe: codigo for codigo, classe in enumerate(CLASSES_CONTA)}
+COLUNAS_HISTORICO = (("contagem", "I"), ("tipo", "B"), ("valor", "d"))
+COLUNAS_NUMERICAS = COLUNAS_NUMERICAS_CLIENTES + COLUNAS_CONTAS + COLUNAS_HISTORICO
+
+
+class SnapshotInvalido(ValueError):
+    pass
+
+
+def _novo_estado():
+    estado = {nome: [] for nome in COLUNAS_CLIENTES + COLUNAS_TEXTO_CONTAS}
+    for nome, codigo in COLUNAS_NUMERICAS:
+        estado[nome] = array(codigo)
+    estado["data"] = []
+    estado["numero_conta"] = 1
+    return estado
+
+
+def _linha_cliente(nome, nascimento, data_bruta, cpf, endereco, local):
+    # Na ordem de COLUNAS_CLIENTES, seguida do ordinal de nascimento.
+    logradouro, numero, bairro, cidade, sigla = local
+    return (
+        nome,
+        data_bruta or "",
+        cpf,
+        endereco,
+        logradouro,
+        numero or "",
+        bairro or "",
+        cidade or "",
+        sigla or "",
+        nascimento or 0,
+    )
+
+
+def _preencher_clientes(estado, linhas):
+    colunas = list(zip(*linhas)) or [()] * (len(COLUNAS_CLIENTES) + 1)
+    for nome, valores in zip(COLUNAS_CLIENTES, colunas):
+        estado[nome] = list(valores)
+    estado["nascimento"] = array("i", colunas[-1])
+
+
+def _locais(estado):
+    # ``interpretar_endereco`` preenche todos os campos ou só o logradouro;
+    # o estado vazio identifica o segundo caso.
+    return [
+        Endereco(logradouro, numero, bairro, cidade, sigla)
+        if sigla
+        else Endereco(logradouro, None, None, None, None)
+        for logradouro, numero, bairro, cidade, sigla in zip(
+            *(estado[coluna] for coluna in COLUNAS_LOCAL)
+        )
+    ]
+
+
+def _little_endian(colunas):
+    # O cabeçalho é little-endian; as colunas numéricas seguem a mesma ordem
+    # em qualquer máquina.
+    if sys.byteorder == "big":
+        colunas = array(colunas.typecode, colunas)
+        colunas.byteswap()
+    return colunas
+
+
+def _escrever_bloco(arquivo, dados):
+    arquivo.write(TAMANHO_BLOCO.pack(len(dados)))
+    arquivo.write(dados)
+
+
+def _ler_bloco(visao, posicao):
+    (tamanho,) = TAMANHO_BLOCO.unpack_from(visao, posicao)
+    inicio = posicao + TAMANHO_BLOCO.size
+    return visao[inicio : inicio + tamanho], inicio + tamanho
+
+
+def _codificar_textos(textos):
+    return SEPARADOR.join(textos).encode("utf-8")
+
+
+def _decodificar_textos(dados, quantidade):
+    if not quantidade:
+        return []
+    return str(dados, "utf-8").split(SEPARADOR)
+
+
+def _escrever_estado(caminho, estado):
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(
+            CABECALHO.pack(
+                MAGICO,
+                len(estado["nome"]),
+                len(estado["numero"]),
+                len(estado["tipo"]),
+                estado["numero_conta"],
+            )
+        )
+        for nome in COLUNAS_CLIENTES + COLUNAS_TEXTO_CONTAS:
+            _escrever_bloco(arquivo, _codificar_textos(estado[nome]))
+        for nome, _ in COLUNAS_NUMERICAS:
+            _escrever_bloco(arquivo, _little_endian(estado[nome]).tobytes())
+        _escrever_bloco(arquivo, "".join(estado["data"]).encode("ascii"))
+
+
+def _ler_estado(caminho):
+    with open(caminho, "rb") as arquivo:
+        visao = memoryview(arquivo.read())
+
+    if len(visao) < CABECALHO.size:
+        raise SnapshotInvalido("Arquivo de snapshot truncado.")
+    magico, n_clientes, n_contas, n_transacoes, numero_conta = CABECALHO.unpack_from(
+        visao
+    )
+    if magico != MAGICO:
+        raise SnapshotInvalido("Arquivo não é um snapshot do banco.")
+
+    estado = _novo_estado()
+    estado["numero_conta"] = numero_conta
+    posicao = CABECALHO.size
+    for nome in COLUNAS_CLIENTES:
+        dados, posicao = _ler_bloco(visao, posicao)
+        estado[nome] = _decodificar_textos(dados, n_clientes)
+    for nome in COLUNAS_TEXTO_CONTAS:
+        dados, posicao = _ler_bloco(visao, posicao)
+        estado[nome] = _decodificar_textos(dados, n_contas)
+    for nome, _ in COLUNAS_NUMERICAS:
+        dados, posicao = _ler_bloco(visao, posicao)
+        estado[nome].frombytes(dados)
+        estado[nome] = _little_endian(estado[nome])
+    dados, posicao = _ler_bloco(visao, posicao)
+    datas = str(dados, "ascii")
+    estado["data"] = [
+        datas[inicio : inicio + LARGURA_DATA]
+        for inicio in range(0, n_transacoes * LARGURA_DATA, LARGURA_DATA)
+    ]
+    return estado
+
+
+def _codigo_classe(conta):
+    codigo = CODIGOS_CLASSE.get(type(conta))
+    if codigo is None:
+        nomes = ", ".join(classe.__name__ for classe in CLASSES_CONTA)
+        raise TypeError(
+            f"Snapshot não grava contas do tipo {type(conta).__name__}; "
+            f"tipos suportados: {nomes}."
+        )
+    return codigo
+
+
+def _linha_pessoa(cliente):
+    return _linha_cliente(
+        cliente.nome,
+        cliente.nascimento,
+        cliente._data_bruta,
+        cliente.cpf,
+        cliente.endereco,
+        cliente.local,
+    )
+
+
+@coleta_pausada()
+def salvar_sistema(caminho, sistema):
+    estado = _novo_estado()
+    estado["numero_conta"] = sistema.numero_conta
+    clientes = list(sistema.clientes)
+    indices = {id(cliente): indice for indice, cliente in enumerate(clientes)}
+
+    for conta in sistema.contas:
+        cliente = conta.cliente
+        if id(cliente) not in indices:
+            indices[id(cliente)] = len(clientes)
+            clientes.append(cliente)
+        classe = _codigo_classe(conta)
+        transacoes = conta.historico.transacoes
+
+        estado["agencia"].append(conta.agencia)
+        estado["extrato"].append(conta.extrato)
+        estado["numero"].append(conta.numero)
+        estado["cliente"].append(indices[id(cliente)])
+        estado["saldo"].append(conta.saldo)
+        estado["numero_saques"].append(getattr(conta, "numero_saques", 0))
+        estado["limite"].append(getattr(conta, "limite", 500))
+        estado["limite_saques"].append(getattr(conta, "limite_saques", 3))
+        estado["classe"].append(classe)
+        estado["taxa_diaria"].append(getattr(conta, "taxa_diaria", 0.0))
+        estado["contagem"].append(len(transacoes))
+        volume = 0.0
+        for transacao in transacoes:
+            estado["tipo"].append(CODIGOS[transacao["tipo"]])
+            estado["valor"].append(transacao["valor"])
+            estado["data"].append(transacao["data"][:LARGURA_DATA].ljust(LARGURA_DATA))
+            volume += transacao["valor"]
+        estado["quantidade_transacoes"].append(len(transacoes))
+        estado["volume"].append(volume)
+
+    _preencher_clientes(estado, map(_linha_pessoa, clientes))
+    _escrever_estado(caminho, estado)
+
+
+@coleta_pausada()
+def carregar_sistema(caminho, sistema=None):
+    estado = _ler_estado(caminho)
+    if sistema is None:
+        sistema = SistemaBancario()
+
+    clientes = [
+        PessoaFisica(nome, nascimento or data_bruta, cpf, endereco, local=local)
+        for nome, nascimento, data_bruta, cpf, endereco, local in zip(
+            estado["nome"],
+            estado["nascimento"],
+            estado["data_bruta"],
+            estado["cpf"],
+            estado["endereco"],
+            _locais(estado),
+        )
+    ]
+    sistema.clientes = clientes
+    sistema.contas = []
+    sistema.numero_conta = estado["numero_conta"]
+
+    tipos, valores, datas = estado["tipo"], estado["valor"], estado["data"]
+    posicao = 0
+    for (
+        agencia,
+        extrato,
+        numero,
+        indice_cliente,
+        saldo,
+        numero_saques,
+        limite,
+        limite_saques,
+        classe,
+        taxa_diaria,
+        quantidade_transacoes,
+        volume,
+        contagem,
+    ) in zip(
+        estado["agencia"],
+        estado["extrato"],
+        *(estado[nome] for nome, _ in COLUNAS_CONTAS),
+        estado["contagem"],
+    ):
+        cliente = clientes[indice_cliente]
+        if CLASSES_CONTA[classe] is ContaPoupanca:
+            conta = ContaPoupanca(numero, cliente, taxa_diaria, agencia=agencia)
+        else:
+            conta = ContaCorrente(
+                numero, cliente, limite, limite_saques, agencia=agencia
+            )
+            conta._numero_saques = numero_saques
+        conta._saldo = saldo
+        conta.extrato = extrato
+        if contagem:
+            conta.historico.restaurar(
+                (
+                    {"tipo": TIPOS[tipos[i]], "valor": valores[i], "data": datas[i]}
+                    for i in range(posicao, posicao + contagem)
+                ),
+                quantidade_transacoes,
+                volume,
+            )
+            posicao += contagem
+
+        sistema.contas.append(conta)
+        cliente.adicionar_conta(conta)
+
+    sistema.indice_saldos.adicionar_varias(sistema.contas)
+    sistema.contadores_regionais.reconstruir(sistema.clientes, sistema.contas)
+    sistema.vincular_contas()
+    sistema.ajustar_numeracao()
+    return sistema
+
+
+def _totais_procedural(conta):
+    quantidade = conta.get("quantidade_transacoes")
+    if quantidade is None:
+        return totais_extrato(conta["extrato"])
+    return quantidade, conta["volume"]
+
+
+@coleta_pausada()
+def salvar_procedural(caminho, usuarios, contas, numero_conta=None):
+    estado = _novo_estado()
+    indices = {id(usuario): indice for indice, usuario in enumerate(usuarios)}
+    usuarios = list(usuarios)
+    tabela = isinstance(contas, TabelaContas)
+    titulares = contas.usuario if tabela else map(itemgetter("usuario"), contas)
+    for usuario in titulares:
+        if id(usuario) not in indices:
+            indices[id(usuario)] = len(usuarios)
+            usuarios.append(usuario)
+
+    _preencher_clientes(estado, map(_linha_usuario, usuarios))
+    if tabela:
+        _colunas_tabela(estado, contas, indices)
+    else:
+        _colunas_dicionarios(estado, contas, indices)
+
+    if numero_conta is None:
+        numero_conta = max(estado["numero"], default=0) + 1
+    estado["numero_conta"] = numero_conta
+    _escrever_estado(caminho, estado)
+
+
+def _linha_usuario(usuario):
+    # Dicionários montados à mão podem trazer só o texto da data ou do
+    # endereço; ``criar_usuario`` já guarda o ordinal e o local.
+    nascimento = usuario.get("nascimento") or 0
+    data_bruta = ""
+    if not nascimento:
+        data_bruta = usuario.get("data_nascimento", "")
+        try:
+            nascimento, data_bruta = ordinal_nascimento(data_bruta), ""
+        except ValueError:
+            pass
+    return _linha_cliente(
+        usuario["nome"],
+        nascimento,
+        data_bruta,
+        usuario["cpf"],
+        usuario["endereco"],
+        usuario.get("local") or interpretar_endereco(usuario["endereco"]),
+    )
+
+
+def _colunas_tabela(estado, tabela, indices):
+    # A TabelaContas já guarda as colunas: são copiadas sem criar linhas.
+    estado["agencia"] = tabela.coluna_agencia()
+    estado["extrato"] = list(tabela.extrato)
+    estado["numero"] = array("q", range(1, len(tabela) + 1))
+    estado["cliente"] = array("I", [indices[id(usuario)] for usuario in tabela.usuario])
+    for nome, codigo in COLUNAS_CONTAS[2:]:
+        # Classe e taxa não existem no motor procedural e ficam zeradas.
+        estado[nome] = array(codigo, getattr(tabela, nome, ()))
+        if not estado[nome]:
+            estado[nome].frombytes(bytes(estado[nome].itemsize * len(tabela)))
+    estado["contagem"] = array("I", bytes(4 * len(tabela)))
+
+
+def _colunas_dicionarios(estado, contas, indices):
+    estado["agencia"] = list(map(itemgetter("agencia"), contas))
+    estado["extrato"] = list(map(itemgetter("extrato"), contas))
+    estado["numero"] = array(
+        "q", list(map(int, map(itemgetter("numero_conta"), contas)))
+    )
+    estado["cliente"] = array("I", [indices[id(conta["usuario"])] for conta in contas])
+    # O motor procedural só tem contas correntes: classe e taxa ficam zeradas.
+    for nome, codigo in COLUNAS_CONTAS[2:-2]:
+        estado[nome] = array(codigo, [conta.get(nome, 0) for conta in contas])
+    totais = list(map(_totais_procedural, contas))
+    estado["quantidade_transacoes"] = array("q", map(itemgetter(0), totais))
+    estado["volume"] = array("d", map(itemgetter(1), totais))
+    estado["contagem"] = array("I", bytes(4 * len(contas)))
+
+
+@coleta_pausada()
+def carregar_procedural(caminho):
+    estado = _ler_estado(caminho)
+    # Mesmos campos que ``criar_usuario`` monta no cadastro interativo.
+    usuarios = [
+        {
+            "nome": nome,
+            "nascimento": nascimento,
+            "cpf": cpf,
+            "endereco": endereco,
+            "local": local,
+        }
+        for nome, nascimento, cpf, endereco, local in zip(
+            estado["nome"],
+            estado["nascimento"],
+            estado["cpf"],
+            estado["endereco"],
+            _locais(estado),
+        )
+    ]
+    contas = [
+        {
+            "agencia": agencia,
+            "numero_conta": numero,
+            "usuario": usuarios[indice_usuario],
+            "saldo": saldo,
+            "extrato": extrato,
+            "numero_saques": numero_saques,
+            "limite": limite,
+            "limite_saques": limite_saques,
+            "quantidade_transacoes": quantidade_transacoes,
+            "volume": volume,
+        }
+        for (
+            agencia,
+            extrato,
+            numero,
+            indice_usuario,
+            saldo,
+            numero_saques,
+            limite,
+            limite_saques,
+            _,
+            _,
+            quantidade_transacoes,
+            volume,
+        ) in zip(
+            estado["agencia"],
+            estado["extrato"],
+            *(estado[nome] for nome, _ in COLUNAS_CONTAS),
+        )
+    ]
+    return usuarios, contas, estado["numero_conta"]
@@ -0,0 +1,158 @@
+from array import array
+
+from src.coortes import totais_extrato
+
+COLUNAS_NUMERICAS = {
+    "saldo": "d",
+    "numero_saques": "i",
+    "limite": "d",
+    "limite_saques": "i",
+    "quantidade_transacoes": "l",
+    "volume": "d",
+}
+
+
+class LinhaConta:
+    """Visão de uma linha da tabela com a mesma interface do dicionário de conta."""
+
+    __slots__ = ("_tabela", "_indice")
+
+    def __init__(self, tabela, indice):
+        self._tabela = tabela
+        self._indice = indice
+
+    def __getitem__(self, chave):
+        return self._tabela.obter_campo(self._indice, chave)
+
+    def __setitem__(self, chave, valor):
+        self._tabela.definir_campo(self._indice, chave, valor)
+
+    def __eq__(self, outra):
+        if isinstance(outra, LinhaConta):
+            return self._tabela is outra._tabela and self._indice == outra._indice
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._tabela), self._indice))
+
+    def get(self, chave, padrao=None):
+        try:
+            return self[chave]
+        except KeyError:
+            return padrao
+
+    def keys(self):
+        return TabelaContas.CAMPOS
+
+    def para_dict(self):
+        return {campo: self[campo] for campo in TabelaContas.CAMPOS}
+
+
+class TabelaContas:
+    """Contas do motor procedural em colunas tipadas (struct-of-arrays).
+
+    A linha ``numero_conta - 1`` guarda a conta de número ``numero_conta``.
+    """
+
+    CAMPOS = (
+        "agencia",
+        "numero_conta",
+        "usuario",
+        "saldo",
+        "extrato",
+        "numero_saques",
+        "limite",
+        "limite_saques",
+        "quantidade_transacoes",
+        "volume",
+    )
+
+    def __init__(self):
+        self._agencias = []
+        self._codigos_agencia = {}
+        self.agencia = array("H")
+        self.usuario = []
+        self.extrato = []
+        for campo, codigo in COLUNAS_NUMERICAS.items():
+            setattr(self, campo, array(codigo))
+
+    def __len__(self):
+        return len(self.usuario)
+
+    def __iter__(self):
+        return (LinhaConta(self, indice) for indice in range(len(self)))
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de conta fora da tabela")
+        return LinhaConta(self, indice)
+
+    def _codigo_agencia(self, agencia):
+        codigo = self._codigos_agencia.get(agencia)
+        if codigo is None:
+            codigo = self._codigos_agencia[agencia] = len(self._agencias)
+            self._agencias.append(agencia)
+        return codigo
+
+    def append(self, conta):
+        if int(conta["numero_conta"]) != len(self) + 1:
+            raise ValueError(
+                f"Número de conta {conta['numero_conta']} fora de sequência "
+                f"(esperado {len(self) + 1})."
+            )
+        self.agencia.append(self._codigo_agencia(conta.get("agencia", "")))
+        self.usuario.append(conta["usuario"])
+        self.extrato.append(conta.get("extrato", ""))
+        self.saldo.append(conta.get("saldo", 0))
+        self.numero_saques.append(conta.get("numero_saques", 0))
+        self.limite.append(conta.get("limite", 500))
+        self.limite_saques.append(conta.get("limite_saques", 3))
+        quantidade = conta.get("quantidade_transacoes")
+        if quantidade is None:
+            quantidade, volume = totais_extrato(conta.get("extrato", ""))
+        else:
+            volume = conta.get("volume", 0.0)
+        self.quantidade_transacoes.append(quantidade)
+        self.volume.append(volume)
+
+    def coluna_agencia(self):
+        """Texto da agência de cada linha, na ordem da tabela."""
+        agencias = self._agencias
+        return [agencias[codigo] for codigo in self.agencia]
+
+    def obter_campo(self, indice, campo):
+        if campo == "numero_conta":
+            return indice + 1
+        if campo == "agencia":
+            return self._agencias[self.agencia[indice]]
+        if campo in COLUNAS_NUMERICAS or campo in ("usuario", "extrato"):
+            return getattr(self, campo)[indice]
+        raise KeyError(campo)
+
+    def definir_campo(self, indice, campo, valor):
+        if campo == "numero_conta":
+            raise KeyError("numero_conta é o índice da linha e não pode mudar.")
+        if campo == "agencia":
+            self.agencia[indice] = self._codigo_agencia(valor)
+        elif campo in COLUNAS_NUMERICAS or campo in ("usuario", "extrato"):
+            getattr(self, campo)[indice] = valor
+        else:
+            raise KeyError(campo)
+
+    def encontrar(self, cpf, numero_conta):
+        try:
+            indice = int(numero_conta) - 1
+        except (TypeError, ValueError):
+            return None
+        if 0 <= indice < len(self) and self.usuario[indice].get("cpf") == cpf:
+            return LinhaConta(self, indice)
+        return None
+
+    @classmethod
+    def de_lista(cls, contas):
+        tabela = cls()
+        for conta in sorted(contas, key=lambda conta: int(conta["numero_conta"])):
+            tabela.append(conta)
+        return tabela
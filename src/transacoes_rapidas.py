@@ -0,0 +1,53 @@
+from collections import namedtuple
+
+from src.metricas_prometheus import metricas
+from src.modelando_sistema_bancario_poo import (Transacao, concluir_chave,
+                                                transacao_duplicada)
+
+DESPACHO = {
+    "Saque": lambda conta, valor: conta.sacar(valor),
+    "Deposito": lambda conta, valor: conta.depositar(valor),
+}
+
+
+class RegistroTransacao(
+    namedtuple("RegistroTransacao", "tipo valor chave_idempotencia", defaults=(None,))
+):
+    """Transação imutável e compacta, despachada por tabela em vez de herança."""
+
+    __slots__ = ()
+
+    def registrar(self, conta):
+        if transacao_duplicada(self.chave_idempotencia):
+            return False
+        sucesso_transacao = False
+        try:
+            sucesso_transacao = DESPACHO[self.tipo](conta, self.valor)
+            if sucesso_transacao:
+                conta.historico.adicionar_registro(self.tipo, self.valor)
+                metricas.registrar_transacao(self.tipo, self.valor)
+        finally:
+            concluir_chave(self.chave_idempotencia, sucesso_transacao)
+        return sucesso_transacao
+
+    def com_chave(self, chave_idempotencia):
+        return self._replace(chave_idempotencia=chave_idempotencia)
+
+
+Transacao.register(RegistroTransacao)
+
+
+def saque_rapido(valor, chave_idempotencia=None):
+    return RegistroTransacao("Saque", valor, chave_idempotencia)
+
+
+def deposito_rapido(valor, chave_idempotencia=None):
+    return RegistroTransacao("Deposito", valor, chave_idempotencia)
+
+
+def registrar_lote(conta, registros):
+    sucessos = 0
+    for registro in registros:
+        if registro.registrar(conta):
+            sucessos += 1
+    return sucessos
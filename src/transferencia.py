@@ -0,0 +1,135 @@
+from collections import defaultdict
+
+from src.constant import Constants
+from src.livro_razao import ROTULOS_EXTRATO
+from src.metricas_prometheus import metricas
+from src.modelando_sistema_bancario_poo import (Transacao, concluir_chave,
+                                                transacao_duplicada)
+from src.saida import emitir
+
+ENVIADA = "TransferenciaEnviada"
+RECEBIDA = "TransferenciaRecebida"
+
+
+class _TravasOrdenadas:
+    # Adquire as travas das contas (as mesmas de ``sacar``/``depositar``)
+    # sempre na mesma ordem, o que evita espera circular entre transferências
+    # concorrentes.
+    def __init__(self, contas):
+        travas = {id(conta.trava): conta.trava for conta in contas}
+        self._travas = [travas[chave] for chave in sorted(travas)]
+
+    def __enter__(self):
+        for trava in self._travas:
+            trava.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        for trava in reversed(self._travas):
+            trava.release()
+
+
+def _debitar(conta, valor):
+    # Transferências não consomem o limite de saques da conta corrente.
+    if not conta.debitar(valor, ROTULOS_EXTRATO[ENVIADA]):
+        return False
+    conta.historico.adicionar_registro(ENVIADA, valor)
+    return True
+
+
+def _creditar(conta, valor):
+    conta.creditar(valor, ROTULOS_EXTRATO[RECEBIDA])
+    conta.historico.adicionar_registro(RECEBIDA, valor)
+
+
+class Transferencia(Transacao):
+    # Do ponto de vista da conta de origem, onde a transação é registrada.
+    tipo = ENVIADA
+
+    def __init__(self, valor, destino, chave_idempotencia=None):
+        self._valor = valor
+        self._destino = destino
+        self._chave_idempotencia = chave_idempotencia
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @property
+    def destino(self):
+        return self._destino
+
+    @property
+    def chave_idempotencia(self):
+        return self._chave_idempotencia
+
+    def registrar(self, conta):
+        if transacao_duplicada(self.chave_idempotencia):
+            return False
+        sucesso_transacao = False
+        try:
+            sucesso_transacao = self._lancar(conta)
+        finally:
+            concluir_chave(self.chave_idempotencia, sucesso_transacao)
+        return sucesso_transacao
+
+    def _lancar(self, conta):
+        if conta is self.destino:
+            emitir(Constants.FAIL_SAME_ACCOUNT_TRANSFER_MESSAGE, "mesma_conta")
+            return False
+        if self.valor <= 0:
+            emitir(Constants.FAIL_VALUE_MESSAGE, "valor_invalido")
+            return False
+
+        with _TravasOrdenadas((conta, self.destino)):
+            if not _debitar(conta, self.valor):
+                return False
+            _creditar(self.destino, self.valor)
+
+        metricas.registrar_transacao("Transferencia", self.valor)
+        return True
+
+
+def compensar_transferencias(transferencias):
+    saldos_liquidos = defaultdict(float)
+    for origem, destino, valor in transferencias:
+        if valor <= 0:
+            emitir(Constants.FAIL_VALUE_MESSAGE, "valor_invalido")
+            return None
+        saldos_liquidos[origem] -= valor
+        saldos_liquidos[destino] += valor
+    return {conta: delta for conta, delta in saldos_liquidos.items() if delta}
+
+
+def liquidar_lote(transferencias):
+    transferencias = list(transferencias)
+    saldos_liquidos = compensar_transferencias(transferencias)
+    if saldos_liquidos is None:
+        return None
+
+    with _TravasOrdenadas(saldos_liquidos):
+        for conta, delta in saldos_liquidos.items():
+            if delta < 0 and conta.saldo < -delta:
+                metricas.registrar_falha("saldo_insuficiente")
+                emitir(
+                    f"Operação falhou! Saldo insuficiente na conta {conta.numero}.",
+                    "saldo_insuficiente",
+                )
+                return None
+            if delta < 0 and -delta > getattr(conta, "limite", -delta):
+                metricas.registrar_falha("limite_excedido")
+                emitir(
+                    "Operação falhou! O valor do saque excede o limite "
+                    f"na conta {conta.numero}.",
+                    "limite_excedido",
+                )
+                return None
+
+        for conta, delta in saldos_liquidos.items():
+            if delta < 0:
+                _debitar(conta, -delta)
+            else:
+                _creditar(conta, delta)
+
+    metricas.transacoes.incrementar("Transferencia", len(transferencias))
+    return saldos_liquidos
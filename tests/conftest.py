@@ -0,0 +1,48 @@
+import pytest
+from src.idempotencia import cache_idempotencia
+from src.instrumentacao import instrumentacao
+from src.metricas_prometheus import metricas
+from src.modelando_sistema_bancario_poo import ContaCorrente, PessoaFisica
+from src.saida import SaidaTerminal, definir_saida
+
+
+class Relogio:
+    """Relógio manual para os componentes que recebem uma função de tempo."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio():
+    return Relogio()
+
+
+@pytest.fixture
+def cliente():
+    return PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+
+
+@pytest.fixture
+def conta(cliente):
+    return ContaCorrente(1, cliente)
+
+
+def _limpar_singletons():
+    cache_idempotencia.limpar()
+    metricas.limpar()
+    instrumentacao.desativar()
+    instrumentacao.limpar()
+
+
+@pytest.fixture(autouse=True)
+def estado_global():
+    """Isola cada teste dos objetos globais de cache, métricas e saída."""
+    _limpar_singletons()
+    anterior = definir_saida(SaidaTerminal())
+    yield
+    definir_saida(anterior)
+    _limpar_singletons()
@@ -0,0 +1,194 @@
+from unittest.mock import patch
+
+import pytest
+from src.agencias import ContasPorAgencia, ParticaoAgencia, ParticoesAgencia
+from src.modelando_sistema_bancario_poo import (ContaCorrente, PessoaFisica,
+                                                SistemaBancario)
+from src.otimizando_sistema_bancario import (main, relatorio_agencia,
+                                             trocar_agencia)
+from src.snapshot import carregar_sistema, salvar_sistema
+
+
+@pytest.fixture
+def clientes():
+    return [
+        PessoaFisica("João", "01/01/1990", "111.222.333-44", "Rua A"),
+        PessoaFisica("Maria", "15/05/1985", "555.666.777-88", "Rua B"),
+    ]
+
+
+@pytest.fixture
+def sistema(clientes):
+    sistema = SistemaBancario()
+    sistema.clientes.extend(clientes)
+    return sistema
+
+
+def criar_conta_na_agencia(sistema, agencia, cpf):
+    sistema.agencia = agencia
+    with patch("builtins.input", return_value=cpf):
+        sistema.criar_conta()
+    return sistema.contas[-1]
+
+
+class TestParticaoAgencia:
+    def test_indices_por_numero_e_cpf(self, clientes):
+        particao = ParticaoAgencia("0001")
+        contas = [
+            ContaCorrente(1, clientes[0]),
+            ContaCorrente(2, clientes[1]),
+            ContaCorrente(3, clientes[0]),
+        ]
+        for conta in contas:
+            particao.adicionar(conta)
+
+        assert particao.buscar("2") is contas[1]
+        assert particao.buscar("x") is None
+        assert particao.contas_do_cliente("111.222.333-44") == [contas[0], contas[2]]
+        assert particao.relatorio() == {
+            "agencia": "0001",
+            "contas": 3,
+            "clientes": 2,
+            "saldo_total": 0,
+        }
+
+    def test_numero_repetido_na_mesma_agencia(self, clientes):
+        particao = ParticaoAgencia("0001")
+        particao.adicionar(ContaCorrente(1, clientes[0]))
+        with pytest.raises(ValueError):
+            particao.adicionar(ContaCorrente(1, clientes[1]))
+
+
+class TestParticoesAgencia:
+    def test_sincronizar_incremental_e_reconstrucao(self, clientes):
+        particoes = ParticoesAgencia()
+        contas = [ContaCorrente(1, clientes[0])]
+        particoes.sincronizar(contas)
+        contas.append(ContaCorrente(1, clientes[1], agencia="0002"))
+        particoes.sincronizar(contas)
+
+        assert particoes.codigos() == ["0001", "0002"]
+        assert particoes.buscar("0002", 1) is contas[1]
+
+        novas = [ContaCorrente(5, clientes[0], agencia="0003")]
+        particoes.sincronizar(novas)
+        assert particoes.codigos() == ["0003"]
+
+    def test_conta_recusada_nao_reindexa_as_anteriores(self, clientes):
+        particoes = ParticoesAgencia()
+        contas = [ContaCorrente(1, clientes[0]), ContaCorrente(1, clientes[1])]
+        with pytest.raises(ValueError):
+            particoes.sincronizar(contas)
+
+        contas[1] = ContaCorrente(2, clientes[1])
+        particoes.sincronizar(contas)
+        assert particoes.buscar("0001", 2) is contas[1]
+
+    def test_anexar_recusa_sem_alterar_a_lista(self, clientes):
+        particoes = ParticoesAgencia()
+        contas = []
+        particoes.anexar(contas, ContaCorrente(1, clientes[0]))
+        with pytest.raises(ValueError):
+            particoes.anexar(contas, ContaCorrente(1, clientes[1]))
+
+        assert len(contas) == 1
+        particoes.anexar(contas, ContaCorrente(2, clientes[1]))
+        assert particoes.buscar("0001", 2) is contas[1]
+
+
+class TestSistemaMultiAgencia:
+    def test_numeracao_independente_por_agencia(self, sistema):
+        primeira = criar_conta_na_agencia(sistema, "0001", "111.222.333-44")
+        segunda = criar_conta_na_agencia(sistema, "0002", "555.666.777-88")
+        terceira = criar_conta_na_agencia(sistema, "0001", "555.666.777-88")
+
+        assert (primeira.agencia, primeira.numero) == ("0001", 1)
+        assert (segunda.agencia, segunda.numero) == ("0002", 1)
+        assert (terceira.agencia, terceira.numero) == ("0001", 2)
+
+    def test_filtrar_conta_usa_agencia_corrente(self, sistema):
+        criar_conta_na_agencia(sistema, "0001", "111.222.333-44")
+        conta = criar_conta_na_agencia(sistema, "0002", "555.666.777-88")
+
+        assert sistema.filtrar_conta("555.666.777-88", "1") is conta
+        sistema.agencia = "0001"
+        assert sistema.filtrar_conta("555.666.777-88", "1") is None
+
+    def test_listar_contas_somente_da_agencia(self, sistema, capsys):
+        criar_conta_na_agencia(sistema, "0001", "111.222.333-44")
+        criar_conta_na_agencia(sistema, "0002", "555.666.777-88")
+        capsys.readouterr()
+
+        with patch("builtins.input", return_value=""):
+            sistema.listar_contas()
+
+        captured = capsys.readouterr()
+        assert "Maria" in captured.out
+        assert "João" not in captured.out
+
+    def test_relatorio_agencia(self, sistema):
+        conta = criar_conta_na_agencia(sistema, "0002", "555.666.777-88")
+        conta.depositar(150.0)
+
+        relatorio = sistema.relatorio_agencia("0002")
+        assert relatorio["contas"] == 1
+        assert relatorio["saldo_total"] == 150.0
+        assert sistema.relatorio_agencia("0003")["contas"] == 0
+
+    @patch("builtins.input", return_value="12")
+    def test_trocar_agencia_invalida(self, mock_input, sistema, capsys):
+        sistema.trocar_agencia()
+
+        assert sistema.agencia == "0001"
+        assert "Agência inválida" in capsys.readouterr().out
+
+    def test_snapshot_preserva_contadores_das_agencias(self, sistema, tmp_path):
+        criar_conta_na_agencia(sistema, "0002", "555.666.777-88")
+        criar_conta_na_agencia(sistema, "0001", "111.222.333-44")
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+
+        carregado = carregar_sistema(caminho)
+        conta = criar_conta_na_agencia(carregado, "0002", "555.666.777-88")
+        assert conta.numero == 2
+
+    def test_numero_repetido_nao_entra_no_sistema(self, sistema):
+        criar_conta_na_agencia(sistema, "0001", "111.222.333-44")
+        sistema.numero_conta = 1
+
+        with pytest.raises(ValueError):
+            sistema.abrir_conta(ContaCorrente, sistema.clientes[1])
+
+        assert len(sistema.contas) == 1
+        assert len(sistema.indice_saldos) == 1
+        assert sistema.clientes[1].contas == []
+        assert sistema.abrir_conta(ContaCorrente, sistema.clientes[1]).numero == 2
+
+
+class TestAgenciasProcedural:
+    @patch("builtins.input", return_value="0042")
+    def test_trocar_agencia(self, mock_input):
+        assert trocar_agencia("0001") == "0042"
+
+    def test_relatorio_agencia_vazia(self):
+        tabela = ContasPorAgencia().tabela("0005")
+        assert relatorio_agencia("0005", tabela)["contas"] == 0
+
+    @patch("builtins.input")
+    def test_main_numera_por_agencia(self, mock_input, capsys):
+        cpf = "111.222.333-44"
+        mock_input.side_effect = [
+            "nu", cpf, "João", "01/01/1990", "Rua A, 1 - Centro - SP/SP",
+            "n", cpf,
+            "ag", "0002",
+            "n", cpf,
+            "lc", "",
+            "q",
+        ]
+        main()
+
+        captured = capsys.readouterr()
+        listagem = captured.out.split("Agência 0002 selecionada.")[1]
+        assert "Agência: 0002" in listagem
+        assert "Agência: 0001" not in listagem
+        assert "Número da Conta: 1" in listagem
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+from src.agendador import AgendadorTransacoes
+from src.idempotencia import cache_idempotencia
+from src.modelando_sistema_bancario_poo import ContaCorrente, Deposito, Saque
+from src.transacoes_rapidas import deposito_rapido
+from src.transferencia import Transferencia
+
+
+@pytest.fixture
+def conta(cliente):
+    return ContaCorrente(1, cliente, limite_saques=100)
+
+
+class TestAgendadorTransacoes:
+    def test_executa_somente_vencidos_em_ordem(self, conta):
+        agendador = AgendadorTransacoes()
+        agendador.agendar(conta, Saque(30.0), momento=20)
+        agendador.agendar(conta, Deposito(100.0), momento=10)
+        agendador.agendar(conta, Deposito(5.0), momento=50)
+
+        assert agendador.executar_vencidos(agora=25) == 2
+        assert conta.saldo == 70.0
+        assert [t["tipo"] for t in conta.historico.transacoes] == ["Deposito", "Saque"]
+        assert len(agendador) == 1
+        assert agendador.proximo_momento() == 50
+
+    def test_cancelar_por_id(self, conta):
+        agendador = AgendadorTransacoes()
+        ids = [
+            agendador.agendar(conta, Deposito(float(valor)), momento=valor)
+            for valor in range(1, 11)
+        ]
+
+        assert agendador.cancelar(ids[0])
+        assert agendador.cancelar(ids[5])
+        assert not agendador.cancelar(ids[5])
+        assert ids[5] not in agendador
+
+        agendador.executar_vencidos(agora=100)
+        assert conta.saldo == sum(range(1, 11)) - 1 - 6
+
+    def test_heap_consistente_apos_cancelamentos_aleatorios(self, conta):
+        gerador = random.Random(7)
+        agendador = AgendadorTransacoes()
+        ids = {
+            agendador.agendar(conta, Deposito(1.0), momento=gerador.random()): None
+            for _ in range(500)
+        }
+        for id_agendamento in gerador.sample(list(ids), 200):
+            agendador.cancelar(id_agendamento)
+
+        momentos = []
+        while len(agendador):
+            momentos.append(agendador.proximo_momento())
+            agendador.executar_vencidos(agora=momentos[-1], limite_lote=1)
+        assert momentos == sorted(momentos)
+        assert len(momentos) == 300
+
+    def test_recorrente_recupera_ocorrencias_apos_parada(self, conta):
+        agendador = AgendadorTransacoes()
+        id_agendamento = agendador.agendar(
+            conta, Deposito(10.0), momento=100, intervalo=10
+        )
+
+        assert agendador.executar_vencidos(agora=145) == 5
+        assert conta.saldo == 50.0
+        assert agendador.proximo_momento() == 150
+        assert id_agendamento in agendador
+
+    def test_recorrente_sem_recuperacao_dispara_uma_vez(self, conta):
+        agendador = AgendadorTransacoes(recuperar_atrasadas=False)
+        agendador.agendar(conta, Deposito(10.0), momento=100, intervalo=10)
+
+        assert agendador.executar_vencidos(agora=145) == 1
+        assert agendador.proximo_momento() == 150
+
+    def test_repeticoes_limitadas(self, conta):
+        agendador = AgendadorTransacoes()
+        id_agendamento = agendador.agendar(
+            conta, Deposito(10.0), momento=0, intervalo=1, repeticoes=3
+        )
+
+        assert agendador.executar_vencidos(agora=100) == 3
+        assert id_agendamento not in agendador
+        assert len(agendador) == 0
+
+    def test_chaves_de_idempotencia_por_ocorrencia(self, conta):
+        agendador = AgendadorTransacoes()
+        agendador.agendar(conta, Deposito(10.0, "salario"), momento=0, intervalo=1)
+
+        agendador.executar_vencidos(agora=2)
+        assert conta.saldo == 30.0
+        assert "salario:3" in cache_idempotencia
+
+    def test_chaves_em_transacoes_rapidas_e_transferencias(self, conta):
+        destino = ContaCorrente(2, conta.cliente)
+        conta.depositar(100.0)
+        agendador = AgendadorTransacoes()
+        agendador.agendar(conta, deposito_rapido(10.0, "rapido"), momento=0)
+        agendador.agendar(
+            conta, Transferencia(5.0, destino, "aluguel"), momento=0, intervalo=1
+        )
+
+        assert agendador.executar_vencidos(agora=1) == 3
+        assert (conta.saldo, destino.saldo) == (100.0, 10.0)
+        assert {"rapido:1", "aluguel:1", "aluguel:2"} <= set(
+            cache_idempotencia._indice
+        )
+
+    def test_falha_no_disparo_nao_perde_o_lote(self, conta):
+        agendador = AgendadorTransacoes()
+        falho = agendador.agendar(conta, None, momento=1)
+        seguinte = agendador.agendar(conta, Deposito(10.0), momento=2)
+
+        with pytest.raises(AttributeError):
+            agendador.executar_vencidos(agora=5)
+
+        assert falho not in agendador
+        assert seguinte in agendador
+        assert len(agendador) == 1
+        assert agendador.executar_vencidos(agora=5) == 1
+        assert conta.saldo == 10.0
+
+    def test_relogio_e_intervalo_invalido(self, conta):
+        agendador = AgendadorTransacoes(relogio=lambda: 5)
+        agendador.agendar(conta, Deposito(1.0), momento=5)
+        assert agendador.executar_vencidos() == 1
+        with pytest.raises(ValueError):
+            agendador.agendar(conta, Deposito(1.0), momento=0, intervalo=0)
@@ -0,0 +1,145 @@
+import multiprocessing
+import threading
+from unittest.mock import patch
+
+from src.alocador_contas import (AlocadorContas, ArmazenamentoArquivo,
+                                 ArmazenamentoMemoria)
+from src.modelando_sistema_bancario_poo import SistemaBancario
+from src.snapshot import carregar_sistema, salvar_sistema
+
+
+def alocar_em_processo(diretorio, quantidade, fila):
+    alocador = AlocadorContas(ArmazenamentoArquivo(diretorio), tamanho_bloco=10)
+    fila.put([alocador.proximo() for _ in range(quantidade)])
+
+
+class TestArmazenamento:
+
+    def test_memoria_reserva_blocos_consecutivos(self):
+        armazenamento = ArmazenamentoMemoria()
+        assert armazenamento.reservar("contas", 10) == 1
+        assert armazenamento.reservar("contas", 10) == 11
+        assert armazenamento.reservar("0002", 10) == 1
+
+    def test_arquivo_persiste_marca_dagua(self, tmp_path):
+        armazenamento = ArmazenamentoArquivo(tmp_path)
+        assert armazenamento.marca_dagua("contas") == 1
+        assert armazenamento.reservar("contas", 50) == 1
+
+        recuperado = ArmazenamentoArquivo(tmp_path)
+        assert recuperado.marca_dagua("contas") == 51
+        assert recuperado.reservar("contas", 50) == 51
+
+    def test_arquivo_sobrescrito_em_largura_fixa(self, tmp_path):
+        (tmp_path / "contas.seq").write_bytes(b"7")
+        armazenamento = ArmazenamentoArquivo(tmp_path)
+        assert armazenamento.reservar("contas", 5) == 7
+        assert armazenamento.reservar("contas", 5) == 12
+
+        dados = (tmp_path / "contas.seq").read_bytes()
+        assert dados == b"00000000000000000017\n"
+
+
+class TestAlocadorContas:
+
+    def test_numeros_sequenciais_na_mesma_thread(self):
+        alocador = AlocadorContas(tamanho_bloco=3)
+        assert [alocador.proximo() for _ in range(5)] == [1, 2, 3, 4, 5]
+
+    def test_chaves_independentes(self):
+        alocador = AlocadorContas()
+        assert alocador.proximo("0001") == 1
+        assert alocador.proximo("0002") == 1
+        assert alocador.proximo("0001") == 2
+
+    def test_threads_recebem_numeros_unicos(self):
+        alocador = AlocadorContas(tamanho_bloco=7)
+        resultados = []
+        trava = threading.Lock()
+
+        def alocar():
+            numeros = [alocador.proximo() for _ in range(100)]
+            with trava:
+                resultados.extend(numeros)
+
+        threads = [threading.Thread(target=alocar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(resultados)) == 400
+
+    def test_processos_recebem_numeros_unicos(self, tmp_path):
+        fila = multiprocessing.Queue()
+        processos = [
+            multiprocessing.Process(
+                target=alocar_em_processo, args=(str(tmp_path), 25, fila)
+            )
+            for _ in range(3)
+        ]
+        for processo in processos:
+            processo.start()
+        numeros = [numero for _ in processos for numero in fila.get(timeout=30)]
+        for processo in processos:
+            processo.join()
+
+        assert len(set(numeros)) == 75
+
+    def test_reinicio_nao_reutiliza_numeros(self, tmp_path):
+        alocador = AlocadorContas(ArmazenamentoArquivo(tmp_path), tamanho_bloco=10)
+        anteriores = {alocador.proximo() for _ in range(3)}
+
+        reiniciado = AlocadorContas(ArmazenamentoArquivo(tmp_path), tamanho_bloco=10)
+        assert reiniciado.proximo() == 11
+        assert 11 not in anteriores
+
+    def test_avancar_descarta_blocos_abaixo_do_minimo(self):
+        alocador = AlocadorContas(tamanho_bloco=10)
+        assert alocador.proximo() == 1
+
+        alocador.avancar("contas", 50)
+        assert alocador.proximo() == 50
+        assert alocador.proximo() == 51
+        alocador.avancar("contas", 5)
+        assert alocador.proximo() == 52
+
+    def test_avancar_persiste_no_arquivo(self, tmp_path):
+        armazenamento = ArmazenamentoArquivo(tmp_path)
+        armazenamento.avancar("contas", 30)
+        armazenamento.avancar("contas", 10)
+        assert armazenamento.marca_dagua("contas") == 30
+        assert armazenamento.reservar("contas", 5) == 30
+
+
+class TestAlocadorSistemaBancario:
+
+    @patch("builtins.input")
+    def test_criar_conta_usa_alocador(self, mock_input, cliente):
+        mock_input.return_value = "123.456.789-00"
+
+        armazenamento = ArmazenamentoMemoria(inicio=1000)
+        sistema = SistemaBancario(alocador=AlocadorContas(armazenamento))
+        sistema.clientes.append(cliente)
+        sistema.criar_conta()
+        sistema.criar_conta()
+
+        assert [conta.numero for conta in sistema.contas] == [1000, 1001]
+
+    @patch("builtins.input")
+    def test_alocador_continua_apos_carregar_snapshot(
+        self, mock_input, cliente, tmp_path
+    ):
+        mock_input.return_value = "123.456.789-00"
+        original = SistemaBancario()
+        original.clientes.append(cliente)
+        for _ in range(3):
+            original.criar_conta()
+        salvar_sistema(tmp_path / "banco.snap", original)
+
+        sistema = carregar_sistema(
+            tmp_path / "banco.snap", SistemaBancario(alocador=AlocadorContas())
+        )
+        sistema.criar_conta()
+
+        assert [conta.numero for conta in sistema.contas] == [1, 2, 3, 4]
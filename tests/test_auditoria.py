@@ -0,0 +1,121 @@
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from src.auditoria import CheckpointAuditoria, Divergencia, auditar_saldos
+from src.eventos import ArmazemEventos
+from src.livro_razao import LivroRazao
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito,
+                                                HistoricoLivroRazao, Saque,
+                                                SistemaBancario)
+from src.transferencia import Transferencia
+
+
+@pytest.fixture
+def contas(cliente):
+    contas = [ContaCorrente(numero, cliente) for numero in range(1, 6)]
+    for conta in contas:
+        Deposito(300.0).registrar(conta)
+        Saque(100.0).registrar(conta)
+    return contas
+
+
+def popular(sistema):
+    cliente = sistema.cadastrar_cliente("Ana", "01/01/1990", "123.456.789-00", "R")
+    contas = [sistema.abrir_conta(ContaCorrente, cliente) for _ in range(4)]
+    for conta in contas:
+        Deposito(300.0).registrar(conta)
+        Saque(100.0).registrar(conta)
+    return contas
+
+
+class TestAuditoria:
+
+    def test_contas_consistentes(self, contas):
+        checkpoint = CheckpointAuditoria()
+        assert auditar_saldos(contas, checkpoint) == []
+        assert checkpoint.obter(("0001", 1)) == (2, 200.0)
+
+    def test_divergencia_reportada(self, contas):
+        contas[2].depositar(50.0)
+
+        divergencias = auditar_saldos(contas)
+        assert divergencias == [Divergencia("0001", 3, 0, 2, 250.0, 200.0)]
+
+    def test_auditoria_incremental(self, contas):
+        checkpoint = CheckpointAuditoria()
+        auditar_saldos(contas, checkpoint)
+
+        Deposito(40.0).registrar(contas[0])
+        contas[1].depositar(10.0)
+
+        divergencias = auditar_saldos(contas, checkpoint)
+        assert checkpoint.obter(("0001", 1)) == (3, 240.0)
+        assert [(d.numero_conta, d.inicio, d.fim) for d in divergencias] == [(2, 2, 2)]
+        assert checkpoint.obter(("0001", 2)) == (2, 200.0)
+
+    def test_varias_contas_divergentes(self, contas):
+        contas[0].depositar(5.0)
+        contas[4].depositar(1.0)
+        divergencias = auditar_saldos(contas)
+        assert [d.numero_conta for d in divergencias] == [1, 5]
+
+    def test_transferencias_sao_consistentes(self, contas):
+        Transferencia(50.0, contas[1]).registrar(contas[0])
+        assert auditar_saldos(contas) == []
+
+    def test_salvar_e_carregar_checkpoint(self, contas, tmp_path):
+        checkpoint = CheckpointAuditoria()
+        auditar_saldos(contas, checkpoint)
+
+        caminho = tmp_path / "auditoria.chk"
+        checkpoint.salvar(caminho)
+        carregado = CheckpointAuditoria.carregar(caminho)
+
+        assert len(carregado) == 5
+        assert carregado.obter(("0001", 3)) == (2, 200.0)
+
+
+class TestAuditoriaParalela:
+
+    @pytest.mark.parametrize("processos", [1, 2])
+    def test_livro_razao_lido_pelos_processos(self, tmp_path, processos):
+        with LivroRazao(tmp_path / "livro.bin") as livro:
+            contas = popular(SistemaBancario(livro_razao=livro))
+            checkpoint = CheckpointAuditoria()
+            assert auditar_saldos(contas, checkpoint, processos, tamanho_lote=3) == []
+            assert checkpoint.obter(("0001", 4)) == (2, 200.0)
+
+            Deposito(40.0).registrar(contas[0])
+            contas[1].depositar(10.0)
+            divergencias = auditar_saldos(contas, checkpoint, processos)
+
+        assert checkpoint.obter(("0001", 1)) == (3, 240.0)
+        assert divergencias == [Divergencia("0001", 2, 2, 2, 210.0, 200.0)]
+
+    def test_livro_razao_le_so_registros_novos(self, tmp_path):
+        with LivroRazao(tmp_path / "livro.bin") as livro:
+            contas = popular(SistemaBancario(livro_razao=livro))
+            checkpoint = CheckpointAuditoria()
+            with patch.object(
+                HistoricoLivroRazao, "transacoes", new_callable=PropertyMock
+            ) as transacoes:
+                auditar_saldos(contas, checkpoint, processos=1)
+                Saque(50.0).registrar(contas[2])
+                assert auditar_saldos(contas, checkpoint, processos=1) == []
+            transacoes.assert_not_called()
+            assert livro.posicoes(3, 2).tolist() == [8]
+        assert checkpoint.obter(("0001", 3)) == (3, 150.0)
+
+    @pytest.mark.parametrize("processos", [1, 2])
+    def test_particoes_do_armazem_de_eventos(self, tmp_path, processos):
+        with ArmazemEventos(tmp_path, particoes=2) as armazem:
+            contas = popular(SistemaBancario(eventos=armazem))
+            checkpoint = CheckpointAuditoria()
+            assert auditar_saldos(contas, checkpoint, processos, armazem) == []
+
+            Deposito(40.0).registrar(contas[0])
+            contas[3].depositar(1.0)
+            divergencias = auditar_saldos(contas, checkpoint, processos, armazem)
+
+        assert checkpoint.obter(("0001", 1)) == (3, 240.0)
+        assert divergencias == [Divergencia("0001", 4, 2, 2, 201.0, 200.0)]
@@ -0,0 +1,109 @@
+from itertools import count
+
+import pytest
+from benchmarks.bench_motores import (comparar, medir_cenario, memoria_residente,
+                                      ruido)
+
+
+def resultado(vazao, p99, memoria=1000, amostras=None, cenario="deposito"):
+    medicao = {
+        "motor": "orientado",
+        "contas": 1000,
+        "cenario": cenario,
+        "vazao": vazao,
+        "latencia_us": {"p99": p99},
+        "memoria_pico": memoria,
+    }
+    if amostras is not None:
+        medicao["amostras"] = amostras
+    return medicao
+
+
+def relatorio(*resultados, cargas=()):
+    return {"resultados": list(resultados), "cargas": list(cargas)}
+
+
+def carga(memoria_residente):
+    return {
+        "motor": "orientado",
+        "contas": 1000,
+        "memoria_residente": memoria_residente,
+    }
+
+
+class TestRuido:
+    def test_desvio_mediano_relativo(self):
+        assert ruido([90, 100, 110, 100, 130]) == pytest.approx(0.1)
+
+    def test_sem_amostras_suficientes(self):
+        assert ruido([]) == 0.0
+        assert ruido([100]) == 0.0
+
+
+class TestComparar:
+    def test_sem_regressao(self):
+        base = relatorio(resultado(1000, 10.0))
+        assert comparar(base, relatorio(resultado(950, 10.5)), 0.10) == []
+
+    def test_queda_de_vazao_acima_da_tolerancia(self):
+        base = relatorio(resultado(1000, 10.0))
+        regressoes = comparar(base, relatorio(resultado(800, 10.0)), 0.10)
+        assert len(regressoes) == 1
+        assert regressoes[0].startswith("orientado/1000/deposito: vazão")
+        assert "-20%" in regressoes[0]
+
+    def test_p99_e_memoria_maiores(self):
+        base = relatorio(resultado(1000, 10.0, memoria=1000))
+        regressoes = comparar(
+            base, relatorio(resultado(1000, 15.0, memoria=2000)), 0.10
+        )
+        assert [regressao.split(":")[1].split()[0] for regressao in regressoes] == [
+            "p99",
+            "memória",
+        ]
+
+    def test_variacao_dentro_do_ruido_nao_e_regressao(self):
+        ruidosas = {"vazao": [700, 1000, 1300, 900, 1100], "p99": [10.0] * 5}
+        base = relatorio(resultado(1000, 10.0, amostras=ruidosas))
+        atual = relatorio(resultado(800, 10.0, amostras=ruidosas))
+        assert comparar(base, atual, 0.10) == []
+        assert len(comparar(base, atual, 0.10, fator_ruido=1)) == 1
+
+    def test_amostras_estaveis_mantem_a_tolerancia(self):
+        estaveis = {"vazao": [990, 1000, 1010], "p99": [10.0, 10.0, 10.0]}
+        base = relatorio(resultado(1000, 10.0, amostras=estaveis))
+        atual = relatorio(resultado(850, 10.0, amostras=estaveis))
+        assert len(comparar(base, atual, 0.10)) == 1
+
+    def test_cenarios_ausentes_na_base_sao_ignorados(self):
+        base = relatorio(resultado(1000, 10.0))
+        atual = relatorio(resultado(10, 100.0, cenario="saque"))
+        assert comparar(base, atual, 0.10) == []
+
+    def test_memoria_residente_apos_a_carga(self):
+        base = relatorio(cargas=[carga(100 * 2**20)])
+        regressoes = comparar(base, relatorio(cargas=[carga(150 * 2**20)]), 0.10)
+        assert regressoes == [
+            "orientado/1000/carga: RSS (MiB) 100.0 -> 150.0 (+50%, limite 10%)"
+        ]
+        assert comparar(base, relatorio(cargas=[carga(None)]), 0.10) == []
+        assert comparar({"resultados": []}, base, 0.10) == []
+
+
+class TestMedirCenario:
+    def test_mediana_das_rodadas(self):
+        aplicadas = []
+        medicao = medir_cenario(count(), aplicadas.append, 50, 10.0, repeticoes=3)
+
+        assert medicao["operacoes"] == 150
+        assert len(medicao["amostras"]["vazao"]) == 3
+        assert len(medicao["amostras"]["p99"]) == 3
+        assert min(medicao["amostras"]["vazao"]) <= medicao["vazao"]
+        assert medicao["vazao"] <= max(medicao["amostras"]["vazao"])
+        # Rodadas e a passada de memória consomem o mesmo fluxo, em sequência.
+        assert aplicadas == list(range(200))
+
+
+def test_memoria_residente():
+    residente = memoria_residente()
+    assert residente is None or residente > 0
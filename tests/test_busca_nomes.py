@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from src.busca_nomes import IndiceNomes, normalizar, trigramas
+from src.modelando_sistema_bancario_poo import PessoaFisica, SistemaBancario
+from src.otimizando_sistema_bancario import buscar_usuarios, criar_usuario
+
+NOMES = [
+    "João da Silva",
+    "Joana Souza",
+    "José Antônio Pereira",
+    "Maria Conceição",
+    "Márcia Silveira",
+    "Antônia Joaquina",
+]
+
+
+@pytest.fixture
+def indice():
+    indice = IndiceNomes()
+    indice.adicionar_varias([{"nome": nome} for nome in NOMES])
+    return indice
+
+
+def nomes(itens):
+    return [item["nome"] for item in itens]
+
+
+class TestNormalizacao:
+    def test_remove_acentos_e_espacos(self):
+        assert normalizar("  JOSÉ   Antônio ") == "jose antonio"
+
+    def test_trigramas(self):
+        assert trigramas("ab") == {"  a", " ab", "ab "}
+
+
+class TestIndiceNomes:
+    def test_prefixo_sem_acentos(self, indice):
+        # Ordenados pela palavra que casou: joana, joao, joaquina, jose.
+        assert nomes(indice.buscar_prefixo("jo")) == [
+            "Joana Souza",
+            "João da Silva",
+            "Antônia Joaquina",
+            "José Antônio Pereira",
+        ]
+        assert nomes(indice.buscar_prefixo("MARC")) == ["Márcia Silveira"]
+
+    def test_prefixo_com_varios_termos(self, indice):
+        assert nomes(indice.buscar_prefixo("sil jo")) == ["João da Silva"]
+        assert indice.buscar_prefixo("sil x") == []
+        assert indice.buscar_prefixo("   ") == []
+
+    def test_prefixo_respeita_limite(self, indice):
+        assert len(indice.buscar_prefixo("j", limite=2)) == 2
+
+    def test_aproximado(self, indice):
+        assert nomes(indice.buscar_aproximado("Joao da Silba"))[0] == "João da Silva"
+        assert nomes(indice.buscar_aproximado("Marcia Silvera"))[0] == (
+            "Márcia Silveira"
+        )
+        assert indice.buscar_aproximado("xyzw") == []
+
+    def test_buscar_recorre_ao_aproximado(self, indice):
+        assert nomes(indice.buscar("Conseicao"))[0] == "Maria Conceição"
+
+    def test_sincronizar_incremental(self):
+        usuarios = [{"nome": "Ana"}]
+        indice = IndiceNomes()
+        indice.sincronizar(usuarios)
+        usuarios.append({"nome": "Anabela"})
+        indice.sincronizar(usuarios)
+
+        assert nomes(indice.buscar_prefixo("ana")) == ["Ana", "Anabela"]
+        indice.sincronizar([{"nome": "Bruno"}])
+        assert len(indice) == 1
+
+
+class TestIntegracao:
+    def test_sistema_bancario(self, capsys):
+        sistema = SistemaBancario()
+        entradas = ["111.222.333-44", "Álvaro Núñez", "01/01/1990", "Rua A"]
+        with patch("builtins.input", side_effect=entradas):
+            sistema.criar_usuario()
+        sistema.clientes.append(
+            PessoaFisica("Alvarenga Lima", "01/01/1990", "555.666.777-88", "Rua B")
+        )
+
+        encontrados = sistema.buscar_clientes("alva")
+        assert [c.cpf for c in encontrados] == ["555.666.777-88", "111.222.333-44"]
+        assert "Álvaro Núñez | CPF: 111.222.333-44" in capsys.readouterr().out
+
+    def test_motor_procedural(self, capsys):
+        indice = IndiceNomes()
+        entradas = ["111.222.333-44", "Lúcia Ramos", "01/01/1990", "Rua A"]
+        with patch("builtins.input", side_effect=entradas):
+            usuarios = criar_usuario([], indice)
+        assert len(indice) == 1
+
+        with patch("builtins.input", return_value="luc"):
+            encontrados = buscar_usuarios(usuarios, indice)
+        assert encontrados == usuarios
@@ -0,0 +1,102 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+from src.cache_extrato import CacheExtrato
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito,
+                                                SistemaBancario)
+
+
+class TestCacheExtrato:
+
+    def test_acerto_evita_nova_renderizacao(self, cliente):
+        cache = CacheExtrato()
+        conta = ContaCorrente(1, cliente)
+        renderizar = MagicMock(return_value="extrato")
+
+        assert cache.obter(conta, renderizar) == "extrato"
+        assert cache.obter(conta, renderizar) == "extrato"
+        renderizar.assert_called_once_with(conta)
+        assert (cache.acertos, cache.falhas) == (1, 1)
+
+    def test_movimentacao_invalida_entrada(self, cliente):
+        cache = CacheExtrato()
+        conta = ContaCorrente(1, cliente)
+        cache.obter(conta, lambda c: f"saldo {c.saldo}")
+
+        conta.depositar(100.0)
+        assert conta not in cache
+        assert cache.obter(conta, lambda c: f"saldo {c.saldo}") == "saldo 100.0"
+
+    def test_operacao_com_falha_nao_invalida(self, cliente):
+        cache = CacheExtrato()
+        conta = ContaCorrente(1, cliente)
+        cache.obter(conta, lambda c: "extrato")
+
+        conta.sacar(100.0)
+        assert conta in cache
+
+    def test_orcamento_remove_menos_recente(self, cliente):
+        texto = "x" * 100
+        cache = CacheExtrato(orcamento_bytes=2 * sys.getsizeof(texto))
+        contas = [ContaCorrente(numero, cliente) for numero in range(3)]
+
+        cache.obter(contas[0], lambda c: texto)
+        cache.obter(contas[1], lambda c: texto)
+        cache.obter(contas[0], lambda c: texto)
+        cache.obter(contas[2], lambda c: texto)
+
+        assert contas[0] in cache
+        assert contas[1] not in cache
+        assert cache.uso_bytes <= cache.orcamento_bytes
+
+    def test_texto_maior_que_orcamento_nao_e_armazenado(self, cliente):
+        cache = CacheExtrato(orcamento_bytes=10)
+        conta = ContaCorrente(1, cliente)
+
+        assert cache.obter(conta, lambda c: "x" * 100) == "x" * 100
+        assert len(cache) == 0
+
+    def test_limpar(self, cliente):
+        cache = CacheExtrato()
+        conta = ContaCorrente(1, cliente)
+        cache.obter(conta, lambda c: "extrato")
+        cache.limpar()
+        assert len(cache) == 0
+        assert cache.uso_bytes == 0
+        assert cache.invalidar not in conta._observadores
+
+    def test_observador_so_enquanto_ha_entrada(self, cliente):
+        texto = "x" * 100
+        cache = CacheExtrato(orcamento_bytes=sys.getsizeof(texto))
+        contas = [ContaCorrente(numero, cliente) for numero in range(2)]
+
+        cache.obter(contas[0], lambda c: texto)
+        cache.obter(contas[1], lambda c: texto)
+        assert cache.invalidar not in contas[0]._observadores
+
+        contas[1].depositar(10.0)
+        assert contas[1]._observadores == ()
+        cache.obter(contas[1], lambda c: texto)
+        assert contas[1]._observadores.count(cache.invalidar) == 1
+
+
+class TestCacheExtratoSistemaBancario:
+
+    @patch("builtins.input")
+    def test_extrato_atualizado_apos_deposito(self, mock_input, cliente, capsys):
+        sistema = SistemaBancario()
+        conta = ContaCorrente(1, cliente)
+        sistema.clientes.append(cliente)
+        sistema.contas.append(conta)
+
+        mock_input.side_effect = ["123.456.789-00", "1"] * 3
+        sistema.exibir_extrato()
+        sistema.exibir_extrato()
+        Deposito(75.0).registrar(conta)
+        sistema.exibir_extrato()
+
+        captured = capsys.readouterr()
+        assert captured.out.count("Não foram realizadas movimentações.") == 2
+        assert "Depósito: R$ 75.00" in captured.out
+        assert "Saldo atual: R$ 75.00" in captured.out
+        assert sistema.cache_extrato.acertos == 1
@@ -0,0 +1,146 @@
+import builtins
+import re
+from collections import Counter
+from itertools import islice
+
+import pytest
+from src.carga_sintetica import (AlvoOrientado, AlvoProcedural, GeradorCarga,
+                                 formatar_cpf)
+from src.constant import Constants
+from src.saida import SaidaBuffer, usar_saida
+
+
+def compartilhamento_maximo(gerador, quantidade=20_000):
+    contagem = Counter(operacao.conta for operacao in gerador.operacoes(quantidade))
+    return contagem.most_common(1)[0][1] / quantidade
+
+
+class TestGeradorCarga:
+    def test_mesma_semente_mesmo_fluxo(self):
+        primeiro = GeradorCarga(semente=3, clientes=50, tamanho_lote=7)
+        segundo = GeradorCarga(semente=3, clientes=50, tamanho_lote=7)
+
+        assert list(primeiro.cadastros()) == list(segundo.cadastros())
+        assert list(primeiro.operacoes(100)) == list(segundo.operacoes(100))
+        assert list(primeiro.operacoes(100)) != list(
+            GeradorCarga(semente=4, clientes=50).operacoes(100)
+        )
+
+    def test_fluxo_preguicoso_e_quantidade_exata(self):
+        gerador = GeradorCarga(clientes=10, tamanho_lote=7)
+        assert len(list(gerador.operacoes(20))) == 20
+        assert len(list(islice(gerador.operacoes(), 1_000))) == 1_000
+
+    def test_cadastros_validos(self):
+        gerador = GeradorCarga(clientes=200)
+        cadastros = list(gerador.cadastros())
+
+        assert len({cadastro.cpf for cadastro in cadastros}) == 200
+        for cadastro in cadastros:
+            assert re.match(Constants.CPF_PATTERN, cadastro.cpf)
+        assert formatar_cpf(12345678901) == "123.456.789-01"
+
+    def test_novos_cadastros_nao_repetem_cpf(self):
+        gerador = GeradorCarga(clientes=30)
+        existentes = {cadastro.cpf for cadastro in gerador.cadastros()}
+        novos = {cadastro.cpf for cadastro in gerador.novos_cadastros(10)}
+        assert len(novos) == 10
+        assert not existentes & novos
+
+    def test_assimetria_concentra_atividade(self):
+        zipf = GeradorCarga(clientes=1_000, assimetria=1.2, falhas={})
+        uniforme = GeradorCarga(clientes=1_000, assimetria=0, falhas={})
+        assert compartilhamento_maximo(zipf) > 0.15
+        assert compartilhamento_maximo(uniforme) < 0.01
+
+    def test_mix_e_falhas(self):
+        gerador = GeradorCarga(
+            clientes=100,
+            mix={"deposito": 3, "extrato": 1},
+            falhas={"conta_inexistente": 0.1, "valor_invalido": 0.2},
+        )
+        operacoes = list(gerador.operacoes(10_000))
+        tipos = Counter(operacao.tipo for operacao in operacoes)
+
+        assert set(tipos) == {"deposito", "extrato"}
+        assert tipos["deposito"] / len(operacoes) == pytest.approx(0.75, abs=0.02)
+        sem_conta = sum(operacao.conta is None for operacao in operacoes)
+        negativos = sum(operacao.valor < 0 for operacao in operacoes)
+        assert sem_conta / len(operacoes) == pytest.approx(0.1, abs=0.01)
+        assert negativos / len(operacoes) == pytest.approx(0.2, abs=0.015)
+
+    def test_parametros_invalidos(self):
+        with pytest.raises(ValueError):
+            GeradorCarga(mix={"transferencia": 1})
+        with pytest.raises(ValueError):
+            GeradorCarga(falhas={"conta_inexistente": 0.7, "cpf_invalido": 0.5})
+
+
+class TestAlvos:
+    @pytest.mark.parametrize("classe", [AlvoOrientado, AlvoProcedural])
+    def test_respostas_nao_passam_por_input(self, classe, monkeypatch):
+        def terminal(mensagem=""):
+            raise AssertionError("input() não deveria ser chamado")
+
+        monkeypatch.setattr(builtins, "input", terminal)
+        gerador = GeradorCarga(semente=2, clientes=10)
+        alvo = classe()
+        with usar_saida(SaidaBuffer()):
+            alvo.cadastrar_todos(gerador)
+            assert alvo.executar(gerador.operacoes(100)) == 100
+
+    @pytest.mark.parametrize("classe", [AlvoOrientado, AlvoProcedural])
+    def test_operacao_sem_contas_carregadas(self, classe):
+        alvo = classe()
+        operacao = next(GeradorCarga(clientes=5).operacoes(1))
+        with pytest.raises(RuntimeError, match="Nenhuma conta carregada"):
+            alvo.aplicar(operacao)
+
+    def test_motores_terminam_com_os_mesmos_saldos(self):
+        gerador = GeradorCarga(
+            semente=9,
+            clientes=40,
+            contas=60,
+            falhas={"valor_invalido": 0.02, "cpf_invalido": 0.02},
+            limite_saques=50,
+        )
+        orientado = AlvoOrientado()
+        procedural = AlvoProcedural()
+        orientado.carregar(gerador)
+        procedural.carregar(gerador)
+
+        with usar_saida(SaidaBuffer()) as saida_orientada:
+            orientado.executar(gerador.operacoes(3_000))
+        with usar_saida(SaidaBuffer()) as saida_procedural:
+            procedural.executar(gerador.operacoes(3_000))
+
+        saldos = [round(conta.saldo, 2) for conta in orientado.sistema.contas]
+        assert saldos == [round(saldo, 2) for saldo in procedural.contas.saldo]
+        for codigo in ("saldo_insuficiente", "valor_invalido", "cpf_invalido"):
+            assert codigo in saida_orientada.codigos()
+            assert codigo in saida_procedural.codigos()
+
+    def test_procedural_sobre_lista_de_dicts(self):
+        gerador = GeradorCarga(semente=4, clientes=30, limite_saques=50)
+        tabela = AlvoProcedural()
+        lista = AlvoProcedural(contas=[])
+        for alvo in (tabela, lista):
+            alvo.carregar(gerador)
+            with usar_saida(SaidaBuffer()):
+                alvo.executar(gerador.operacoes(1_000))
+
+        assert [conta["saldo"] for conta in lista.contas] == list(tabela.contas.saldo)
+        assert [conta["extrato"] for conta in lista.contas] == tabela.contas.extrato
+
+    @pytest.mark.parametrize("classe", [AlvoOrientado, AlvoProcedural])
+    def test_cadastro_pelos_fluxos_interativos(self, classe):
+        gerador = GeradorCarga(clientes=15, contas=20)
+        alvo = classe()
+        with usar_saida(SaidaBuffer()) as saida:
+            alvo.cadastrar_todos(gerador)
+            alvo.executar(gerador.operacoes(200))
+
+        assert "cpf_cadastrado" not in saida.codigos()
+        assert "usuario_nao_encontrado" not in saida.codigos()
+        contas = alvo.sistema.contas if classe is AlvoOrientado else alvo.contas
+        assert len(contas) == 20
@@ -0,0 +1,92 @@
+import pytest
+from src.consultas import IndiceSaques, MotorConsultas
+from src.modelando_sistema_bancario_poo import (ContaCorrente, ContaPoupanca,
+                                                Deposito, Saque,
+                                                SistemaBancario)
+
+
+@pytest.fixture
+def sistema(cliente):
+    sistema = SistemaBancario()
+    sistema.clientes.append(cliente)
+    for numero in range(1, 21):
+        agencia = "0001" if numero <= 15 else "0002"
+        conta = ContaCorrente(numero, cliente, agencia=agencia)
+        Deposito(100.0 * numero).registrar(conta)
+        sistema.contas.append(conta)
+    return sistema
+
+
+class TestIndiceSaques:
+    def test_acompanha_saques_e_esgotadas(self, cliente):
+        conta = ContaCorrente(1, cliente, limite_saques=2)
+        conta.depositar(100.0)
+        indice = IndiceSaques()
+        indice.adicionar(conta)
+
+        Saque(10.0).registrar(conta)
+        assert indice.contas_por_faixa(1, 1) == [conta]
+        Saque(10.0).registrar(conta)
+        assert indice.esgotadas() == [conta]
+
+        conta.numero_saques = 0
+        assert indice.contar_faixa(0, 0) == 1
+        assert indice.contar_esgotadas() == 0
+
+    def test_ignora_contas_sem_saques(self, cliente):
+        indice = IndiceSaques()
+        indice.adicionar(ContaPoupanca(1, cliente))
+        assert len(indice) == 0
+
+
+class TestMotorConsultas:
+    def test_saldo_e_agencia(self, sistema):
+        motor = MotorConsultas(sistema)
+
+        contas = motor.consultar(agencia="0002", saldo_minimo=1700, saldo_maximo=1900)
+        assert [conta.numero for conta in contas] == [17, 18, 19]
+
+    def test_planejador_escolhe_indice_mais_seletivo(self, sistema):
+        motor = MotorConsultas(sistema)
+
+        plano = motor.planejar(agencia="0001", saldo_minimo=1900)
+        assert plano.indice == "saldo"
+        assert plano.estimativas == {"agencia": 15, "saldo": 2}
+
+        plano = motor.planejar(agencia="0002", saldo_maximo=1500)
+        assert plano.indice == "agencia"
+
+        assert motor.planejar().indice == "varredura"
+
+    def test_saques_esgotados_hoje(self, sistema):
+        motor = MotorConsultas(sistema)
+        esgotada = sistema.contas[4]
+        for _ in range(3):
+            Saque(1.0).registrar(esgotada)
+        Saque(1.0).registrar(sistema.contas[7])
+
+        assert motor.consultar(saques_esgotados=True) == [esgotada]
+        assert motor.planejar(saques_esgotados=True).estimativa == 1
+        assert [c.numero for c in motor.consultar(saques_minimo=1)] == [8, 5]
+
+    def test_indices_acompanham_movimentacoes(self, sistema):
+        motor = MotorConsultas(sistema)
+        assert motor.consultar(saldo_minimo=5000) == []
+
+        Deposito(5000.0).registrar(sistema.contas[0])
+        assert motor.consultar(saldo_minimo=5000) == [sistema.contas[0]]
+
+    def test_contas_novas_e_lista_trocada(self, sistema, cliente):
+        motor = MotorConsultas(sistema)
+        motor.consultar()
+        nova = ContaCorrente(21, cliente)
+        nova.depositar(9999.0)
+        sistema.contas.append(nova)
+        assert motor.consultar(saldo_minimo=9000) == [nova]
+
+        sistema.contas = [nova]
+        assert motor.consultar(saques_maximo=0) == [nova]
+
+    def test_criterio_desconhecido(self, sistema):
+        with pytest.raises(TypeError):
+            MotorConsultas(sistema).consultar(cidade="SP")
@@ -0,0 +1,151 @@
+from datetime import date
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from src.coortes import (coortes_etarias, coortes_procedurais,
+                         formatar_nascimento, ordinal_nascimento,
+                         rotulos_faixas, totais_extrato)
+from src.livro_razao import LivroRazao
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito,
+                                                HistoricoLivroRazao,
+                                                PessoaFisica, Saque,
+                                                SistemaBancario)
+from src.otimizando_sistema_bancario import (criar_conta, criar_usuario,
+                                             depositar)
+from src.snapshot import carregar_sistema, salvar_sistema
+from src.tabela_contas import TabelaContas
+from src.transferencia import Transferencia
+
+HOJE = date(2024, 6, 15)
+
+
+def por_faixa(coortes):
+    return {coorte.faixa: coorte for coorte in coortes}
+
+
+class TestOrdinais:
+    def test_ida_e_volta(self):
+        ordinal = ordinal_nascimento("29/02/2000")
+        assert ordinal == date(2000, 2, 29).toordinal()
+        assert formatar_nascimento(ordinal) == "29/02/2000"
+
+    @pytest.mark.parametrize("texto", ["31/02/2000", "2000-01-01", "1/1/2000"])
+    def test_datas_invalidas(self, texto):
+        with pytest.raises(ValueError):
+            ordinal_nascimento(texto)
+
+    def test_pessoa_fisica_guarda_ordinal(self):
+        pessoa = PessoaFisica("Ana", "15/06/2006", "1", "Rua")
+        assert pessoa.nascimento == date(2006, 6, 15).toordinal()
+        assert pessoa.data_nascimento == "15/06/2006"
+        assert PessoaFisica("Ana", "ontem", "1", "Rua").data_nascimento == "ontem"
+
+    def test_usuario_procedural_guarda_ordinal(self):
+        entradas = ["111.222.333-44", "Ana", "01/01/1990", "Rua A"]
+        with patch("builtins.input", side_effect=entradas):
+            usuarios = criar_usuario([])
+        assert usuarios[0]["nascimento"] == date(1990, 1, 1).toordinal()
+        assert "data_nascimento" not in usuarios[0]
+
+
+class TestCoortes:
+    def test_rotulos(self):
+        assert rotulos_faixas((18, 30)) == ["<18", "18-29", "30+"]
+
+    def test_fronteira_do_aniversario(self):
+        clientes = [
+            PessoaFisica("A", "15/06/2006", "1", "Rua"),  # 18 anos hoje
+            PessoaFisica("B", "16/06/2006", "2", "Rua"),  # 17 anos
+            PessoaFisica("C", "15/06/1964", "3", "Rua"),  # 60 anos hoje
+            PessoaFisica("D", "invalida", "4", "Rua"),
+        ]
+        coortes = por_faixa(coortes_etarias(clientes, hoje=HOJE))
+
+        assert coortes["18-25"].clientes == 1
+        assert coortes["<18"].clientes == 1
+        assert coortes["60+"].clientes == 1
+        assert coortes["desconhecida"].clientes == 1
+        assert sum(coorte.clientes for coorte in coortes.values()) == 4
+
+    def test_saldos_e_transacoes(self):
+        jovem = PessoaFisica("A", "01/01/2000", "1", "Rua")
+        idoso = PessoaFisica("B", "01/01/1950", "2", "Rua")
+        for numero, cliente in enumerate((jovem, idoso, idoso), start=1):
+            cliente.adicionar_conta(ContaCorrente(numero, cliente))
+        Deposito(100.0).registrar(jovem.contas[0])
+        Deposito(300.0).registrar(idoso.contas[0])
+        Saque(50.0).registrar(idoso.contas[0])
+        Deposito(20.0).registrar(idoso.contas[1])
+
+        coortes = por_faixa(coortes_etarias([jovem, idoso], hoje=HOJE))
+        assert coortes["18-25"][1:] == (1, 1, 100.0, 1, 100.0)
+        assert coortes["60+"][1:] == (1, 2, 270.0, 3, 370.0)
+        assert "desconhecida" not in coortes
+
+    def test_totais_sem_percorrer_transacoes(self, tmp_path):
+        with LivroRazao(tmp_path / "livro.bin") as livro:
+            sistema = SistemaBancario(livro_razao=livro)
+            cliente = sistema.cadastrar_cliente("A", "01/01/1950", "1", "Rua")
+            conta = sistema.abrir_conta(ContaCorrente, cliente)
+            Deposito(300.0).registrar(conta)
+            destino = sistema.abrir_conta(ContaCorrente, cliente)
+            Transferencia(50.0, destino).registrar(conta)
+            with patch.object(
+                HistoricoLivroRazao, "transacoes", new_callable=PropertyMock
+            ) as transacoes:
+                coortes = por_faixa(coortes_etarias([cliente], hoje=HOJE))
+            transacoes.assert_not_called()
+
+        assert coortes["60+"][1:] == (1, 2, 300.0, 3, 400.0)
+
+    def test_totais_restaurados_do_snapshot(self, tmp_path):
+        sistema = SistemaBancario()
+        cliente = sistema.cadastrar_cliente("A", "01/01/1950", "1", "Rua")
+        conta = sistema.abrir_conta(ContaCorrente, cliente)
+        Deposito(300.0).registrar(conta)
+        Saque(50.0).registrar(conta)
+        salvar_sistema(tmp_path / "banco.snap", sistema)
+
+        carregado = carregar_sistema(tmp_path / "banco.snap")
+        historico = carregado.contas[0].historico
+        assert (historico.quantidade_transacoes, historico.volume) == (2, 350.0)
+        Deposito(10.0).registrar(carregado.contas[0])
+        coortes = por_faixa(coortes_etarias(carregado.clientes, hoje=HOJE))
+        assert coortes["60+"][1:] == (1, 1, 260.0, 3, 360.0)
+
+    def test_motor_procedural(self):
+        usuarios = [
+            {"nome": "A", "data_nascimento": "01/01/2000", "nascimento": None},
+            {"nome": "B", "data_nascimento": "01/01/1980"},
+        ]
+        usuarios[0]["nascimento"] = ordinal_nascimento("01/01/2000")
+        contas = TabelaContas()
+        for numero, usuario in enumerate(usuarios, start=1):
+            contas.append(
+                {
+                    "agencia": "0001",
+                    "numero_conta": numero,
+                    "usuario": usuario,
+                    "saldo": 150.0 * numero,
+                    "extrato": "Depósito: R$ 200.00\nSaque: R$ 50.00\n",
+                }
+            )
+
+        coortes = por_faixa(coortes_procedurais(usuarios, contas, hoje=HOJE))
+        assert coortes["18-25"][1:] == (1, 1, 150.0, 2, 250.0)
+        assert coortes["36-45"].saldo_total == 300.0
+
+    def test_totais_mantidos_pelas_operacoes(self):
+        entradas = ["111.222.333-44", "Ana", "01/01/2000", "Rua A"]
+        with patch("builtins.input", side_effect=entradas):
+            usuarios = criar_usuario([])
+        contas = TabelaContas()
+        with patch("builtins.input", side_effect=["111.222.333-44", "200"]):
+            contas.append(criar_conta("0001", 1, usuarios))
+            depositar(contas, "111.222.333-44", "1")
+        # O extrato deixa de ser lido: só os totais mantidos contam.
+        contas[0]["extrato"] = ""
+
+        coortes = por_faixa(coortes_procedurais(usuarios, contas, hoje=HOJE))
+        assert coortes["18-25"][1:] == (1, 1, 200.0, 1, 200.0)
+        assert totais_extrato("Depósito: R$ 200.00\nSaque: R$ 50.00\n") == (2, 250.0)
@@ -0,0 +1,87 @@
+import pytest
+from src.deteccao_anomalias import DetectorAnomalias
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito, Saque,
+                                                SistemaBancario)
+
+
+@pytest.fixture
+def conta(cliente):
+    return ContaCorrente(1, cliente, limite=100_000, limite_saques=100)
+
+
+class TestDetectorAnomalias:
+
+    def test_valor_atipico(self, conta, relogio):
+        detector = DetectorAnomalias(relogio=relogio)
+        for valor in (100.0, 110.0, 95.0, 105.0, 100.0, 98.0):
+            relogio.agora += 3600
+            detector.observar(conta, "Saque", valor)
+        assert list(detector.alertas) == []
+
+        relogio.agora += 3600
+        detector.observar(conta, "Saque", 5000.0)
+
+        alerta = detector.alertas[-1]
+        assert alerta.conta is conta
+        assert alerta.motivo == "valor_atipico"
+        assert alerta.escore > detector.limite_escore
+
+    def test_rajada_de_depositos(self, conta, relogio):
+        detector = DetectorAnomalias(relogio=relogio, limite_rajada=5)
+        for _ in range(6):
+            relogio.agora += 1
+            detector.observar(conta, "Deposito", 10.0)
+
+        assert [alerta.motivo for alerta in detector.alertas] == ["rajada"]
+
+    def test_rajada_decai_com_o_tempo(self, conta, relogio):
+        detector = DetectorAnomalias(relogio=relogio, limite_rajada=5)
+        for _ in range(10):
+            relogio.agora += 600
+            detector.observar(conta, "Deposito", 10.0)
+
+        assert list(detector.alertas) == []
+
+    def test_capacidade_limita_contas_monitoradas(self, conta):
+        detector = DetectorAnomalias(capacidade=2)
+        contas = [ContaCorrente(numero, conta.cliente) for numero in range(5)]
+        for indice, outra in enumerate(contas):
+            detector.observar(outra, "Deposito", float(indice))
+        assert len(detector) == 2
+
+    def test_estatisticas_por_agencia_e_numero(self, conta):
+        detector = DetectorAnomalias()
+        detector.observar(conta, "Deposito", 10.0)
+        detector.observar(ContaCorrente(1, conta.cliente), "Deposito", 10.0)
+        outra_agencia = ContaCorrente(1, conta.cliente, agencia="0002")
+        detector.observar(outra_agencia, "Deposito", 1.0)
+        assert len(detector) == 2
+
+    def test_callback_de_alerta(self, conta):
+        recebidos = []
+        detector = DetectorAnomalias(limite_rajada=1)
+        detector.ao_alertar = recebidos.append
+
+        detector.observar(conta, "Deposito", 10.0)
+        detector.observar(conta, "Deposito", 10.0)
+        assert recebidos and recebidos[0].motivo == "rajada"
+
+    def test_anexado_ao_sistema(self, conta):
+        sistema = SistemaBancario()
+        sistema.contas.append(conta)
+        outra = ContaCorrente(2, conta.cliente)
+        detector = DetectorAnomalias(limite_rajada=2)
+        detector.anexar(sistema)
+        try:
+            Deposito(500.0).registrar(conta)
+            Deposito(500.0).registrar(conta)
+            Saque(100.0).registrar(conta)
+            Deposito(500.0).registrar(conta)
+            for _ in range(4):
+                Deposito(10.0).registrar(outra)
+        finally:
+            detector.desanexar(sistema)
+
+        assert detector.observar not in sistema.assinantes_lancamentos
+        assert [alerta.conta for alerta in detector.alertas] == [conta]
+        assert detector.alertas[0].tipo == "Deposito"
@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from src.enderecos import ContadoresRegionais, Endereco, interpretar_endereco
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito,
+                                                PessoaFisica, Saque,
+                                                SistemaBancario)
+from src.otimizando_sistema_bancario import criar_usuario
+from src.snapshot import carregar_sistema, salvar_sistema
+
+
+def cadastrar(sistema, cpf, nome, endereco):
+    with patch("builtins.input", side_effect=[cpf, nome, "01/01/1990", endereco]):
+        sistema.criar_usuario()
+    with patch("builtins.input", return_value=cpf):
+        sistema.criar_conta()
+    return sistema.contas[-1]
+
+
+@pytest.fixture
+def sistema():
+    sistema = SistemaBancario()
+    cadastrar(sistema, "111.222.333-44", "João", "Rua A, 12 - Centro - São Paulo/SP")
+    cadastrar(sistema, "555.666.777-88", "Maria", "Av. B, 3 - Moema - Sao Paulo/sp")
+    cadastrar(sistema, "999.888.777-66", "Ana", "Rua C, 1 - Lapa - Campinas/SP")
+    cadastrar(sistema, "123.456.789-00", "Rui", "Rua D, 9 - Centro - Niterói/RJ")
+    return sistema
+
+
+class TestInterpretarEndereco:
+    def test_formato_completo(self):
+        assert interpretar_endereco(
+            "Rua das Flores, 123 A - Vila Nova - Belo Horizonte / mg"
+        ) == Endereco("Rua das Flores", "123 A", "Vila Nova", "Belo Horizonte", "MG")
+
+    def test_bairro_com_hifen(self):
+        endereco = interpretar_endereco("Rua X, 1 - Jardim São-Luís - Recife/PE")
+        assert endereco.bairro == "Jardim São-Luís"
+        assert endereco.cidade == "Recife"
+
+    def test_fora_do_formato(self):
+        assert interpretar_endereco(" Rua A, 123 ") == Endereco(
+            "Rua A, 123", None, None, None, None
+        )
+
+    def test_campos_no_cliente_e_no_usuario(self):
+        cliente = PessoaFisica("João", "01/01/1990", "1", "R, 1 - B - Natal/RN")
+        assert cliente.local.estado == "RN"
+
+        entradas = ["111.222.333-44", "João", "01/01/1990", "R, 1 - B - Natal/RN"]
+        with patch("builtins.input", side_effect=entradas):
+            usuarios = criar_usuario([])
+        assert usuarios[0]["local"].cidade == "Natal"
+
+
+class TestContadoresRegionais:
+    def test_contadores_por_estado_e_cidade(self, sistema):
+        regionais = sistema.contadores_regionais
+
+        assert regionais.estado("sp").clientes == 3
+        assert regionais.estado("SP").contas == 3
+        assert regionais.cidade("são paulo", "SP").clientes == 2
+        assert [regiao.nome for regiao in regionais.cidades("SP")] == [
+            "Campinas/SP",
+            "São Paulo/SP",
+        ]
+        assert regionais.estado("MG").clientes == 0
+
+    def test_saldos_acompanham_movimentacoes(self, sistema):
+        regionais = sistema.contadores_regionais
+        Deposito(300.0).registrar(sistema.contas[0])
+        Deposito(50.0).registrar(sistema.contas[2])
+        Saque(100.0).registrar(sistema.contas[0])
+
+        assert regionais.estado("SP").saldo_total == 250.0
+        assert regionais.cidade("Campinas", "SP").saldo_total == 50.0
+        assert regionais.estado("RJ").saldo_total == 0.0
+
+    def test_reconstruir_apos_snapshot(self, sistema, tmp_path):
+        Deposito(80.0).registrar(sistema.contas[3])
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+
+        regionais = carregar_sistema(caminho).contadores_regionais
+        assert regionais.estado("RJ").contas == 1
+        assert regionais.estado("RJ").saldo_total == 80.0
+
+    def test_reconstruir_remove_observadores_antigos(self):
+        cliente = PessoaFisica("Ana", "01/01/1990", "1", "R, 1 - B - Natal/RN")
+        conta = ContaCorrente(1, cliente)
+        regionais = ContadoresRegionais()
+        regionais.reconstruir([cliente], [conta])
+        regionais.reconstruir([cliente], [conta])
+
+        conta.depositar(10.0)
+        assert regionais.estado("RN").saldo_total == 10.0
+
+    def test_relatorio_regional(self, sistema, capsys):
+        regioes = sistema.relatorio_regional("")
+        assert [regiao.nome for regiao in regioes] == ["RJ", "SP"]
+        assert "SP: 3 clientes, 3 contas" in capsys.readouterr().out
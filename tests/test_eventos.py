@@ -0,0 +1,158 @@
+from unittest.mock import patch
+
+import pytest
+from src.eventos import (ArmazemEventos, EventoInvalido, _reproduzir_particao,
+                         reconstruir_sistema)
+from src.modelando_sistema_bancario_poo import (ContaCorrente, ContaPoupanca,
+                                                Deposito, Historico,
+                                                PessoaFisica, Saque,
+                                                SistemaBancario)
+from src.transferencia import Transferencia, liquidar_lote
+
+
+def popular(sistema):
+    entradas = [
+        "111.222.333-44", "João", "01/01/1990", "Rua A, 1 - Centro - SP/SP",
+        "555.666.777-88", "Maria", "15/05/1985", "Rua B, 2 - Centro - RJ/RJ",
+    ]
+    with patch("builtins.input", side_effect=entradas):
+        sistema.criar_usuario()
+        sistema.criar_usuario()
+    for cpf in ("111.222.333-44", "555.666.777-88", "111.222.333-44"):
+        with patch("builtins.input", return_value=cpf):
+            sistema.criar_conta()
+
+    primeira, segunda, terceira = sistema.contas
+    Deposito(300.0).registrar(primeira)
+    Saque(120.0).registrar(primeira)
+    Deposito(50.0).registrar(segunda)
+    Deposito(10.0).registrar(terceira)
+    Saque(5.0).registrar(terceira)
+
+
+def comparar(original, reconstruido):
+    assert [c.cpf for c in reconstruido.clientes] == [
+        c.cpf for c in original.clientes
+    ]
+    for antes, depois in zip(original.contas, reconstruido.contas, strict=True):
+        assert (depois.agencia, depois.numero) == (antes.agencia, antes.numero)
+        assert depois.cliente.cpf == antes.cliente.cpf
+        assert depois.saldo == pytest.approx(antes.saldo)
+        assert depois.historico.quantidade_transacoes == (
+            antes.historico.quantidade_transacoes
+        )
+        assert depois.historico.volume == pytest.approx(antes.historico.volume)
+        assert depois.numero_saques == antes.numero_saques
+        assert depois.extrato == antes.extrato
+        assert [(t["tipo"], t["valor"]) for t in depois.historico.transacoes] == [
+            (t["tipo"], t["valor"]) for t in antes.historico.transacoes
+        ]
+
+
+@pytest.fixture
+def armazem():
+    return ArmazemEventos(particoes=3)
+
+
+class TestArmazemEventos:
+    def test_lancamentos_vao_para_a_particao_da_conta(self, armazem):
+        cliente = PessoaFisica("João", "01/01/1990", "111.222.333-44", "Rua A")
+        conta = ContaCorrente(7, cliente)
+        armazem.registrar_transacao(conta, "Deposito", 10.0, "01-01-2024 10:00:00")
+
+        fontes = armazem.fontes()
+        indice = armazem.particao("0001", 7)
+        assert fontes[indice] == [
+            ("0001", 7, "Deposito", 10.0, "01-01-2024 10:00:00")
+        ]
+        assert sum(map(len, fontes)) == 1
+
+    def test_reproduzir_particao(self):
+        estados = _reproduzir_particao(
+            [
+                ("0001", 1, "Deposito", 100.0, "d1"),
+                ("0001", 2, "Deposito", 30.0, "d2"),
+                ("0001", 1, "Saque", 40.0, "d3"),
+            ]
+        )
+        saldo, numero_saques, extrato, transacoes = estados["0001", 1]
+        assert saldo == 60.0
+        assert numero_saques == 1
+        assert extrato == "Depósito: R$ 100.00\nSaque: R$ 40.00\n"
+        assert [t["data"] for t in transacoes] == ["d1", "d3"]
+
+    def test_lancamento_sem_conta_e_ignorado(self, armazem):
+        armazem.registrar_transacao(None, "Deposito", 10.0)
+        assert sum(map(len, armazem.fontes())) == 0
+
+    def test_tipo_desconhecido(self):
+        with pytest.raises(EventoInvalido):
+            _reproduzir_particao([("0001", 1, "Pix", 1.0, "d")])
+
+
+class TestReconstruirSistema:
+    def test_reconstrucao_em_memoria(self, armazem):
+        original = SistemaBancario(eventos=armazem)
+        popular(original)
+
+        reconstruido = reconstruir_sistema(armazem, processos=1)
+
+        comparar(original, reconstruido)
+        assert reconstruido.indice_saldos.maiores_saldos(1)[0].numero == 1
+        assert reconstruido.numero_conta == 4
+
+    def test_reconstrucao_paralela_de_arquivos(self, tmp_path):
+        with ArmazemEventos(tmp_path / "eventos", particoes=4) as armazem:
+            original = SistemaBancario(eventos=armazem)
+            try:
+                popular(original)
+            finally:
+                armazem.desanexar(original)
+
+        with ArmazemEventos(tmp_path / "eventos", particoes=4) as armazem:
+            reconstruido = reconstruir_sistema(armazem, processos=2)
+
+        comparar(original, reconstruido)
+
+    def test_transferencias_nao_contam_como_saques(self, armazem):
+        original = SistemaBancario(eventos=armazem)
+        popular(original)
+        primeira, segunda, _ = original.contas
+        for _ in range(3):
+            Transferencia(10.0, segunda).registrar(primeira)
+        liquidar_lote([(segunda, primeira, 5.0)])
+
+        reconstruido = reconstruir_sistema(armazem, processos=1)
+
+        comparar(original, reconstruido)
+        assert reconstruido.contas[1].numero_saques == 0
+
+    def test_armazem_anexado_apenas_ao_proprio_sistema(self, armazem):
+        SistemaBancario(eventos=armazem)
+        outro = SistemaBancario()
+        popular(outro)
+        Historico().adicionar_registro("Deposito", 1.0)
+
+        assert sum(map(len, armazem.fontes())) == 0
+        assert list(armazem.cadastro()) == []
+
+    def test_lancamento_sem_conta(self, armazem):
+        conta = ContaCorrente(9, PessoaFisica("Ana", "01/01/1990", "1", "Rua"))
+        armazem.registrar_transacao(conta, "Deposito", 5.0)
+
+        with pytest.raises(EventoInvalido):
+            reconstruir_sistema(armazem, processos=1)
+
+    def test_reconstrucao_de_poupanca(self, armazem):
+        original = SistemaBancario(eventos=armazem)
+        entradas = ["111.222.333-44", "João", "01/01/1990", "Rua A"]
+        with patch("builtins.input", side_effect=entradas):
+            original.criar_usuario()
+        with patch("builtins.input", return_value="111.222.333-44"):
+            original.criar_conta_poupanca()
+        Deposito(80.0).registrar(original.contas[0])
+
+        conta = reconstruir_sistema(armazem, processos=1).contas[0]
+        assert isinstance(conta, ContaPoupanca)
+        assert conta.taxa_diaria == original.contas[0].taxa_diaria
+        assert conta.saldo == 80.0
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from src.feed_alteracoes import (BLOQUEAR, DESCARTAR_ANTIGO, TRANSBORDAR,
+                                 Assinatura, FeedAlteracoes)
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito,
+                                                PessoaFisica, Saque,
+                                                SistemaBancario)
+
+
+def alteracoes(feed, quantidade):
+    return [
+        feed._nova_alteracao("Deposito", "0001", 1, "111.222.333-44", float(valor))
+        for valor in range(quantidade)
+    ]
+
+
+def drenar(assinatura):
+    async def consumir():
+        recebidas = []
+        while not assinatura.fila.empty():
+            recebidas.append(await assinatura.receber())
+        return recebidas
+
+    return asyncio.run(consumir())
+
+
+class TestAssinatura:
+    def test_politica_invalida(self):
+        with pytest.raises(ValueError):
+            Assinatura("x", politica="ignorar")
+        with pytest.raises(ValueError):
+            Assinatura("x", politica=TRANSBORDAR)
+
+    def test_descartar_antigo_mantem_as_mais_recentes(self):
+        feed = FeedAlteracoes()
+        assinatura = feed.assinar("fraude", capacidade=3, politica=DESCARTAR_ANTIGO)
+        for alteracao in alteracoes(feed, 5):
+            feed.publicar(alteracao)
+
+        assert [a.valor for a in drenar(assinatura)] == [2.0, 3.0, 4.0]
+        assert assinatura.descartadas == 2
+
+    def test_bloquear_nao_perde_alteracoes(self):
+        feed = FeedAlteracoes()
+        assinatura = feed.assinar("notificacoes", capacidade=2, politica=BLOQUEAR)
+        for alteracao in alteracoes(feed, 5):
+            feed.publicar(alteracao)
+
+        assert assinatura.fila.qsize() == 2
+        assert assinatura.atrasadas == 3
+        assert [a.valor for a in drenar(assinatura)] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_bloquear_limita_pendentes_em_memoria(self):
+        feed = FeedAlteracoes()
+        assinatura = feed.assinar(
+            "notificacoes", capacidade=2, politica=BLOQUEAR, capacidade_pendentes=2
+        )
+        for alteracao in alteracoes(feed, 6):
+            feed.publicar(alteracao)
+
+        assert assinatura.atrasadas == 2
+        assert assinatura.descartadas == 2
+        assert [a.valor for a in drenar(assinatura)] == [0.0, 1.0, 2.0, 3.0]
+
+    def test_transbordar_em_disco_em_ordem(self, tmp_path):
+        feed = FeedAlteracoes()
+        assinatura = feed.assinar(
+            "armazem", capacidade=2, politica=TRANSBORDAR, diretorio=tmp_path
+        )
+        for alteracao in alteracoes(feed, 6):
+            feed.publicar(alteracao)
+
+        assert assinatura.atrasadas == 4
+        assert (tmp_path / "armazem.transbordo").stat().st_size > 0
+        recebidas = drenar(assinatura)
+        assert [a.valor for a in recebidas] == [float(v) for v in range(6)]
+        assert recebidas[-1].sequencia == 6
+        assert assinatura.atrasadas == 0
+        feed.cancelar(assinatura)
+
+    def test_publicar_async_espera_espaco(self):
+        async def cenario():
+            feed = FeedAlteracoes()
+            assinatura = feed.assinar("lento", capacidade=1)
+            primeira, segunda = alteracoes(feed, 2)
+            await feed.publicar_async(primeira)
+            produtor = asyncio.create_task(feed.publicar_async(segunda))
+            await asyncio.sleep(0)
+            assert not produtor.done()
+            assert (await assinatura.receber()).valor == 0.0
+            await produtor
+            return (await assinatura.receber()).valor
+
+        assert asyncio.run(cenario()) == 1.0
+
+
+class TestFeedAlteracoes:
+    def test_lancamentos_e_cadastros_do_sistema(self):
+        sistema = SistemaBancario()
+        feed = FeedAlteracoes()
+        assinatura = feed.assinar("dw", capacidade=10)
+        feed.anexar(sistema)
+        try:
+            entradas = ["111.222.333-44", "João", "01/01/1990", "Rua A"]
+            with patch("builtins.input", side_effect=entradas):
+                sistema.criar_usuario()
+            with patch("builtins.input", return_value="111.222.333-44"):
+                sistema.criar_conta()
+            conta = sistema.contas[0]
+            Deposito(100.0).registrar(conta)
+            Saque(500.0).registrar(conta)
+        finally:
+            feed.desanexar(sistema)
+
+        recebidas = drenar(assinatura)
+        assert [a.tipo for a in recebidas] == [
+            "cliente_criado",
+            "conta_criada",
+            "Deposito",
+        ]
+        assert recebidas[2][2:6] == ("0001", 1, "111.222.333-44", 100.0)
+
+    def test_publicar_de_outra_thread(self):
+        async def cenario():
+            feed = FeedAlteracoes()
+            assinatura = feed.assinar("fraude", capacidade=10)
+            cliente = PessoaFisica("Ana", "01/01/1990", "111.222.333-44", "Rua")
+            conta = type("ContaFalsa", (), {})()
+            conta.agencia, conta.numero, conta.cliente = "0002", 7, cliente
+
+            produtor = threading.Thread(
+                target=feed.registrar_transacao, args=(conta, "Saque", 5.0)
+            )
+            produtor.start()
+            produtor.join()
+            return await asyncio.wait_for(assinatura.receber(), timeout=1)
+
+        alteracao = asyncio.run(cenario())
+        assert (alteracao.agencia, alteracao.numero_conta) == ("0002", 7)
+
+    def test_loop_fechado_nao_afeta_o_lancamento(self):
+        loop = asyncio.new_event_loop()
+        loop.close()
+        feed = FeedAlteracoes(loop=loop)
+        sistema = SistemaBancario()
+        conta = ContaCorrente(1, PessoaFisica("Ana", "01/01/1990", "1", "Rua"))
+        sistema.contas.append(conta)
+        feed.anexar(sistema)
+
+        assert Deposito(10.0).registrar(conta) is True
+        assert conta.saldo == 10.0
+        assert feed.perdidas == 1
+
+    def test_historico_sem_conta_e_ignorado(self):
+        feed = FeedAlteracoes()
+        assinatura = feed.assinar("dw")
+        feed.registrar_transacao(None, "Deposito", 1.0)
+        assert assinatura.fila.empty()
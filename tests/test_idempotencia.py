@@ -0,0 +1,108 @@
+import pytest
+from src.constant import Constants
+from src.idempotencia import CacheIdempotencia
+from src.modelando_sistema_bancario_poo import Deposito, Saque
+from src.transacoes_rapidas import deposito_rapido, registrar_lote
+
+
+class TestCacheIdempotencia:
+
+    def test_registrar_chave_nova_e_duplicada(self):
+        cache = CacheIdempotencia()
+        assert cache.registrar("a") is True
+        assert cache.registrar("a") is False
+        assert "a" in cache
+        assert "b" not in cache
+
+    def test_expiracao_por_ttl(self, relogio):
+        cache = CacheIdempotencia(ttl=60, particoes=6, relogio=relogio)
+        cache.registrar("a")
+
+        relogio.agora = 30
+        cache.registrar("b")
+        assert "a" in cache
+
+        relogio.agora = 75
+        assert "a" not in cache
+        assert "b" in cache
+
+        relogio.agora = 100
+        assert "b" not in cache
+        assert len(cache) == 0
+
+    def test_capacidade_descarta_particao_mais_antiga(self, relogio):
+        cache = CacheIdempotencia(capacidade=4, particoes=2, relogio=relogio)
+        for chave in "abcde":
+            cache.registrar(chave)
+
+        assert len(cache) <= 4
+        assert "a" not in cache
+        assert "e" in cache
+
+    def test_reserva_pendente_bloqueia_a_mesma_chave(self):
+        cache = CacheIdempotencia()
+        assert cache.reservar("a") is True
+        assert cache.reservar("a") is False
+        assert "a" not in cache
+
+        cache.liberar("a")
+        assert cache.reservar("a") is True
+        cache.confirmar("a")
+        assert "a" in cache
+        assert cache.reservar("a") is False
+
+    def test_limpar(self):
+        cache = CacheIdempotencia()
+        cache.registrar("a")
+        cache.limpar()
+        assert len(cache) == 0
+
+
+class TestTransacoesIdempotentes:
+
+    def test_deposito_duplicado_e_ignorado(self, conta, capsys):
+        Deposito(100.0, chave_idempotencia="dep-1").registrar(conta)
+        Deposito(100.0, chave_idempotencia="dep-1").registrar(conta)
+
+        assert conta.saldo == 100.0
+        assert len(conta.historico.transacoes) == 1
+        assert Constants.FAIL_DUPLICATED_TRANSACTION_MESSAGE in capsys.readouterr().out
+
+    def test_duplicadas_retornam_falso(self, conta):
+        assert Deposito(100.0, chave_idempotencia="dup").registrar(conta) is True
+        assert Deposito(100.0, chave_idempotencia="dup").registrar(conta) is False
+        assert deposito_rapido(100.0, "dup").registrar(conta) is False
+        assert Saque(10.0, chave_idempotencia="dup").registrar(conta) is False
+
+    def test_excecao_libera_a_chave(self, conta):
+        def falhar(valor):
+            raise RuntimeError
+
+        conta.depositar = falhar
+        with pytest.raises(RuntimeError):
+            Deposito(100.0, chave_idempotencia="exc").registrar(conta)
+        del conta.depositar
+
+        assert Deposito(100.0, chave_idempotencia="exc").registrar(conta) is True
+
+    def test_saque_com_falha_pode_ser_repetido(self, conta):
+        Saque(50.0, chave_idempotencia="saq-1").registrar(conta)
+        conta.depositar(100.0)
+        Saque(50.0, chave_idempotencia="saq-1").registrar(conta)
+
+        assert conta.saldo == 50.0
+        assert conta.numero_saques == 1
+
+    def test_sem_chave_nao_deduplica(self, conta):
+        Deposito(10.0).registrar(conta)
+        Deposito(10.0).registrar(conta)
+        assert conta.saldo == 20.0
+
+    def test_lote_com_chaves_repetidas(self, conta):
+        registros = [
+            deposito_rapido(100.0, "lote-1"),
+            deposito_rapido(100.0, "lote-1"),
+            deposito_rapido(50.0, "lote-2"),
+        ]
+        assert registrar_lote(conta, registros) == 2
+        assert conta.saldo == 150.0
@@ -0,0 +1,143 @@
+import random
+from unittest.mock import patch
+
+from src.indice_saldos import IndiceSaldos, _ListaOrdenada
+from src.modelando_sistema_bancario_poo import (ContaCorrente, PessoaFisica,
+                                                SistemaBancario)
+
+
+def criar_contas(saldos):
+    cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    contas = []
+    for numero, saldo in enumerate(saldos, start=1):
+        conta = ContaCorrente(numero, cliente)
+        if saldo:
+            conta.depositar(saldo)
+        contas.append(conta)
+    return contas
+
+
+class TestIndiceSaldos:
+
+    def test_adicionar_conta(self):
+        indice = IndiceSaldos()
+        conta = criar_contas([100.0])[0]
+        indice.adicionar(conta)
+        indice.adicionar(conta)
+
+        assert len(indice) == 1
+        assert conta in indice
+
+    def test_maiores_e_menores_saldos(self):
+        indice = IndiceSaldos()
+        contas = criar_contas([300.0, 0, 1000.0, 50.0])
+        for conta in contas:
+            indice.adicionar(conta)
+
+        assert indice.maiores_saldos(2) == [contas[2], contas[0]]
+        assert indice.menores_saldos(2) == [contas[1], contas[3]]
+        assert indice.maiores_saldos(0) == []
+
+    def test_atualiza_apos_deposito_e_saque(self):
+        indice = IndiceSaldos()
+        contas = criar_contas([300.0, 200.0])
+        for conta in contas:
+            indice.adicionar(conta)
+
+        contas[1].depositar(500.0)
+        assert indice.maiores_saldos(1) == [contas[1]]
+
+        contas[1].sacar(500.0)
+        assert indice.maiores_saldos(1) == [contas[0]]
+        assert len(indice) == 2
+
+    def test_saque_com_falha_nao_altera_indice(self):
+        indice = IndiceSaldos()
+        contas = criar_contas([100.0])
+        indice.adicionar(contas[0])
+
+        contas[0].sacar(1000.0)
+        assert indice.contas_por_faixa(100.0, 100.0) == [contas[0]]
+
+    def test_contas_por_faixa(self):
+        indice = IndiceSaldos()
+        contas = criar_contas([0, 10.0, 500.0, 2000.0])
+        for conta in contas:
+            indice.adicionar(conta)
+
+        assert indice.contas_por_faixa(maximo=10.0) == [contas[0], contas[1]]
+        assert indice.contas_por_faixa(10.0, 500.0) == [contas[1], contas[2]]
+        assert indice.contas_por_faixa(minimo=1000.0) == [contas[3]]
+
+    def test_adicionar_varias(self):
+        indice = IndiceSaldos()
+        contas = criar_contas([300.0, 0, 1000.0])
+        indice.adicionar(contas[0])
+        indice.adicionar_varias(contas)
+
+        assert len(indice) == 3
+        assert indice.menores_saldos(3) == [contas[1], contas[0], contas[2]]
+
+    def test_remover_conta(self):
+        indice = IndiceSaldos()
+        conta = criar_contas([100.0])[0]
+        indice.adicionar(conta)
+        indice.remover(conta)
+        conta.depositar(50.0)
+
+        assert len(indice) == 0
+        assert conta not in indice
+
+
+class TestListaOrdenada:
+
+    def test_blocos_acompanham_lista_ordenada(self):
+        aleatorio = random.Random(0)
+        lista = _ListaOrdenada(carga=4)
+        referencia = []
+        for _ in range(500):
+            chave = aleatorio.randint(0, 100)
+            if referencia and aleatorio.random() < 0.4:
+                chave = aleatorio.choice(referencia)
+                lista.remover(chave)
+                referencia.remove(chave)
+            else:
+                lista.adicionar(chave)
+                referencia.append(chave)
+        referencia.sort()
+
+        assert list(lista) == referencia
+        assert list(reversed(lista)) == referencia[::-1]
+        for minimo, maximo in ((10, 60), (None, 5), (95, None), (70, 20)):
+            chaves, quantidade = lista.faixa(minimo, maximo)
+            esperado = [
+                chave
+                for chave in referencia
+                if (minimo is None or chave >= minimo)
+                and (maximo is None or chave <= maximo)
+            ]
+            assert list(chaves) == esperado
+            assert quantidade == len(esperado)
+
+    def test_estender_e_remover_inexistente(self):
+        lista = _ListaOrdenada(carga=2)
+        lista.estender([5, 1, 3])
+        lista.estender([4, 2])
+        lista.remover(9)
+
+        assert list(lista) == [1, 2, 3, 4, 5]
+        assert len(lista) == 5
+
+
+class TestIndiceSaldosSistemaBancario:
+
+    @patch("builtins.input")
+    def test_criar_conta_adiciona_ao_indice(self, mock_input, cliente):
+        mock_input.return_value = "123.456.789-00"
+
+        sistema = SistemaBancario()
+        sistema.clientes.append(cliente)
+        sistema.criar_conta()
+        sistema.contas[0].depositar(250.0)
+
+        assert sistema.indice_saldos.maiores_saldos(1) == [sistema.contas[0]]
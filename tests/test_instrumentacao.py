@@ -0,0 +1,172 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from src.instrumentacao import (Histograma, Instrumentacao,
+                                formatar_relatorio, instrumentacao)
+from src.modelando_sistema_bancario_poo import SistemaBancario
+
+
+@pytest.fixture
+def instrumentacao_global():
+    instrumentacao.ativar()
+    return instrumentacao
+
+
+class TestHistograma:
+
+    def test_histograma_vazio(self):
+        histograma = Histograma()
+        assert histograma.percentil(50) == 0
+        assert histograma.media() == 0
+
+    def test_valores_pequenos_sao_exatos(self):
+        histograma = Histograma()
+        for valor in range(1, 11):
+            histograma.registrar(valor)
+
+        assert histograma.contagem == 10
+        assert histograma.percentil(50) == 5
+        assert histograma.percentil(100) == 10
+
+    def test_erro_relativo_limitado(self):
+        histograma = Histograma(bits_precisao=5)
+        for valor in range(1000, 1_000_001, 1000):
+            histograma.registrar(valor)
+
+        p50 = histograma.percentil(50)
+        p99 = histograma.percentil(99)
+        assert abs(p50 - 500_000) / 500_000 < 1 / 32
+        assert abs(p99 - 990_000) / 990_000 < 1 / 32
+        assert histograma.percentil(99.9) <= histograma.maximo
+
+
+class TestInstrumentacao:
+
+    def test_desativada_nao_registra(self):
+        inst = Instrumentacao()
+
+        @inst.medir("op")
+        def operacao(valor):
+            return valor * 2
+
+        assert operacao(2) == 4
+        assert inst.relatorio() == {}
+
+    def test_ativada_registra_chamadas(self):
+        inst = Instrumentacao(ativo=True)
+
+        @inst.medir("op")
+        def operacao():
+            return "ok"
+
+        operacao()
+        operacao()
+
+        relatorio = inst.relatorio()
+        assert relatorio["op"]["chamadas"] == 2
+        assert relatorio["op"]["p50"] <= relatorio["op"]["p999"]
+
+    def test_registra_mesmo_com_excecao(self):
+        inst = Instrumentacao(ativo=True)
+
+        @inst.medir("op")
+        def operacao():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            operacao()
+        assert inst.relatorio()["op"]["chamadas"] == 1
+
+    def test_registro_concorrente(self):
+        inst = Instrumentacao(ativo=True)
+
+        def registrar():
+            for valor in range(1, 2001):
+                inst.registrar("op", valor)
+
+        threads = [threading.Thread(target=registrar) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert inst.relatorio()["op"]["chamadas"] == 16_000
+        assert inst.histogramas["op"].total == 8 * sum(range(1, 2001))
+
+    def test_alternar(self):
+        inst = Instrumentacao()
+        assert inst.alternar() is True
+        assert inst.alternar() is False
+
+    def test_formatar_relatorio(self):
+        assert formatar_relatorio({}) == "Nenhuma métrica registrada."
+
+        inst = Instrumentacao(ativo=True)
+        inst.registrar("depositar", 1500)
+        texto = formatar_relatorio(inst.relatorio())
+        assert "depositar" in texto
+        assert "p999" in texto
+
+
+class TestInstrumentacaoSistemaBancario:
+
+    @patch("builtins.input")
+    def test_operacoes_sao_medidas(self, mock_input, instrumentacao_global):
+        mock_input.side_effect = [
+            "123.456.789-00",
+            "João",
+            "01/01/1990",
+            "Rua A",
+            "123.456.789-00",
+            "123.456.789-00",
+            "1",
+            "100",
+            "",
+        ]
+        sistema = SistemaBancario()
+        sistema.criar_usuario()
+        sistema.criar_conta()
+        sistema.depositar()
+        sistema.listar_contas()
+
+        relatorio = instrumentacao_global.relatorio()
+        for operacao in (
+            "criar_usuario",
+            "criar_conta",
+            "registrar_deposito",
+            "depositar",
+            "listar_contas",
+        ):
+            assert relatorio[operacao]["chamadas"] == 1
+
+    def test_espera_pela_entrada_nao_e_medida(self, instrumentacao_global):
+        def entrada_lenta(_=""):
+            time.sleep(0.05)
+            return "123.456.789-00"
+
+        sistema = SistemaBancario()
+        sistema.cadastrar_cliente("João", "01/01/1990", "123.456.789-00", "Rua A")
+        with patch("builtins.input", entrada_lenta):
+            sistema.criar_conta()
+
+        assert instrumentacao_global.relatorio()["criar_conta"]["max"] < 50_000_000
+
+    def test_exibir_metricas(self, instrumentacao_global, capsys):
+        instrumentacao_global.registrar("depositar", 2000)
+        SistemaBancario().exibir_metricas()
+
+        captured = capsys.readouterr()
+        assert "=== Métricas ===" in captured.out
+        assert "depositar" in captured.out
+
+    def test_alternar_metricas(self, capsys):
+        sistema = SistemaBancario()
+        sistema.alternar_metricas()
+        sistema.alternar_metricas()
+
+        captured = capsys.readouterr()
+        assert "Métricas ativadas." in captured.out
+        assert "Métricas desativadas." in captured.out
+        assert instrumentacao.ativo is False
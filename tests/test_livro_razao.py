@@ -0,0 +1,178 @@
+from unittest.mock import patch
+
+import pytest
+from src.livro_razao import FORMATO_REGISTRO, LivroRazao, formatar_momento
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito,
+                                                HistoricoLivroRazao, Saque,
+                                                SistemaBancario)
+
+
+@pytest.fixture
+def livro(tmp_path):
+    with LivroRazao(tmp_path / "livro.bin") as livro:
+        yield livro
+
+
+class TestLivroRazao:
+
+    def test_livro_vazio(self, livro):
+        assert len(livro) == 0
+        assert list(livro.registros()) == []
+
+    def test_registros_de_tamanho_fixo(self, livro, tmp_path):
+        livro.adicionar(1, "Deposito", 100.0, momento=10)
+        livro.adicionar(2, "Saque", 50.0, momento=20)
+        livro._arquivo.flush()
+
+        assert len(livro) == 2
+        assert (tmp_path / "livro.bin").stat().st_size == 2 * FORMATO_REGISTRO.size
+
+    def test_registros_por_conta(self, livro):
+        livro.adicionar(1, "Deposito", 100.0, momento=10)
+        livro.adicionar(2, "Deposito", 70.0, momento=20)
+        livro.adicionar(1, "Saque", 30.0, momento=30)
+
+        assert list(livro.registros(1)) == [
+            (1, 10, "Deposito", 100.0),
+            (1, 30, "Saque", 30.0),
+        ]
+
+    def test_registros_por_intervalo(self, livro):
+        for momento in range(10, 60, 10):
+            livro.adicionar(1, "Deposito", float(momento), momento=momento)
+
+        valores = [registro[3] for registro in livro.registros(inicio=20, fim=50)]
+        assert valores == [20.0, 30.0, 40.0]
+
+    def test_leitura_apos_novas_escritas(self, livro):
+        livro.adicionar(1, "Deposito", 100.0, momento=10)
+        assert len(list(livro.registros())) == 1
+
+        livro.adicionar(1, "Deposito", 200.0, momento=20)
+        assert len(list(livro.registros())) == 2
+
+    def test_reabrir_arquivo(self, tmp_path):
+        caminho = tmp_path / "livro.bin"
+        with LivroRazao(caminho) as livro:
+            livro.adicionar(7, "Saque", 10.0, momento=1)
+
+        with LivroRazao(caminho) as livro:
+            assert list(livro.registros()) == [(7, 1, "Saque", 10.0)]
+
+    def test_reabrir_e_indexar_por_conta(self, tmp_path):
+        caminho = tmp_path / "livro.bin"
+        with LivroRazao(caminho) as livro:
+            livro.adicionar(1, "Deposito", 10.0, momento=1)
+            livro.adicionar(2, "Deposito", 20.0, momento=2)
+
+        with LivroRazao(caminho) as livro:
+            livro.adicionar(1, "Saque", 5.0, momento=3)
+            assert list(livro.registros(1)) == [
+                (1, 1, "Deposito", 10.0),
+                (1, 3, "Saque", 5.0),
+            ]
+            assert list(livro.registros(1, inicio=2)) == [(1, 3, "Saque", 5.0)]
+            assert list(livro.registros(3)) == []
+
+    def test_descarta_registro_incompleto(self, tmp_path):
+        caminho = tmp_path / "livro.bin"
+        with LivroRazao(caminho) as livro:
+            livro.adicionar(1, "Deposito", 10.0, momento=1)
+        with open(caminho, "ab") as arquivo:
+            arquivo.write(FORMATO_REGISTRO.pack(2, 2, 0, 20.0)[:5])
+
+        with LivroRazao(caminho) as livro:
+            livro.adicionar(3, "Saque", 5.0, momento=3)
+            assert list(livro.registros()) == [
+                (1, 1, "Deposito", 10.0),
+                (3, 3, "Saque", 5.0),
+            ]
+
+    def test_maior_conta(self, tmp_path):
+        caminho = tmp_path / "livro.bin"
+        with LivroRazao(caminho) as livro:
+            assert livro.maior_conta() == 0
+            livro.adicionar(4, "Deposito", 10.0)
+            livro.adicionar(2, "Deposito", 10.0)
+
+        with LivroRazao(caminho) as livro:
+            assert livro.maior_conta() == 4
+
+    def test_fechar_libera_o_mapa(self, livro):
+        livro.adicionar(1, "Deposito", 10.0)
+        list(livro.registros())
+        mapa = livro._mapa
+        livro.fechar()
+
+        assert mapa.closed
+
+    def test_rejeita_momento_anterior(self, livro):
+        livro.adicionar(1, "Deposito", 100.0, momento=20)
+        with pytest.raises(ValueError):
+            livro.adicionar(1, "Deposito", 100.0, momento=10)
+        livro.adicionar(1, "Deposito", 100.0)
+        assert len(livro) == 2
+
+    def test_linhas_extrato(self, livro):
+        livro.adicionar(1, "Deposito", 100.0)
+        livro.adicionar(1, "Saque", 25.5)
+
+        assert list(livro.linhas_extrato(1)) == [
+            "Depósito: R$ 100.00",
+            "Saque: R$ 25.50",
+        ]
+
+    def test_formatar_momento(self):
+        assert len(formatar_momento(0)) == len("01-01-1970 00:00:00")
+
+
+class TestHistoricoLivroRazao:
+
+    def test_transacoes_gravadas_no_livro(self, livro, cliente):
+        conta = ContaCorrente(1, cliente, historico=HistoricoLivroRazao(livro, 1))
+
+        Deposito(200.0).registrar(conta)
+        Saque(50.0).registrar(conta)
+
+        assert conta.historico._transacoes == []
+        assert conta._extrato is None
+        assert conta.extrato == "Depósito: R$ 200.00\nSaque: R$ 50.00\n"
+        assert [t["tipo"] for t in conta.historico.transacoes] == ["Deposito", "Saque"]
+        assert len(livro) == 2
+
+    @patch("builtins.input")
+    def test_exibir_extrato_pelo_livro(self, mock_input, livro, capsys, cliente):
+        sistema = SistemaBancario(livro_razao=livro)
+        sistema.clientes.append(cliente)
+
+        mock_input.return_value = "123.456.789-00"
+        sistema.criar_conta()
+        Deposito(80.0).registrar(sistema.contas[0])
+
+        mock_input.side_effect = ["123.456.789-00", "1"]
+        sistema.exibir_extrato()
+
+        captured = capsys.readouterr()
+        assert isinstance(sistema.contas[0].historico, HistoricoLivroRazao)
+        assert "Depósito: R$ 80.00" in captured.out
+
+    def test_conta_nova_apos_reabrir_nao_herda_lancamentos(self, tmp_path):
+        caminho = tmp_path / "livro.bin"
+        entradas = ["123.456.789-00", "123.456.789-00", "1", "500"]
+        with LivroRazao(caminho) as livro, patch("builtins.input") as mock_input:
+            mock_input.side_effect = entradas
+            sistema = SistemaBancario(livro_razao=livro)
+            sistema.cadastrar_cliente("Ana", "01/01/1990", "123.456.789-00", "Rua A")
+            sistema.criar_conta()
+            sistema.depositar()
+
+        with LivroRazao(caminho) as livro, patch("builtins.input") as mock_input:
+            mock_input.return_value = "987.654.321-00"
+            sistema = SistemaBancario(livro_razao=livro)
+            sistema.cadastrar_cliente("Bia", "01/01/1990", "987.654.321-00", "Rua B")
+            sistema.criar_conta()
+
+            conta = sistema.contas[0]
+            assert conta.historico.conta_livro == 2
+            assert conta.extrato == ""
+            assert conta.historico.transacoes == []
@@ -0,0 +1,26 @@
+import gc
+
+import pytest
+from src.memoria import coleta_pausada
+
+
+class TestColetaPausada:
+    def test_desliga_e_restaura(self):
+        with coleta_pausada():
+            assert not gc.isenabled()
+        assert gc.isenabled()
+
+    def test_restaura_apos_excecao(self):
+        with pytest.raises(RuntimeError):
+            with coleta_pausada():
+                raise RuntimeError
+        assert gc.isenabled()
+
+    def test_mantem_coletor_ja_desligado(self):
+        gc.disable()
+        try:
+            with coleta_pausada():
+                pass
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
@@ -0,0 +1,128 @@
+import threading
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from src.metricas_prometheus import (Contador, ContadorRotulado, MetricasBanco,
+                                     iniciar_servidor_metricas, metricas)
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito, Saque,
+                                                SistemaBancario, validar_cpf)
+
+
+def valores_falhas():
+    return metricas.falhas.valores()
+
+
+class TestContador:
+
+    def test_incrementar(self):
+        contador = Contador()
+        contador.incrementar()
+        contador.incrementar(4)
+        assert contador.valor == 5
+
+    def test_incrementar_em_varias_threads(self):
+        contador = Contador()
+
+        def trabalho():
+            for _ in range(10_000):
+                contador.incrementar()
+
+        threads = [threading.Thread(target=trabalho) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert contador.valor == 40_000
+
+    def test_contador_rotulado(self):
+        contador = ContadorRotulado("tipo", ("Saque", "Deposito"))
+        contador.incrementar("Saque")
+        assert contador.valores() == {"Saque": 1, "Deposito": 0}
+
+
+class TestMetricasBanco:
+
+    def test_exportar_formato_prometheus(self):
+        metricas_banco = MetricasBanco()
+        metricas_banco.registrar_transacao("Deposito", 150.0)
+        metricas_banco.registrar_transacao("Saque", 50.0)
+        metricas_banco.registrar_falha("cpf_invalido")
+
+        sistema = MagicMock(contas=[1, 2], clientes=[1])
+        texto = metricas_banco.exportar(sistema)
+
+        assert "# TYPE banco_transacoes_total counter" in texto
+        assert 'banco_transacoes_total{tipo="Deposito"} 1' in texto
+        assert 'banco_falhas_total{motivo="cpf_invalido"} 1' in texto
+        assert "banco_depositos_valor_total 150.0" in texto
+        assert "banco_contas 2" in texto
+        assert "banco_clientes 1" in texto
+
+    def test_exportar_sem_sistema(self):
+        texto = MetricasBanco().exportar()
+        assert "banco_contas" not in texto
+
+    def test_limpar_zera_contadores(self):
+        metricas_banco = MetricasBanco()
+        metricas_banco.registrar_transacao("Deposito", 150.0)
+        metricas_banco.registrar_falha("cpf_invalido")
+        metricas_banco.limpar()
+        assert set(metricas_banco.transacoes.valores().values()) == {0}
+        assert set(metricas_banco.falhas.valores().values()) == {0}
+        assert metricas_banco.total_depositos.valor == 0
+
+
+class TestMetricasSistemaBancario:
+
+    def test_transacoes_e_falhas_sao_contadas(self, cliente):
+        conta = ContaCorrente(1, cliente)
+        transacoes = metricas.transacoes.valores()
+        falhas = valores_falhas()
+
+        Deposito(100.0).registrar(conta)
+        Saque(600.0).registrar(conta)
+        Saque(200.0).registrar(conta)
+
+        assert metricas.transacoes.valores()["Deposito"] == transacoes["Deposito"] + 1
+        assert metricas.transacoes.valores()["Saque"] == transacoes["Saque"]
+        assert valores_falhas()["limite_excedido"] == falhas["limite_excedido"] + 1
+        assert (
+            valores_falhas()["saldo_insuficiente"]
+            == falhas["saldo_insuficiente"] + 1
+        )
+
+    def test_cpf_invalido_e_contado(self):
+        falhas = valores_falhas()
+
+        @validar_cpf
+        def operacao(cpf=None):
+            return cpf
+
+        operacao(cpf="123")
+        assert valores_falhas()["cpf_invalido"] == falhas["cpf_invalido"] + 1
+
+
+class TestServidorMetricas:
+
+    @pytest.fixture
+    def servidor(self):
+        servidor = iniciar_servidor_metricas(SistemaBancario(), porta=0)
+        yield servidor
+        servidor.shutdown()
+        servidor.server_close()
+
+    def test_endpoint_metrics(self, servidor):
+        porta = servidor.server_address[1]
+        with urlopen(f"http://127.0.0.1:{porta}/metrics") as resposta:
+            corpo = resposta.read().decode("utf-8")
+
+        assert resposta.status == 200
+        assert "banco_contas 0" in corpo
+
+    def test_caminho_desconhecido(self, servidor):
+        porta = servidor.server_address[1]
+        with pytest.raises(HTTPError):
+            urlopen(f"http://127.0.0.1:{porta}/outro")
@@ -273,6 +273,24 @@ class TestContaCorrente:
         conta.numero_saques = 2
         assert conta._numero_saques == 2
 
+    def test_conta_corrente_notifica_uma_vez_por_saque(self):
+        conta = ContaCorrente(1, MagicMock(), limite_saques=1)
+        conta.depositar(100.0)
+        notificacoes = []
+        conta.adicionar_observador(
+            lambda c, saldo_anterior: notificacoes.append(
+                (saldo_anterior, c.saldo, c.numero_saques)
+            )
+        )
+
+        assert conta.sacar(200.0) is False
+        assert conta.sacar(-1.0) is False
+        assert conta.sacar(30.0) is True
+        assert conta.sacar(10.0) is False
+        conta.numero_saques = 1
+
+        assert notificacoes == [(100.0, 70.0, 1)]
+
     def test_conta_corrente_sacar_excede_limite(self, capsys):
         cliente_mock = MagicMock()
         conta = ContaCorrente(1, cliente_mock)
@@ -341,7 +359,7 @@ class TestHistorico:
     def test_historico_adicionar_transacao(self):
         historico = Historico()
         transacao_mock = MagicMock()
-        transacao_mock.__class__.__name__ = "Saque"
+        transacao_mock.tipo = "Saque"
         transacao_mock.valor = 100.0
 
         historico.adicionar_transacao(transacao_mock)
@@ -354,11 +372,11 @@ class TestHistorico:
     def test_historico_adicionar_multiplas_transacoes(self):
         historico = Historico()
         transacao1 = MagicMock()
-        transacao1.__class__.__name__ = "Deposito"
+        transacao1.tipo = "Deposito"
         transacao1.valor = 200.0
 
         transacao2 = MagicMock()
-        transacao2.__class__.__name__ = "Saque"
+        transacao2.tipo = "Saque"
         transacao2.valor = 100.0
 
         historico.adicionar_transacao(transacao1)
@@ -455,9 +473,8 @@ class TestSistemaBancario:
         assert sistema.contas == []
         assert sistema.numero_conta == 1
 
-    def test_filtrar_cliente_cpf_valido_encontrado(self):
+    def test_filtrar_cliente_cpf_valido_encontrado(self, cliente):
         sistema = SistemaBancario()
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
         sistema.clientes.append(cliente)
 
         resultado = sistema.filtrar_cliente(cpf="123.456.789-00")
@@ -481,9 +498,8 @@ class TestSistemaBancario:
         resultado = sistema.filtrar_cliente("111.222.333-44")
         assert resultado is None
 
-    def test_filtrar_conta_encontrada(self):
+    def test_filtrar_conta_encontrada(self, cliente):
         sistema = SistemaBancario()
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
         conta = ContaCorrente(1, cliente)
         sistema.contas.append(conta)
 
@@ -495,18 +511,16 @@ class TestSistemaBancario:
         resultado = sistema.filtrar_conta("123.456.789-00", "1")
         assert resultado is None
 
-    def test_filtrar_conta_cpf_nao_corresponde(self):
+    def test_filtrar_conta_cpf_nao_corresponde(self, cliente):
         sistema = SistemaBancario()
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
         conta = ContaCorrente(1, cliente)
         sistema.contas.append(conta)
 
         resultado = sistema.filtrar_conta("111.222.333-44", "1")
         assert resultado is None
 
-    def test_filtrar_conta_numero_nao_corresponde(self):
+    def test_filtrar_conta_numero_nao_corresponde(self, cliente):
         sistema = SistemaBancario()
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
         conta = ContaCorrente(1, cliente)
         sistema.contas.append(conta)
 
@@ -581,9 +595,8 @@ class TestSistemaBancario:
         assert "Data de nascimento inválida" in captured.out
 
     @patch("builtins.input")
-    def test_criar_conta_sucesso(self, mock_input):
+    def test_criar_conta_sucesso(self, mock_input, cliente):
         # Primeiro criar um cliente
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
 
         mock_input.return_value = "123.456.789-00"
 
@@ -621,8 +634,7 @@ class TestSistemaBancario:
         assert Constants.FAIL_CPF_MESSAGE in captured.out
 
     @patch("builtins.input")
-    def test_depositar_sucesso(self, mock_input):
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    def test_depositar_sucesso(self, mock_input, cliente):
         conta = ContaCorrente(1, cliente)
         sistema = SistemaBancario()
         sistema.clientes.append(cliente)
@@ -650,8 +662,7 @@ class TestSistemaBancario:
         assert Constants.FAIL_CPF_MESSAGE in captured.out
 
     @patch("builtins.input")
-    def test_depositar_valor_invalido(self, mock_input, capsys):
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    def test_depositar_valor_invalido(self, mock_input, capsys, cliente):
         conta = ContaCorrente(1, cliente)
         sistema = SistemaBancario()
         sistema.clientes.append(cliente)
@@ -677,8 +688,7 @@ class TestSistemaBancario:
         assert Constants.FAIL_OPERATION_MESSAGE in captured.out
 
     @patch("builtins.input")
-    def test_sacar_sucesso(self, mock_input):
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    def test_sacar_sucesso(self, mock_input, cliente):
         conta = ContaCorrente(1, cliente)
         conta.depositar(500.0)
         sistema = SistemaBancario()
@@ -714,8 +724,7 @@ class TestSistemaBancario:
         assert Constants.FAIL_OPERATION_MESSAGE in captured.out
 
     @patch("builtins.input")
-    def test_exibir_extrato_sucesso(self, mock_input, capsys):
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    def test_exibir_extrato_sucesso(self, mock_input, capsys, cliente):
         conta = ContaCorrente(1, cliente)
         conta.depositar(300.0)
         sistema = SistemaBancario()
@@ -734,8 +743,7 @@ class TestSistemaBancario:
         assert "Saldo atual: R$ 300.00" in captured.out
 
     @patch("builtins.input")
-    def test_exibir_extrato_sem_movimentacoes(self, mock_input, capsys):
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    def test_exibir_extrato_sem_movimentacoes(self, mock_input, capsys, cliente):
         conta = ContaCorrente(1, cliente)
         sistema = SistemaBancario()
         sistema.clientes.append(cliente)
@@ -760,8 +768,7 @@ class TestSistemaBancario:
         assert Constants.FAIL_OPERATION_MESSAGE in captured.out
 
     @patch("builtins.input")
-    def test_listar_contas_com_cpf(self, mock_input, capsys):
-        cliente = PessoaFisica("João", "01/01/1990", "123.456.789-00", "Rua A")
+    def test_listar_contas_com_cpf(self, mock_input, capsys, cliente):
         conta = ContaCorrente(1, cliente)
         conta.depositar(500.0)
         sistema = SistemaBancario()
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from src.modelando_sistema_bancario_poo import (ContaCorrente, ContaPoupanca,
+                                                Deposito, Saque,
+                                                SistemaBancario)
+from src.poupanca import CarteiraPoupanca
+
+
+class TestContaPoupanca:
+    def test_saque_limitado_ao_saldo(self, cliente):
+        conta = ContaPoupanca(1, cliente)
+        Deposito(100.0).registrar(conta)
+        Saque(150.0).registrar(conta)
+        Saque(40.0).registrar(conta)
+
+        assert conta.saldo == 60.0
+        assert conta.taxa_diaria > 0
+
+    @patch("builtins.input", return_value="123.456.789-00")
+    def test_criar_conta_poupanca(self, mock_input, cliente):
+        sistema = SistemaBancario()
+        sistema.clientes.append(cliente)
+        carteira = CarteiraPoupanca()
+        sistema.ouvintes_cadastro.append(carteira)
+
+        sistema.criar_conta()
+        sistema.criar_conta_poupanca()
+
+        assert isinstance(sistema.contas[1], ContaPoupanca)
+        assert sistema.contas[1].numero == 2
+        assert carteira.contas == [sistema.contas[1]]
+
+
+class TestCarteiraPoupanca:
+    def test_saldos_acompanham_a_conta(self, cliente):
+        conta = ContaPoupanca(1, cliente)
+        carteira = CarteiraPoupanca.de_contas([ContaCorrente(2, cliente), conta])
+
+        Deposito(250.0).registrar(conta)
+        assert len(carteira) == 1
+        assert list(carteira.saldos) == [250.0]
+
+    def test_calcular_juros_vetorizado(self, cliente):
+        contas = [
+            ContaPoupanca(numero, cliente, taxa_diaria=0.01)
+            for numero in range(1, 4)
+        ]
+        for conta, valor in zip(contas, (1000.0, 33.33, 0.5)):
+            conta.depositar(valor)
+        carteira = CarteiraPoupanca.de_contas(contas)
+
+        assert list(carteira.calcular_juros()) == [10.0, 0.33, 0.01]
+
+    def test_creditar_juros_lanca_depositos(self, cliente):
+        rica = ContaPoupanca(1, cliente, taxa_diaria=0.001)
+        pobre = ContaPoupanca(2, cliente, taxa_diaria=0.001)
+        rica.depositar(2000.0)
+        pobre.depositar(1.0)
+        carteira = CarteiraPoupanca.de_contas([rica, pobre])
+
+        assert carteira.creditar_juros() == 2.0
+        assert rica.saldo == 2002.0
+        assert rica.historico.transacoes[-1]["tipo"] == "Deposito"
+        assert pobre.historico.transacoes == []
+        assert list(carteira.saldos) == [2002.0, 1.0]
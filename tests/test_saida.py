@@ -0,0 +1,83 @@
+import io
+
+from src.otimizando_sistema_bancario import depositar
+from src.saida import (SaidaBuffer, SaidaNula, SaidaTerminal, definir_saida,
+                       emitir, obter_saida, usar_saida)
+
+
+class TestSaidas:
+
+    def test_saida_padrao_e_terminal(self, capsys):
+        assert isinstance(obter_saida(), SaidaTerminal)
+        emitir("mensagem")
+        assert capsys.readouterr().out == "mensagem\n"
+
+    def test_saida_nula(self, capsys):
+        with usar_saida(SaidaNula()):
+            emitir("mensagem", "codigo")
+        assert capsys.readouterr().out == ""
+
+    def test_saida_buffer(self, capsys):
+        buffer = SaidaBuffer()
+        with usar_saida(buffer):
+            emitir("primeira")
+            emitir("segunda", "codigo")
+
+        assert capsys.readouterr().out == ""
+        assert buffer.codigos() == ["codigo"]
+        buffer.descarregar()
+        assert capsys.readouterr().out == "primeira\nsegunda\n"
+        assert len(buffer) == 0
+
+    def test_saida_buffer_descarrega_ao_atingir_capacidade(self):
+        destino = io.StringIO()
+        buffer = SaidaBuffer(destino=destino, capacidade=2)
+        buffer.escrever("a")
+        assert destino.getvalue() == ""
+        buffer.escrever("b")
+        assert destino.getvalue() == "a\nb\n"
+
+    def test_saida_buffer_sem_destino_descarrega_no_stdout(self, capsys):
+        buffer = SaidaBuffer(capacidade=2)
+        buffer.escrever("a", "codigo")
+        buffer.escrever("b")
+
+        assert capsys.readouterr().out == "a\nb\n"
+        assert len(buffer) == 0
+        assert buffer.codigos() == []
+
+    def test_definir_saida_retorna_anterior(self):
+        nula = SaidaNula()
+        anterior = definir_saida(nula)
+        try:
+            assert obter_saida() is nula
+        finally:
+            definir_saida(anterior)
+        assert obter_saida() is anterior
+
+
+class TestSaidaNosMotores:
+
+    def test_codigos_de_falha_da_conta(self, conta, capsys):
+        buffer = SaidaBuffer()
+        with usar_saida(buffer):
+            assert conta.sacar(100.0) is False
+            conta.depositar(1000.0)
+            assert conta.sacar(600.0) is False
+            assert conta.depositar(-1) is False
+
+        assert capsys.readouterr().out == ""
+        assert buffer.codigos() == [
+            "saldo_insuficiente",
+            "limite_excedido",
+            "valor_invalido",
+        ]
+
+    def test_motor_procedural(self, monkeypatch, capsys):
+        buffer = SaidaBuffer()
+        monkeypatch.setattr("builtins.input", lambda _: "100")
+        with usar_saida(buffer):
+            depositar([], cpf="111.222.333-44", numero_conta="1")
+
+        assert capsys.readouterr().out == ""
+        assert buffer.codigos() == ["operacao_falhou"]
@@ -0,0 +1,216 @@
+from unittest.mock import patch
+
+import pytest
+from src.coortes import ordinal_nascimento
+from src.enderecos import interpretar_endereco
+from src.modelando_sistema_bancario_poo import (Conta, ContaCorrente,
+                                                ContaPoupanca, Deposito,
+                                                PessoaFisica, Saque,
+                                                SistemaBancario)
+from src.snapshot import (SnapshotInvalido, carregar_procedural,
+                          carregar_sistema, salvar_procedural, salvar_sistema)
+from src.tabela_contas import TabelaContas
+
+
+@pytest.fixture
+def sistema():
+    sistema = SistemaBancario()
+    joao = PessoaFisica("João Silva", "01/01/1990", "111.222.333-44", "Rua A, 1")
+    maria = PessoaFisica("María Sá", "15/05/1985", "555.666.777-88", "Rua B, 2")
+    sistema.clientes += [joao, maria]
+
+    for numero, cliente in enumerate([joao, maria, joao], start=1):
+        conta = ContaCorrente(numero, cliente)
+        sistema.contas.append(conta)
+        cliente.adicionar_conta(conta)
+    sistema.numero_conta = 4
+
+    Deposito(500.0).registrar(sistema.contas[0])
+    Saque(120.5).registrar(sistema.contas[0])
+    Deposito(80.0).registrar(sistema.contas[1])
+    return sistema
+
+
+@pytest.fixture
+def estado_procedural():
+    usuarios = [
+        {
+            "nome": "João",
+            "nascimento": ordinal_nascimento("01/01/1990"),
+            "cpf": "111.222.333-44",
+            "endereco": "Rua A, 123",
+            "local": interpretar_endereco("Rua A, 123"),
+        }
+    ]
+    contas = [
+        {
+            "agencia": "0001",
+            "numero_conta": 1,
+            "usuario": usuarios[0],
+            "saldo": 350.0,
+            "extrato": "Depósito: R$ 400.00\nSaque: R$ 50.00\n",
+            "numero_saques": 1,
+            "limite": 500,
+            "limite_saques": 3,
+            "quantidade_transacoes": 2,
+            "volume": 450.0,
+        }
+    ]
+    return usuarios, contas
+
+
+class TestSnapshotSistemaBancario:
+
+    def test_salvar_e_carregar(self, sistema, tmp_path):
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+        carregado = carregar_sistema(caminho)
+
+        assert carregado.numero_conta == 4
+        assert [c.cpf for c in carregado.clientes] == [
+            "111.222.333-44",
+            "555.666.777-88",
+        ]
+        assert carregado.clientes[1].nome == "María Sá"
+
+        conta = carregado.contas[0]
+        assert conta.numero == 1
+        assert conta.agencia == "0001"
+        assert conta.saldo == 379.5
+        assert conta.numero_saques == 1
+        assert conta.extrato == sistema.contas[0].extrato
+        assert conta.historico.transacoes == sistema.contas[0].historico.transacoes
+        assert conta.cliente is carregado.clientes[0]
+        assert len(carregado.clientes[0].contas) == 2
+
+    def test_indice_de_saldos_reconstruido(self, sistema, tmp_path):
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+        carregado = carregar_sistema(caminho)
+
+        assert carregado.indice_saldos.maiores_saldos(1) == [carregado.contas[0]]
+        carregado.contas[2].depositar(1000.0)
+        assert carregado.indice_saldos.maiores_saldos(1) == [carregado.contas[2]]
+
+    def test_conta_poupanca_preservada(self, sistema, tmp_path):
+        cliente = sistema.clientes[1]
+        poupanca = ContaPoupanca(4, cliente, taxa_diaria=0.002)
+        Deposito(300.0).registrar(poupanca)
+        sistema.contas.append(poupanca)
+        cliente.adicionar_conta(poupanca)
+
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+        carregado = carregar_sistema(caminho)
+
+        assert type(carregado.contas[0]) is ContaCorrente
+        conta = carregado.contas[3]
+        assert type(conta) is ContaPoupanca
+        assert conta.taxa_diaria == 0.002
+        assert conta.saldo == 300.0
+
+    def test_campos_interpretados_sem_regex(self, sistema, tmp_path):
+        completo = "Av. Brasil, 100 - Centro - Rio de Janeiro/rj"
+        sistema.clientes.append(
+            PessoaFisica("Ana", "ontem", "999.888.777-66", completo)
+        )
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+
+        with patch(
+            "src.modelando_sistema_bancario_poo.interpretar_endereco"
+        ) as interpretar:
+            carregado = carregar_sistema(caminho)
+        interpretar.assert_not_called()
+
+        joao, _, ana = carregado.clientes
+        assert joao.nascimento == sistema.clientes[0].nascimento
+        assert joao.local == sistema.clientes[0].local
+        assert ana.local == interpretar_endereco(completo)
+        assert ana.nascimento is None
+        assert ana.data_nascimento == "ontem"
+
+    def test_classe_de_conta_nao_suportada(self, sistema, tmp_path):
+        sistema.contas.append(Conta(9, sistema.clientes[0]))
+        with pytest.raises(TypeError, match="Conta"):
+            salvar_sistema(tmp_path / "banco.snap", sistema)
+
+    def test_sistema_vazio(self, tmp_path):
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, SistemaBancario())
+        carregado = carregar_sistema(caminho)
+
+        assert carregado.clientes == []
+        assert carregado.contas == []
+        assert carregado.numero_conta == 1
+
+    def test_arquivo_invalido(self, tmp_path):
+        caminho = tmp_path / "banco.snap"
+        caminho.write_bytes(b"x" * 64)
+        with pytest.raises(SnapshotInvalido):
+            carregar_sistema(caminho)
+
+        caminho.write_bytes(b"x")
+        with pytest.raises(SnapshotInvalido):
+            carregar_sistema(caminho)
+
+
+class TestSnapshotProcedural:
+
+    def test_salvar_e_carregar(self, estado_procedural, tmp_path):
+        usuarios, contas = estado_procedural
+        caminho = tmp_path / "banco.snap"
+        salvar_procedural(caminho, usuarios, contas)
+
+        usuarios_carregados, contas_carregadas, numero_conta = carregar_procedural(
+            caminho
+        )
+        assert usuarios_carregados == usuarios
+        assert contas_carregadas == contas
+        assert contas_carregadas[0]["usuario"] is usuarios_carregados[0]
+        assert numero_conta == 2
+
+    def test_salvar_tabela_de_contas(self, estado_procedural, tmp_path):
+        usuarios, contas = estado_procedural
+        caminho = tmp_path / "banco.snap"
+        salvar_procedural(caminho, usuarios, TabelaContas.de_lista(contas))
+
+        usuarios_carregados, contas_carregadas, _ = carregar_procedural(caminho)
+        assert usuarios_carregados == usuarios
+        assert contas_carregadas == contas
+
+    def test_usuario_no_formato_antigo(self, estado_procedural, tmp_path):
+        usuarios, contas = estado_procedural
+        usuarios[0] = contas[0]["usuario"] = {
+            "nome": "João",
+            "data_nascimento": "01/01/1990",
+            "cpf": "111.222.333-44",
+            "endereco": "Rua A, 123",
+        }
+        caminho = tmp_path / "banco.snap"
+        salvar_procedural(caminho, usuarios, contas)
+
+        (usuario,), _, _ = carregar_procedural(caminho)
+        assert usuario["nascimento"] == ordinal_nascimento("01/01/1990")
+        assert usuario["local"] == interpretar_endereco("Rua A, 123")
+
+    def test_carregar_estado_procedural_no_sistema(self, estado_procedural, tmp_path):
+        usuarios, contas = estado_procedural
+        caminho = tmp_path / "banco.snap"
+        salvar_procedural(caminho, usuarios, contas, numero_conta=10)
+
+        sistema = carregar_sistema(caminho)
+        assert sistema.numero_conta == 10
+        assert sistema.contas[0].saldo == 350.0
+        assert sistema.contas[0].numero_saques == 1
+        assert sistema.contas[0].cliente.nome == "João"
+
+    def test_carregar_sistema_no_procedural(self, sistema, tmp_path):
+        caminho = tmp_path / "banco.snap"
+        salvar_sistema(caminho, sistema)
+
+        usuarios, contas, numero_conta = carregar_procedural(caminho)
+        assert len(usuarios) == 2
+        assert contas[0]["saldo"] == 379.5
+        assert contas[2]["usuario"] is usuarios[0]
+        assert numero_conta == 4
@@ -0,0 +1,125 @@
+import pytest
+from src.otimizando_sistema_bancario import (criar_conta, depositar,
+                                             encontrar_conta, exibir_extrato,
+                                             listar_contas, sacar)
+from src.tabela_contas import LinhaConta, TabelaContas
+
+
+@pytest.fixture
+def usuarios():
+    return [
+        {
+            "nome": "João",
+            "data_nascimento": "01/01/1990",
+            "cpf": "111.222.333-44",
+            "endereco": "Rua A, 123",
+        },
+        {
+            "nome": "Maria",
+            "data_nascimento": "15/05/1985",
+            "cpf": "555.666.777-88",
+            "endereco": "Rua B, 456",
+        },
+    ]
+
+
+@pytest.fixture
+def tabela(usuarios):
+    tabela = TabelaContas()
+    for numero, usuario in enumerate(usuarios, start=1):
+        tabela.append(
+            {
+                "agencia": "0001",
+                "numero_conta": numero,
+                "usuario": usuario,
+                "saldo": 500.0 * numero,
+                "extrato": "",
+                "numero_saques": 0,
+                "limite": 500,
+                "limite_saques": 3,
+            }
+        )
+    return tabela
+
+
+class TestTabelaContas:
+
+    def test_linhas_como_dicionario(self, tabela, usuarios):
+        conta = tabela[1]
+        assert isinstance(conta, LinhaConta)
+        assert conta["numero_conta"] == 2
+        assert conta["agencia"] == "0001"
+        assert conta["usuario"] is usuarios[1]
+        assert conta.get("saldo") == 1000.0
+        assert conta.get("inexistente", "padrao") == "padrao"
+        assert conta.para_dict()["limite_saques"] == 3
+
+    def test_alterar_campo(self, tabela):
+        tabela[0]["saldo"] = 42.0
+        tabela[0]["agencia"] = "0002"
+        assert tabela.saldo[0] == 42.0
+        assert tabela[0]["agencia"] == "0002"
+
+        with pytest.raises(KeyError):
+            tabela[0]["numero_conta"] = 7
+        with pytest.raises(KeyError):
+            tabela[0]["inexistente"] = 1
+
+    def test_numero_fora_de_sequencia(self, tabela, usuarios):
+        with pytest.raises(ValueError):
+            tabela.append({"numero_conta": 10, "usuario": usuarios[0]})
+
+    def test_encontrar_por_indice(self, tabela):
+        assert tabela.encontrar("555.666.777-88", "2") == tabela[1]
+        assert tabela.encontrar("111.222.333-44", "2") is None
+        assert tabela.encontrar("111.222.333-44", "9") is None
+        assert tabela.encontrar("111.222.333-44", "abc") is None
+
+    def test_de_lista(self, usuarios):
+        contas = [
+            {"numero_conta": 2, "usuario": usuarios[1], "saldo": 5.0},
+            {"numero_conta": 1, "usuario": usuarios[0]},
+        ]
+        tabela = TabelaContas.de_lista(contas)
+        assert len(tabela) == 2
+        assert tabela[-1]["saldo"] == 5.0
+        with pytest.raises(IndexError):
+            tabela[2]
+
+
+class TestMotorProceduralComTabela:
+
+    def test_depositar(self, tabela, monkeypatch):
+        monkeypatch.setattr("builtins.input", lambda _: "200")
+        depositar(tabela, cpf="111.222.333-44", numero_conta="1")
+
+        conta = encontrar_conta(tabela, "111.222.333-44", "1")
+        assert conta["saldo"] == 700.0
+        assert "Depósito: R$ 200.00" in conta["extrato"]
+
+    def test_sacar(self, tabela, monkeypatch, capsys):
+        entradas = iter(["555.666.777-88", "2", "100"])
+        monkeypatch.setattr("builtins.input", lambda _: next(entradas))
+        sacar(tabela)
+
+        assert tabela.saldo[1] == 900.0
+        assert tabela.numero_saques[1] == 1
+        assert "Saque realizado com sucesso!" in capsys.readouterr().out
+
+    def test_exibir_extrato_e_listar(self, tabela, monkeypatch, capsys):
+        entradas = iter(["111.222.333-44", "1", ""])
+        monkeypatch.setattr("builtins.input", lambda _: next(entradas))
+        exibir_extrato(tabela)
+        listar_contas(tabela)
+
+        captured = capsys.readouterr()
+        assert "Saldo atual: R$ 500.00" in captured.out
+        assert "Titular: Maria" in captured.out
+
+    def test_criar_conta(self, tabela, usuarios, monkeypatch):
+        monkeypatch.setattr("builtins.input", lambda _: "111.222.333-44")
+        tabela.append(criar_conta("0001", 3, usuarios))
+
+        assert len(tabela) == 3
+        assert tabela[2]["usuario"] is usuarios[0]
+        assert tabela[2]["saldo"] == 0
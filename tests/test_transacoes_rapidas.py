@@ -0,0 +1,73 @@
+import pytest
+from src.livro_razao import LivroRazao
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Historico,
+                                                HistoricoLivroRazao, Transacao)
+from src.transacoes_rapidas import (RegistroTransacao, deposito_rapido,
+                                    registrar_lote, saque_rapido)
+from src.transferencia import Transferencia
+
+
+class TestRegistroTransacao:
+
+    def test_registro_e_imutavel(self):
+        registro = deposito_rapido(100.0)
+        assert registro.tipo == "Deposito"
+        assert registro.valor == 100.0
+        with pytest.raises(AttributeError):
+            registro.valor = 200.0
+
+    def test_registro_e_uma_transacao(self):
+        assert isinstance(saque_rapido(10.0), Transacao)
+        assert not hasattr(RegistroTransacao("Saque", 1.0), "__dict__")
+
+    def test_deposito_via_cliente(self, cliente):
+        conta = ContaCorrente(1, cliente)
+        cliente.realizar_transacao(conta, deposito_rapido(150.0))
+
+        assert conta.saldo == 150.0
+        assert conta.historico.transacoes[0]["tipo"] == "Deposito"
+        assert conta.historico.transacoes[0]["valor"] == 150.0
+
+    def test_saque_com_sucesso(self, cliente):
+        conta = ContaCorrente(1, cliente)
+        conta.depositar(300.0)
+
+        assert saque_rapido(100.0).registrar(conta) is True
+        assert conta.saldo == 200.0
+        assert conta.numero_saques == 1
+        assert conta.historico.transacoes[0]["tipo"] == "Saque"
+
+    def test_saque_com_falha_nao_registra(self, cliente, capsys):
+        conta = ContaCorrente(1, cliente)
+
+        assert saque_rapido(100.0).registrar(conta) is False
+        assert conta.historico.transacoes == []
+        assert "Saldo insuficiente" in capsys.readouterr().out
+
+    def test_registrar_lote(self, cliente):
+        conta = ContaCorrente(1, cliente)
+        registros = [deposito_rapido(100.0), saque_rapido(30.0), saque_rapido(500.0)]
+
+        assert registrar_lote(conta, registros) == 2
+        assert conta.saldo == 70.0
+
+
+class TestHistoricoAdicionarRegistro:
+
+    def test_adicionar_registro(self):
+        historico = Historico()
+        historico.adicionar_registro("Deposito", 50.0)
+
+        assert historico.transacoes[0]["tipo"] == "Deposito"
+        assert historico.transacoes[0]["valor"] == 50.0
+        assert "data" in historico.transacoes[0]
+
+    def test_adicionar_transacao_grava_o_tipo_do_movimento(self, tmp_path):
+        destino = ContaCorrente(2, None)
+        with LivroRazao(tmp_path / "livro.bin") as livro:
+            historico = HistoricoLivroRazao(livro, 1)
+            historico.adicionar_transacao(deposito_rapido(50.0))
+            historico.adicionar_transacao(Transferencia(20.0, destino))
+
+            tipos = [transacao["tipo"] for transacao in historico.transacoes]
+        assert tipos == ["Deposito", "TransferenciaEnviada"]
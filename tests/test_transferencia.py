@@ -0,0 +1,217 @@
+import random
+import sys
+import threading
+
+import pytest
+from src.constant import Constants
+from src.consultas import MotorConsultas
+from src.metricas_prometheus import metricas
+from src.modelando_sistema_bancario_poo import (ContaCorrente, Deposito, Saque,
+                                                SistemaBancario)
+from src.saida import SaidaBuffer, SaidaNula, usar_saida
+from src.transferencia import (Transferencia, compensar_transferencias,
+                               liquidar_lote)
+
+
+@pytest.fixture
+def contas(cliente):
+    contas = [ContaCorrente(numero, cliente, limite=2000) for numero in range(1, 4)]
+    for conta in contas:
+        conta.depositar(1000.0)
+    return contas
+
+
+class TestTransferencia:
+
+    def test_transferencia_com_sucesso(self, contas):
+        origem, destino, _ = contas
+        assert Transferencia(700.0, destino).registrar(origem) is True
+
+        assert origem.saldo == 300.0
+        assert destino.saldo == 1700.0
+        assert origem.numero_saques == 0
+        assert origem.historico.transacoes[-1]["tipo"] == "TransferenciaEnviada"
+        assert destino.historico.transacoes[-1]["tipo"] == "TransferenciaRecebida"
+        assert origem.extrato.endswith("Transferência enviada: R$ 700.00\n")
+        assert destino.extrato.endswith("Transferência recebida: R$ 700.00\n")
+
+    def test_respeita_limite_por_operacao(self, contas, capsys):
+        origem, destino, _ = contas
+        origem.depositar(5000.0)
+        assert Transferencia(2500.0, destino).registrar(origem) is False
+
+        assert origem.saldo == 6000.0
+        assert destino.saldo == 1000.0
+        assert "excede o limite" in capsys.readouterr().out
+
+    def test_via_cliente(self, contas):
+        origem, destino, _ = contas
+        origem.cliente.realizar_transacao(origem, Transferencia(10.0, destino))
+        assert destino.saldo == 1010.0
+
+    def test_saldo_insuficiente_nao_altera_contas(self, contas, capsys):
+        origem, destino, _ = contas
+        assert Transferencia(1500.0, destino).registrar(origem) is False
+
+        assert origem.saldo == 1000.0
+        assert destino.saldo == 1000.0
+        assert destino.historico.transacoes == []
+        assert "Saldo insuficiente" in capsys.readouterr().out
+
+    def test_mesma_conta(self, contas, capsys):
+        assert Transferencia(10.0, contas[0]).registrar(contas[0]) is False
+        assert Constants.FAIL_SAME_ACCOUNT_TRANSFER_MESSAGE in capsys.readouterr().out
+
+    def test_valor_invalido(self, contas, capsys):
+        assert Transferencia(0, contas[1]).registrar(contas[0]) is False
+        assert Constants.FAIL_VALUE_MESSAGE in capsys.readouterr().out
+
+    def test_transferencias_cruzadas_concorrentes(self, contas):
+        a, b, _ = contas
+
+        def transferir(origem, destino):
+            for _ in range(200):
+                Transferencia(1.0, destino).registrar(origem)
+
+        threads = [
+            threading.Thread(target=transferir, args=(a, b)),
+            threading.Thread(target=transferir, args=(b, a)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert not any(thread.is_alive() for thread in threads)
+        assert a.saldo + b.saldo == 2000.0
+
+
+class TestCompensacao:
+
+    def test_compensar_transferencias(self, contas):
+        a, b, c = contas
+        saldos = compensar_transferencias(
+            [(a, b, 100.0), (b, a, 100.0), (b, c, 30.0), (c, a, 10.0)]
+        )
+        assert saldos == {a: 10.0, b: -30.0, c: 20.0}
+
+    def test_liquidar_lote(self, contas):
+        a, b, c = contas
+        saldos = liquidar_lote([(a, b, 500.0), (b, c, 200.0), (c, a, 100.0)])
+
+        assert saldos == {a: -400.0, b: 300.0, c: 100.0}
+        assert (a.saldo, b.saldo, c.saldo) == (600.0, 1300.0, 1100.0)
+        assert len(a.historico.transacoes) == 1
+
+    def test_liquidar_lote_sem_saldo_e_atomico(self, contas, capsys):
+        a, b, c = contas
+        assert liquidar_lote([(a, b, 1500.0), (c, a, 10.0)]) is None
+
+        assert (a.saldo, b.saldo, c.saldo) == (1000.0, 1000.0, 1000.0)
+        assert "Saldo insuficiente na conta 1" in capsys.readouterr().out
+        assert metricas.falhas.valores()["saldo_insuficiente"] == 1
+
+    def test_liquidar_lote_sem_saldo_emite_codigo(self, contas):
+        a, b, _ = contas
+        with usar_saida(SaidaBuffer()) as saida:
+            liquidar_lote([(a, b, 1500.0)])
+        assert saida.codigos() == ["saldo_insuficiente"]
+
+    def test_liquidar_lote_respeita_limite(self, contas, capsys):
+        a, b, _ = contas
+        a.depositar(5000.0)
+        assert liquidar_lote([(a, b, 2500.0)]) is None
+
+        assert (a.saldo, b.saldo) == (6000.0, 1000.0)
+        assert "excede o limite na conta 1" in capsys.readouterr().out
+        assert metricas.falhas.valores()["limite_excedido"] == 1
+
+    def test_deposito_concorrente_com_transferencia(self, contas):
+        a, b, _ = contas
+
+        def transferir():
+            for _ in range(200):
+                Transferencia(1.0, b).registrar(a)
+
+        def depositar():
+            for _ in range(200):
+                a.depositar(1.0)
+
+        threads = [
+            threading.Thread(target=transferir),
+            threading.Thread(target=depositar),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert (a.saldo, b.saldo) == (1000.0, 1200.0)
+
+    def test_liquidar_lote_valor_invalido(self, contas):
+        assert liquidar_lote([(contas[0], contas[1], -5.0)]) is None
+
+
+class TestIndicesDerivadosConcorrentes:
+
+    def test_indices_consistentes_apos_movimentos_concorrentes(self):
+        sistema = SistemaBancario()
+        motor = MotorConsultas(sistema)
+        contas = []
+        for indice in range(20):
+            cliente = sistema.cadastrar_cliente(
+                f"Cliente {indice}", "01/01/1990", f"{indice:03d}.000.000-00",
+                "Rua A, 1 - Centro - Natal/RN",
+            )
+            conta = sistema.abrir_conta(ContaCorrente, cliente)
+            conta.depositar(1000.0)
+            contas.append(conta)
+        motor.consultar(saques_minimo=0)
+
+        def movimentar(semente):
+            sorteio = random.Random(semente)
+            for _ in range(2000):
+                conta, outra = sorteio.sample(contas, 2)
+                operacao = sorteio.randrange(4)
+                if operacao == 0:
+                    Deposito(sorteio.randint(1, 50)).registrar(conta)
+                elif operacao == 1:
+                    Saque(sorteio.randint(1, 50)).registrar(conta)
+                elif operacao == 2:
+                    Transferencia(sorteio.randint(1, 50), outra).registrar(conta)
+                else:
+                    sistema.obter_extrato(conta)
+
+        intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with usar_saida(SaidaNula()):
+                threads = [
+                    threading.Thread(target=movimentar, args=(semente,))
+                    for semente in range(8)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(timeout=60)
+        finally:
+            sys.setswitchinterval(intervalo)
+
+        saldos = sistema.indice_saldos
+        assert len(saldos) == 20
+        assert [conta.saldo for conta in saldos.menores_saldos(20)] == sorted(
+            conta.saldo for conta in contas
+        )
+        assert sistema.contadores_regionais.estado("RN").saldo_total == (
+            pytest.approx(sum(conta.saldo for conta in contas))
+        )
+        saques = motor.indice_saques
+        for conta in contas:
+            assert conta in saques.contas_por_faixa(
+                conta.numero_saques, conta.numero_saques
+            )
+            if conta in sistema.cache_extrato:
+                assert sistema.obter_extrato(conta) == (
+                    sistema.renderizar_extrato(conta)
+                )
+        assert saques.contar_faixa() == 20